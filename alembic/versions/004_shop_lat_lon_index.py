@@ -0,0 +1,36 @@
+"""Index shop coordinates for bounding box queries
+
+Revision ID: 004_shop_lat_lon_index
+Revises: 003_conflicting_schema
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+# pylint: disable=C0103
+revision: str = "004_shop_lat_lon_index"
+down_revision: Union[str, None] = "003_conflicting_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# pylint: enable=C0103
+
+
+def upgrade() -> None:
+    """Backfill lat/lon from osm_data and index them together."""
+    op.execute(
+        """
+        UPDATE shop
+        SET lat = (osm_data->>'lat')::double precision,
+            lon = (osm_data->>'lon')::double precision
+        WHERE (lat IS NULL OR lon IS NULL)
+          AND osm_data ? 'lat' AND osm_data ? 'lon'
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_shop_lat_lon ON shop (lat, lon)")
+
+
+def downgrade() -> None:
+    """Drop the composite lat/lon index."""
+    op.execute("DROP INDEX IF EXISTS idx_shop_lat_lon")
@@ -0,0 +1,37 @@
+"""Spatial index on shop coordinates for nearest-shop queries
+
+Revision ID: 005_shop_earthdistance_index
+Revises: 004_shop_lat_lon_index
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+# pylint: disable=C0103
+revision: str = "005_shop_earthdistance_index"
+down_revision: Union[str, None] = "004_shop_lat_lon_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# pylint: enable=C0103
+
+
+def upgrade() -> None:
+    """Enable earthdistance and index shop positions as points on the earth."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS cube")
+    op.execute("CREATE EXTENSION IF NOT EXISTS earthdistance")
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_shop_earth ON shop
+        USING gist (ll_to_earth(lat, lon))
+        WHERE lat IS NOT NULL AND lon IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the spatial index and the extensions it needs."""
+    op.execute("DROP INDEX IF EXISTS idx_shop_earth")
+    op.execute("DROP EXTENSION IF EXISTS earthdistance")
+    op.execute("DROP EXTENSION IF EXISTS cube")
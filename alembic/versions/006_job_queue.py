@@ -0,0 +1,56 @@
+"""Job table for background receipt parsing
+
+Revision ID: 006_job_queue
+Revises: 005_shop_earthdistance_index
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+# pylint: disable=C0103
+revision: str = "006_job_queue"
+down_revision: Union[str, None] = "005_shop_earthdistance_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# pylint: enable=C0103
+
+
+def upgrade() -> None:
+    """Create the job table with partial indexes on claimable rows."""
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job (
+            id UUID PRIMARY KEY,
+            kind VARCHAR(50) NOT NULL,
+            payload JSONB NOT NULL DEFAULT '{}',
+            status VARCHAR(20) NOT NULL DEFAULT 'queued'
+                CHECK (status IN ('queued', 'running', 'done', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            result JSONB,
+            error TEXT,
+            locked_by VARCHAR(255),
+            run_after TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMPTZ,
+            finished_at TIMESTAMPTZ,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    # workers only ever scan queued and running rows, finished ones stay out of the index
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_job_queued ON job (run_after) "
+        "WHERE status = 'queued'"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_job_running ON job (started_at) "
+        "WHERE status = 'running'"
+    )
+
+
+def downgrade() -> None:
+    """Drop the job table."""
+    op.execute("DROP TABLE IF EXISTS job")
@@ -0,0 +1,202 @@
+"""
+Per-request overhead of the Appwrite ASGI bridge, driving a FastAPI app through
+AppwriteFastAPIAdapter with a fake Appwrite context, against the bridge it
+replaced and against calling the ASGI app directly.
+
+    python -m benchmarks.appwrite_bridge [--number 500]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from fastapi import FastAPI, Request
+from starlette.responses import Response, StreamingResponse
+
+from src.adapters.rest.appwrite_fastapi_adapter import AppwriteFastAPIAdapter
+from src.adapters.rest.responses import FastJSONResponse
+from benchmarks.json_responses import make_shops
+
+STREAM_CHUNKS = 2000
+UPLOAD_SIZE = 1024 * 1024
+
+
+class FakeAppwriteResponse:
+    """context.res of the Python runtime, keeping what a real one would send."""
+
+    def binary(self, body, status=200, headers=None):
+        return body
+
+    def send(self, body, status=200, headers=None):
+        return body
+
+    def json(self, obj, status=200, headers=None):
+        return json.dumps(obj).encode("utf-8")
+
+
+def make_app() -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    shops = make_shops(50)
+
+    @app.get("/shops")
+    def get_shops():
+        return FastJSONResponse(content=shops)
+
+    @app.get("/stream")
+    def stream():
+        async def chunks():
+            for _ in range(STREAM_CHUNKS):
+                yield b"x" * 64
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        return Response(content=str(len(await request.body())).encode())
+
+    return app
+
+
+def make_context(path: str, method: str = "GET", body: bytes = b""):
+    req = SimpleNamespace(
+        headers={"Host": "pbapi.example.com", "Accept": "*/*"},
+        method=method,
+        path=path,
+        query_string="",
+        body_binary=body,
+        body_text=body.decode("latin-1"),
+    )
+    return SimpleNamespace(req=req, res=FakeAppwriteResponse())
+
+
+async def legacy_handle(app: FastAPI, context):
+    """
+    The bridge before the rewrite: bytes +=, JSON decoded and re-encoded.
+    Its receive() repeated the request forever, which streaming responses spin
+    on, here it waits for the response like the adapter's does.
+    """
+    headers = []
+    for key, value in context.req.headers.items():
+        headers.append((key.lower().encode("latin-1"), str(value).encode("latin-1")))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.0"},
+        "http_version": "1.1",
+        "method": context.req.method,
+        "scheme": "https",
+        "path": context.req.path,
+        "query_string": context.req.query_string.encode("latin-1"),
+        "headers": headers,
+        "appwrite_context": context,
+    }
+    response_body = b""
+    response_status = 200
+    response_headers = {}
+    body_sent = False
+    complete = asyncio.Event()
+
+    async def receive():
+        nonlocal body_sent
+        if body_sent:
+            await complete.wait()
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {
+            "type": "http.request",
+            "body": (
+                context.req.body_text.encode("utf-8")
+                if isinstance(context.req.body_text, str)
+                else (context.req.body_binary or b"")
+            ),
+            "more_body": False,
+        }
+
+    async def send(message):
+        nonlocal response_body, response_status, response_headers
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+            for key, value in message.get("headers", []):
+                response_headers[key.decode("latin-1")] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            response_body += message.get("body", b"")
+            if not message.get("more_body", False):
+                complete.set()
+
+    await app(scope, receive, send)
+    if "application/json" in response_headers.get("content-type", ""):
+        data = json.loads(response_body.decode("utf-8"))
+        return context.res.json(data, response_status)
+    return context.res.send(
+        response_body.decode("utf-8"), response_status, response_headers
+    )
+
+
+async def direct(app: FastAPI, context):
+    """The ASGI app alone, the floor any bridge adds its overhead to."""
+    body_sent = False
+    complete = asyncio.Event()
+
+    async def receive():
+        nonlocal body_sent
+        if body_sent:
+            await complete.wait()
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {
+            "type": "http.request",
+            "body": context.req.body_binary,
+            "more_body": False,
+        }
+
+    async def send(message):
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            complete.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": context.req.method,
+        "scheme": "https",
+        "path": context.req.path,
+        "query_string": b"",
+        "headers": [],
+    }
+    await app(scope, receive, send)
+
+
+async def measure(handle, make, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        await handle(make())
+    return (time.perf_counter() - started) / number
+
+
+async def run(number: int) -> None:
+    app = make_app()
+    adapter = AppwriteFastAPIAdapter(app)
+    upload = b"x" * UPLOAD_SIZE
+    cases = {
+        "shops json": lambda: make_context("/shops"),
+        f"stream {STREAM_CHUNKS} chunks": lambda: make_context("/stream"),
+        "upload 1 MiB": lambda: make_context("/upload", "POST", upload),
+    }
+    bridges = {
+        "direct asgi": lambda context: direct(app, context),
+        "legacy bridge": lambda context: legacy_handle(app, context),
+        "adapter": adapter.handle,
+    }
+    for name, make in cases.items():
+        print(name)
+        for bridge_name, handle in bridges.items():
+            best = min([await measure(handle, make, number) for _ in range(3)])
+            print(f"  {bridge_name:14} {best * 1e6:10.1f} us/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.number))
@@ -0,0 +1,63 @@
+"""
+Per-barcode Python loop against the vectorized batch validation.
+
+    python -m benchmarks.barcode_validation [--count 100000]
+"""
+
+import argparse
+import random
+import timeit
+
+from src.helpers.barcode import check_digits, validate_barcode, validate_barcodes
+
+
+def validate_barcode_loop(barcode: str) -> bool:
+    """The per-character loop validate_barcode() used before the batch API."""
+    if not barcode.isdigit() or len(barcode) not in (8, 12, 13, 14):
+        return False
+
+    total = 0
+    body = barcode[:-1]
+    for i, num in enumerate(body):
+        weight = 3 if (len(body) - i) % 2 else 1
+        total += int(num) * weight
+
+    return str((10 - (total % 10)) % 10) == barcode[-1]
+
+
+def make_barcodes(count: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    bodies = [
+        "".join(rng.choices("0123456789", k=rng.choice((7, 11, 12, 13))))
+        for _ in range(count)
+    ]
+    checks = check_digits(bodies).tolist()
+    # a tenth of the batch carries a wrong check digit
+    return [
+        f"{body}{(check + (rng.random() < 0.1)) % 10}"
+        for body, check in zip(bodies, checks)
+    ]
+
+
+def run(count: int, repeat: int) -> None:
+    barcodes = make_barcodes(count)
+    expected = [validate_barcode_loop(code) for code in barcodes]
+    assert validate_barcodes(barcodes).valid.tolist() == expected
+
+    paths = {
+        "python loop": lambda: [validate_barcode_loop(code) for code in barcodes],
+        "scalar api": lambda: [validate_barcode(code) for code in barcodes[:10000]],
+        "numpy batch": lambda: validate_barcodes(barcodes),
+    }
+    for name, path in paths.items():
+        best = min(timeit.repeat(path, number=1, repeat=repeat))
+        size = 10000 if name == "scalar api" else count
+        print(f"{name:12} {best * 1000:9.1f} ms  {size / best / 1e6:6.2f} M barcodes/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.count, args.repeat)
@@ -0,0 +1,139 @@
+"""
+Cold start of the Appwrite entrypoint: fresh interpreters importing
+src/adapters/rest/appwrite_functions.py and serving one /health request,
+against the same start with every handler and driver imported up front, as
+the routes did before they imported them lazily.
+
+    python -m benchmarks.cold_start [--runs 10]
+
+Secrets come from a fresh snapshot, the Doppler round trip it saves is timed
+as well when PBAPI_DOPPLER_PROD_TOKEN is set.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from src import constants as c
+from src.adapters.doppler import snapshot_path, write_secrets_snapshot
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the modules fastapi_routes and fastapi_app used to import at the top
+EAGER_IMPORTS = """
+import src.adapters.db.pool, src.adapters.db.postgresql_async
+import src.handlers.add_barcodes, src.handlers.link_shop, src.handlers.jobs
+import src.handlers.shops, src.handlers.user_identity
+"""
+
+START = """
+import asyncio, json, sys, time
+from types import SimpleNamespace
+started = time.perf_counter()
+{prelude}
+import src.adapters.rest.appwrite_functions as entry
+imported = time.perf_counter()
+
+class Res:
+    def binary(self, body, status, headers):
+        return status
+
+req = SimpleNamespace(headers={{}}, method="GET", path="/health", query_string="",
+                      body_binary=b"", body_text="")
+context = SimpleNamespace(req=req, res=Res(), log=lambda message: None)
+status = asyncio.run(entry.main(context))
+assert status == 200, status
+done = time.perf_counter()
+print(json.dumps({{
+    "import": imported - started,
+    "request": done - imported,
+    "phases": entry.startup_profile.phases,
+}}))
+"""
+
+
+def start_once(prelude: str, env: dict) -> dict:
+    wall = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", START.format(prelude=prelude)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample["wall"] = time.perf_counter() - wall
+    return sample
+
+
+def interpreter_once(env: dict) -> float:
+    wall = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+    return time.perf_counter() - wall
+
+
+def summarize(name: str, samples: list) -> None:
+    def median(key):
+        return statistics.median(sample[key] for sample in samples) * 1000
+
+    secrets = statistics.median(s["phases"]["secrets"] for s in samples) * 1000
+    print(
+        f"{name:22} wall {median('wall'):7.1f} ms  import {median('import'):7.1f} ms"
+        f"  (secrets {secrets:5.1f} ms)  first request {median('request'):6.1f} ms"
+    )
+
+
+def run(runs: int) -> None:
+    base_env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in c.REQUIRED_ENV_VAR_NAMES
+    }
+    # snapshots are keyed by token, project and config, any values do without a token
+    doppler = {
+        c.DOPPLER_TOKEN_NAME: os.environ.get(c.DOPPLER_TOKEN_NAME, "benchmark"),
+        c.DOPPLER_PROJECT_NAME: os.environ.get(c.DOPPLER_PROJECT_NAME, "pbapi"),
+        "DOPPLER_ENVIRONMENT": os.environ.get(
+            "DOPPLER_ENVIRONMENT", os.environ.get("ENV_NAME", "benchmark")
+        ),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        env = base_env | doppler
+        env |= {
+            "DOPPLER_SNAPSHOT_DIR": tmp,
+            "DOPPLER_SNAPSHOT_TTL": "300",
+            "PYTHONPATH": ROOT,
+        }
+        write_secrets_snapshot(
+            snapshot_path(*doppler.values(), directory=tmp),
+            {name: "benchmark" for name in c.REQUIRED_ENV_VAR_NAMES},
+        )
+
+        floor = statistics.median(interpreter_once(env) for _ in range(runs)) * 1000
+        print(f"{'interpreter':22} wall {floor:7.1f} ms")
+        summarize("lazy (current)", [start_once("", env) for _ in range(runs)])
+        summarize(
+            "eager imports", [start_once(EAGER_IMPORTS, env) for _ in range(runs)]
+        )
+
+        if os.environ.get(c.DOPPLER_TOKEN_NAME):
+            summarize(
+                "doppler, no snapshot",
+                [
+                    start_once("", env | {"DOPPLER_SNAPSHOT_TTL": "0"})
+                    for _ in range(runs)
+                ],
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    run(args.runs)
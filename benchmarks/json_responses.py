@@ -0,0 +1,89 @@
+"""
+JSON response cost for the User and shops list payloads: jsonable_encoder and
+stdlib json against FastJSONResponse, and the Appwrite bridge decoding and
+re-encoding the body against passing the bytes through.
+
+    python -m benchmarks.json_responses [--shops 50]
+"""
+
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from src.adapters.rest.responses import FastJSONResponse
+from src.schemas.user import User
+
+
+def make_shops(count: int) -> dict:
+    """A shops_handler() page, rows as read_many() returns them."""
+    items = [
+        {
+            "id": uuid.uuid4(),
+            "country_code": "md",
+            "company_id": str(1003600000000 + i),
+            "address": None,
+            "osm_data": {
+                "type": "node",
+                "key": i,
+                "lat": "47.0105",
+                "lon": "28.8638",
+                "display_name": f"Shop {i}, Chisinau",
+                "address": {"city": "Chisinau", "road": "Stefan cel Mare"},
+            },
+            "lat": Decimal("47.0105"),
+            "lon": Decimal("28.8638"),
+            "shop_address": f"str. Stefan cel Mare {i}",
+            "created_at": datetime(2025, 1, 2, 10, 30, tzinfo=timezone.utc),
+        }
+        for i in range(count)
+    ]
+    return {"items": items, "count": count, "limit": count, "next_cursor": None}
+
+
+def encoder_path(content) -> bytes:
+    """What the routes did: jsonable_encoder(), then the stdlib json render."""
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+def fast_path(content) -> bytes:
+    return FastJSONResponse(content=content).body
+
+
+def appwrite_reencode(body: bytes) -> str:
+    """The bridge's old JSON path: json.loads() and context.res.json()'s dumps."""
+    return json.dumps(json.loads(body.decode("utf-8")))
+
+
+def run(shops: int, number: int, repeat: int) -> None:
+    payloads = {
+        "user": User(email="jane@example.com", name="Jane", gender="female"),
+        f"shops[{shops}]": make_shops(shops),
+    }
+    for name, content in payloads.items():
+        assert json.loads(encoder_path(content)) == json.loads(fast_path(content))
+        body = fast_path(content)
+        print(f"{name}, {len(body)} bytes")
+
+        paths = {
+            "jsonable+json": lambda: encoder_path(content),
+            "orjson": lambda: fast_path(content),
+            "appwrite re-encode": lambda: appwrite_reencode(body),
+        }
+        for path_name, path in paths.items():
+            best = min(timeit.repeat(path, number=number, repeat=repeat)) / number
+            print(f"  {path_name:19} {best * 1e6:9.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shops", type=int, default=50)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.shops, args.number, args.repeat)
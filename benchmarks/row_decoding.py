@@ -0,0 +1,157 @@
+"""
+Per-row cost of turning user and shop rows into models: dict rows validated
+through Model(**row) against row tuples decoded by ModelRowFactory.
+
+    python -m benchmarks.row_decoding [--count 20000]
+
+Rows are built in memory as the drivers return them, so the numbers cover JSONB
+decoding (json against orjson) and model building, not the wire. The factory
+wins where validation is costly, User's EmailStr above all; a small model like
+Shop validates in pydantic-core about as fast as model_construct() builds it.
+"""
+
+import argparse
+import json
+import timeit
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import orjson
+
+from src.adapters.db.postgresql import PostgreSQLQueryMixin
+from src.adapters.db.rows import get_row_factory
+from src.schemas.common import TableName
+from src.schemas.shop import Shop
+from src.schemas.user import User
+
+USER_COLUMNS = (
+    "id",
+    "email",
+    "name",
+    "login_generation",
+    "banned",
+    "self_description",
+    "gender",
+    "birthday",
+    "user_rights_group",
+    "avatar_id",
+    "creation_time",
+    "data",
+)
+SHOP_COLUMNS = (
+    "id",
+    "country_code",
+    "company_id",
+    "address",
+    "osm_data",
+    "lat",
+    "lon",
+    "data",
+)
+
+
+def make_user_rows(count: int) -> list[tuple]:
+    data = json.dumps({"created_at": "2025-01-02T10:00:00+00:00", "locale": "ro"})
+    return [
+        (
+            uuid.uuid4(),
+            f"user{i}@example.com",
+            f"User {i}",
+            1,
+            False,
+            None,
+            i % 5 + 1,
+            date(1990, 1, 1),
+            1,
+            None,
+            1700000000 + i,
+            data,
+        )
+        for i in range(count)
+    ]
+
+
+def make_shop_rows(count: int) -> list[tuple]:
+    return [
+        (
+            uuid.uuid4(),
+            "md",
+            str(1003600000000 + i),
+            None,
+            json.dumps(
+                {
+                    "type": "node",
+                    "key": i,
+                    "lat": "47.0105",
+                    "lon": "28.8638",
+                    "display_name": f"Shop {i}, Chisinau",
+                    "address": {"city": "Chisinau", "road": "Stefan cel Mare"},
+                }
+            ),
+            Decimal("47.0105"),
+            Decimal("28.8638"),
+            json.dumps({"shop_address": f"str. Stefan cel Mare {i}"}),
+        )
+        for i in range(count)
+    ]
+
+
+def decode_jsonb(columns: tuple, rows: list[tuple], loads) -> list[tuple]:
+    """What the driver hands back once its JSONB loads has run."""
+    jsonb = [i for i, column in enumerate(columns) if column in ("osm_data", "data")]
+    decoded = []
+    for row in rows:
+        row = list(row)
+        for i in jsonb:
+            row[i] = loads(row[i])
+        decoded.append(tuple(row))
+    return decoded
+
+
+def dict_path(model, table: TableName, columns: tuple, rows: list[tuple]):
+    """What read_many() does: a dict per row, flattened, then validated."""
+    mixin = PostgreSQLQueryMixin().use_table(table)
+    return [model(**mixin._row_to_dict(dict(zip(columns, row)))) for row in rows]
+
+
+def tuple_path(model, columns: tuple, rows: list[tuple]):
+    factory = get_row_factory(model, columns)
+    return [factory(row) for row in rows]
+
+
+def timed(path, repeat: int) -> float:
+    return min(timeit.repeat(path, number=1, repeat=repeat))
+
+
+def run(count: int, repeat: int) -> None:
+    cases = {
+        "user": (User, TableName.USER, USER_COLUMNS, make_user_rows(count)),
+        "shop": (Shop, TableName.SHOP, SHOP_COLUMNS, make_shop_rows(count)),
+    }
+    for name, (model, table, columns, raw) in cases.items():
+        rows = decode_jsonb(columns, raw, orjson.loads)
+        assert [m.model_dump() for m in tuple_path(model, columns, rows)] == [
+            m.model_dump() for m in dict_path(model, table, columns, rows)
+        ]
+
+        paths = {
+            "jsonb json": lambda: decode_jsonb(columns, raw, json.loads),
+            "jsonb orjson": lambda: decode_jsonb(columns, raw, orjson.loads),
+            "dict rows": lambda: dict_path(model, table, columns, rows),
+            "tuple factory": lambda: tuple_path(model, columns, rows),
+        }
+        for path_name, path in paths.items():
+            best = timed(path, repeat)
+            print(
+                f"{name} {path_name:14} {best * 1000:8.1f} ms  "
+                f"{best / count * 1e6:6.2f} us/row"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.count, args.repeat)
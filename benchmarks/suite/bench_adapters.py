@@ -0,0 +1,126 @@
+"""
+Single-row CRUD, bulk upserts and shop lookups through the sync DB adapters.
+
+    python -m pytest benchmarks/suite/bench_adapters.py [--scale 100k] [--backend sqlite]
+"""
+
+import uuid
+from itertools import count
+
+import pytest
+
+from benchmarks.suite.data import Row
+from src.handlers.shops import (
+    CHISINAU_LAT_MAX,
+    CHISINAU_LAT_MIN,
+    CHISINAU_LON_MAX,
+    CHISINAU_LON_MIN,
+)
+from src.schemas.common import Operator, TableName
+
+UPSERT_BATCH = 1000
+# a viewport over a quarter of the area the shops are spread on
+VIEWPORT = {
+    "lat": {Operator.GE: 46.98, Operator.LE: 47.04},
+    "lon": {Operator.GE: 28.80, Operator.LE: 28.865},
+}
+CENTER = (
+    (CHISINAU_LAT_MIN + CHISINAU_LAT_MAX) / 2,
+    (CHISINAU_LON_MIN + CHISINAU_LON_MAX) / 2,
+)
+
+
+def _new_item(shop_id: str, _id: str | None = None, name: str = "Bench item") -> Row:
+    return {
+        "id": _id or str(uuid.uuid4()),
+        "shop_id": shop_id,
+        "name": name,
+        "status": "pending",
+    }
+
+
+@pytest.fixture
+def items(db):
+    return db.use_table(TableName.SHOP_ITEM)
+
+
+@pytest.fixture
+def shops(db):
+    return db.use_table(TableName.SHOP)
+
+
+@pytest.fixture
+def some_item(items, dataset) -> Row:
+    return items.read_one(dataset.item_ids[0])
+
+
+def test_read_one(benchmark, items, dataset):
+    ids = dataset.item_ids
+    position = count()
+
+    found = benchmark(lambda: items.read_one(ids[next(position) % len(ids)]))
+
+    assert found is not None
+
+
+def test_create_one(benchmark, items, some_item):
+    benchmark(lambda: items.create_one(_new_item(some_item["shop_id"])))
+
+
+def test_update_one(benchmark, items, dataset):
+    ids = dataset.item_ids
+    position = count()
+
+    def update():
+        i = next(position)
+        return items.update_one(ids[i % len(ids)], {"name": f"Renamed {i}"})
+
+    assert benchmark(update)
+
+
+def test_delete_one(benchmark, items, some_item):
+    def setup():
+        return (items.create_one(_new_item(some_item["shop_id"])),), {}
+
+    deleted = benchmark.pedantic(items.delete_one, setup=setup, rounds=200)
+
+    assert deleted
+
+
+def test_upsert_many(benchmark, items, dataset, some_item):
+    """Half of every batch overwrites existing items, the other half is new."""
+    ids = dataset.item_ids
+    half = UPSERT_BATCH // 2
+    position = count()
+
+    def upsert():
+        start = next(position) * half % len(ids)
+        shop_id = some_item["shop_id"]
+        existing = [
+            _new_item(shop_id, ids[(start + i) % len(ids)], f"Upserted {i}")
+            for i in range(half)
+        ]
+        new = [_new_item(shop_id) for _ in range(half)]
+        return items.upsert_many(existing + new)
+
+    results = benchmark.pedantic(upsert, rounds=20)
+
+    assert len(results) == UPSERT_BATCH
+
+
+def test_viewport_page(benchmark, shops):
+    page = benchmark(
+        lambda: shops.read_many(VIEWPORT, limit=50, order_by=shops.id_column)
+    )
+
+    assert page
+
+
+def test_viewport_count(benchmark, shops):
+    assert benchmark(lambda: shops.count(VIEWPORT)) > 0
+
+
+def test_nearest_shops(benchmark, shops):
+    nearest = benchmark(lambda: shops.nearest_shops(*CENTER, radius=1000, limit=10))
+
+    assert nearest
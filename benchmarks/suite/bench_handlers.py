@@ -0,0 +1,105 @@
+"""
+The shops listing and login flow handlers. Both are tied to PostgreSQL, so
+they only run against the postgres backend.
+
+    python -m pytest benchmarks/suite/bench_handlers.py [--scale 100k]
+"""
+
+import asyncio
+import logging
+import uuid
+from itertools import count
+
+import pytest
+
+from benchmarks.suite.data import PROVIDER, identity_id
+from src.adapters.cache.identity import IdentityCache
+from src.adapters.cache.memory import InMemoryCacheBackend
+
+logger = logging.getLogger("benchmarks")
+
+# shops_handler and UserIdentityHandler always open PostgreSQL sessions
+BACKENDS = ["postgres"]
+VIEWPORT = {"lat_min": 46.98, "lat_max": 47.04, "lon_min": 28.80, "lon_max": 28.865}
+
+
+@pytest.fixture(scope="module")
+def loop():
+    # pylint: disable=import-outside-toplevel
+    from src.adapters.db.postgresql_async import close_async_pool
+
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(close_async_pool())
+    loop.close()
+
+
+@pytest.fixture
+def login(loop, dataset):
+    """Runs one login of (identity id, email) with the given identity cache."""
+    # pylint: disable=import-outside-toplevel
+    from src.adapters.db.postgresql_async import init_async_db_session
+    from src.handlers.user_identity import UserIdentityHandler
+
+    async def log_in(cache: IdentityCache, _id: str, email: str):
+        async with init_async_db_session(logger) as db:
+            handler = UserIdentityHandler(logger, db, cache)
+            return await handler.get_or_create_user_by_identity(
+                _id, PROVIDER, email, "Benchmark user"
+            )
+
+    return lambda cache, _id, email: loop.run_until_complete(log_in(cache, _id, email))
+
+
+def _shops(query_params):
+    # pylint: disable=import-outside-toplevel
+    from src.handlers.shops import shops_handler
+
+    return shops_handler(query_params, logger)
+
+
+def test_shops_viewport(benchmark, dataset):
+    status, body = benchmark(lambda: _shops({**VIEWPORT, "limit": 50}))
+
+    assert status == 200 and body["items"]
+
+
+def test_shops_next_page(benchmark, dataset):
+    _, first = _shops({"limit": 50})
+
+    status, body = benchmark(
+        lambda: _shops({"limit": 50, "cursor": first["next_cursor"]})
+    )
+
+    assert status == 200 and body["items"]
+
+
+def test_login_known_identity(benchmark, login, dataset):
+    """Cache miss on every call: the identity is found in the database."""
+    cache = IdentityCache(InMemoryCacheBackend(), ttl=0)
+    users = dataset.scale.users
+    position = count()
+
+    def known():
+        i = next(position) % users
+        return login(cache, identity_id(i), f"user{i}@example.com")
+
+    assert benchmark(known)
+
+
+def test_login_new_identity(benchmark, login):
+    """First login: the user and the identity are created."""
+    cache = IdentityCache(InMemoryCacheBackend(), ttl=0)
+
+    def new():
+        token = uuid.uuid4().hex
+        return login(cache, f"{PROVIDER}-new-{token}", f"{token}@example.com")
+
+    assert benchmark(new)
+
+
+def test_login_cached_identity(benchmark, login):
+    cache = IdentityCache(InMemoryCacheBackend())
+    login(cache, identity_id(0), "user0@example.com")
+
+    assert benchmark(lambda: login(cache, identity_id(0), "user0@example.com"))
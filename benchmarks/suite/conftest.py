@@ -0,0 +1,285 @@
+"""
+Loads the synthetic dataset once per session into each selected backend:
+a temporary SQLite file, and a migrated PostgreSQL database.
+
+    --scale 10k|100k|1m      rows in the item tables (default: 10k)
+    --backend all|sqlite|postgres
+"""
+
+import logging
+import os
+import tempfile
+from typing import Callable, ContextManager, Iterator, List, NamedTuple
+
+import pytest
+from psycopg2.extras import execute_values
+
+from benchmarks.suite.data import (
+    SCALES,
+    Row,
+    Scale,
+    batched,
+    make_identities,
+    make_purchased_items,
+    make_receipts,
+    make_shop_items,
+    make_shops,
+    make_users,
+    user_id,
+)
+from src.schemas.common import TableName
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LOAD_BATCH = 10_000
+# Ids kept in memory for lookups, the full id lists of the large tables are not
+SAMPLE_SIZE = 10_000
+POSTGRES_IMAGE = "postgres:17"
+BACKENDS = ["sqlite", "postgres"]
+
+logger = logging.getLogger("benchmarks")
+
+POSTGRES_TABLES = [
+    "purchased_item",
+    "receipt",
+    "shop_item",
+    "user_session",
+    "user_identity",
+    "shop",
+    '"user"',
+]
+
+SQLITE_TABLES = {
+    TableName.USER: "email TEXT UNIQUE, name TEXT, login_generation INTEGER, "
+    "banned INTEGER, gender INTEGER, user_rights_group INTEGER, creation_time INTEGER",
+    TableName.USER_IDENTITY: "provider TEXT, user_id TEXT",
+    TableName.SHOP: "country_code TEXT, company_id TEXT, address TEXT, "
+    "lat REAL, lon REAL, geohash TEXT",
+    TableName.SHOP_ITEM: "shop_id TEXT, name TEXT, status TEXT, barcode TEXT",
+    TableName.RECEIPT: "user_id TEXT, date TEXT, company_id TEXT, company_name TEXT, "
+    "country_code TEXT, cash_register_id TEXT, key TEXT, currency_code TEXT, "
+    "total_amount REAL, receipt_url TEXT, shop_id TEXT",
+    TableName.PURCHASED_ITEM: "receipt_id TEXT, name TEXT, quantity REAL, "
+    "quantity_unit TEXT, price REAL, item_id TEXT",
+}
+# the indexes the Postgres migrations create for the same lookups
+SQLITE_INDEXES = [
+    f'CREATE INDEX idx_shop_lat_lon ON "{TableName.SHOP}" (lat, lon)',
+    f'CREATE INDEX idx_shop_geohash ON "{TableName.SHOP}" (geohash)',
+    f'CREATE INDEX idx_shop_item_shop_id ON "{TableName.SHOP_ITEM}" (shop_id)',
+    f'CREATE INDEX idx_user_identity_user_id ON "{TableName.USER_IDENTITY}" (user_id)',
+    f'CREATE INDEX idx_receipt_user_id ON "{TableName.RECEIPT}" (user_id)',
+    "CREATE INDEX idx_purchased_item_receipt_id "
+    f'ON "{TableName.PURCHASED_ITEM}" (receipt_id)',
+]
+
+
+class Dataset(NamedTuple):
+    scale: Scale
+    # opens a sync adapter on the loaded database
+    session: Callable[[], ContextManager]
+    user_ids: List[str]
+    # the first SAMPLE_SIZE shop items
+    item_ids: List[str]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("pbapi")
+    group.addoption(
+        "--scale",
+        choices=sorted(SCALES),
+        default="10k",
+        help="rows in the largest tables (default: 10k)",
+    )
+    group.addoption(
+        "--backend",
+        choices=["all", *BACKENDS],
+        default="all",
+        help="database to benchmark against (default: all)",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Run every benchmark once per selected backend its module supports."""
+    if "backend" in metafunc.fixturenames:
+        backend = metafunc.config.getoption("backend")
+        supported = getattr(metafunc.module, "BACKENDS", BACKENDS)
+        backends = [b for b in supported if backend in ("all", b)]
+        metafunc.parametrize("backend", backends, scope="session")
+
+
+@pytest.fixture(scope="session")
+def scale(request) -> Scale:
+    return SCALES[request.config.getoption("scale")]
+
+
+def _load(adapter, scale: Scale, load_shops: Callable[[List[Row]], None]) -> tuple:
+    """
+    Load every table through the adapter's create_many in batches, except shops
+    which go through `load_shops`. Returns the user ids and a sample of item ids.
+    """
+    user_ids = [user_id(i) for i in range(scale.users)]
+    for table, rows in (
+        (TableName.USER, make_users(scale.users)),
+        (TableName.USER_IDENTITY, make_identities(scale.users)),
+    ):
+        adapter.use_table(table)
+        for batch in batched(rows, LOAD_BATCH):
+            adapter.create_many(batch)
+
+    shop_ids = []
+    for batch in batched(make_shops(scale.shops), LOAD_BATCH):
+        load_shops(batch)
+        shop_ids.extend(row["id"] for row in batch)
+
+    item_ids = []
+    adapter.use_table(TableName.SHOP_ITEM)
+    for batch in batched(make_shop_items(scale.shop_items, shop_ids), LOAD_BATCH):
+        adapter.create_many(batch)
+        item_ids.extend(row["id"] for row in batch[: SAMPLE_SIZE - len(item_ids)])
+
+    receipt_ids = []
+    adapter.use_table(TableName.RECEIPT)
+    for batch in batched(make_receipts(scale.receipts, user_ids, shop_ids), LOAD_BATCH):
+        adapter.create_many(batch)
+        receipt_ids.extend(row["id"] for row in batch[: SAMPLE_SIZE - len(receipt_ids)])
+
+    adapter.use_table(TableName.PURCHASED_ITEM)
+    rows = make_purchased_items(scale.purchased_items, receipt_ids, item_ids)
+    for batch in batched(rows, LOAD_BATCH):
+        adapter.create_many(batch)
+    return user_ids, item_ids
+
+
+@pytest.fixture(scope="session")
+def sqlite_dataset(scale) -> Iterator[Dataset]:
+    # pylint: disable=import-outside-toplevel
+    from src.adapters.db.sqlite import SQLiteDBAdapter
+    from src.adapters.db.sqlite_engine import close_sqlite_engines
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite3")
+        adapter = SQLiteDBAdapter(logger, path)
+        for table, columns in SQLITE_TABLES.items():
+            adapter.conn.execute(
+                f"CREATE TABLE {table} (_id TEXT PRIMARY KEY, {columns})"
+            )
+        for index in SQLITE_INDEXES:
+            adapter.conn.execute(index)
+
+        def load_shops(batch: List[Row]) -> None:
+            adapter.use_table(TableName.SHOP).create_many(batch)
+
+        user_ids, item_ids = _load(adapter, scale, load_shops)
+        adapter.conn.execute("ANALYZE")
+        yield Dataset(scale, lambda: SQLiteDBAdapter(logger, path), user_ids, item_ids)
+        close_sqlite_engines()
+
+
+def _migrate(host: str, port: str, db: str, user: str, password: str) -> None:
+    """alembic upgrade head, alembic/env.py reads <ENV_NAME>_POSTGRES_* settings."""
+    # pylint: disable=import-outside-toplevel
+    from alembic import command
+    from alembic.config import Config
+
+    os.environ.update(
+        ENV_NAME="bench",
+        BENCH_POSTGRES_HOST=host,
+        BENCH_POSTGRES_PORT=port,
+        BENCH_POSTGRES_DB=db,
+        BENCH_POSTGRES_USER=user,
+        BENCH_POSTGRES_PASSWORD=password,
+    )
+    config = Config()
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture(scope="session")
+def postgres_server() -> Iterator[None]:
+    """
+    A migrated database in the POSTGRES_* environment the adapters read.
+    PBAPI_BENCH_POSTGRES_DB names an existing, migrated database the suite may
+    wipe; otherwise a throwaway container is started with testcontainers.
+    """
+    if os.environ.get("PBAPI_BENCH_POSTGRES_DB"):
+        os.environ["POSTGRES_DB"] = os.environ["PBAPI_BENCH_POSTGRES_DB"]
+        yield
+        return
+
+    postgres = pytest.importorskip("testcontainers.postgres")
+    container = postgres.PostgresContainer(POSTGRES_IMAGE, driver=None)
+    try:
+        container.start()
+    except Exception as e:  # pylint: disable=broad-except
+        pytest.skip(f"Cannot start a Postgres container: {e}")
+    try:
+        settings = {
+            "POSTGRES_HOST": container.get_container_host_ip(),
+            "POSTGRES_PORT": str(container.get_exposed_port(5432)),
+            "POSTGRES_DB": container.dbname,
+            "POSTGRES_USER": container.username,
+            "POSTGRES_PASSWORD": container.password,
+        }
+        os.environ.update(settings)
+        _migrate(*settings.values())
+        yield
+    finally:
+        container.stop()
+
+
+@pytest.fixture(scope="session")
+def postgres_dataset(request, scale) -> Iterator[Dataset]:
+    # pylint: disable=import-outside-toplevel
+    from src.adapters.db.pool import close_pool
+    from src.adapters.db.postgresql import init_db_session
+
+    # marks cannot be applied to fixtures, so the server is requested here
+    request.getfixturevalue("postgres_server")
+
+    def session():
+        return init_db_session(logger)
+
+    with session() as adapter:
+        with adapter.connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {', '.join(POSTGRES_TABLES)} CASCADE")
+
+        def load_shops(batch: List[Row]) -> None:
+            # the shop table keeps its legacy serial id and NOT NULL columns that
+            # TABLE_COLUMNS does not cover, so shops are inserted directly
+            with adapter.connection.cursor() as cursor:
+                execute_values(
+                    cursor,
+                    "INSERT INTO shop (osm_id, creation_time, creator_user_id, "
+                    "lat, lon, address, company_id, country_code) VALUES %s",
+                    [
+                        (
+                            row["id"],
+                            1700000000,
+                            user_id(0),
+                            row["lat"],
+                            row["lon"],
+                            row["address"],
+                            row["company_id"],
+                            row["country_code"],
+                        )
+                        for row in batch
+                    ],
+                )
+
+        user_ids, item_ids = _load(adapter, scale, load_shops)
+        with adapter.connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {', '.join(POSTGRES_TABLES)}")
+    yield Dataset(scale, session, user_ids, item_ids)
+    close_pool()
+
+
+@pytest.fixture(scope="session")
+def dataset(request, backend) -> Dataset:
+    return request.getfixturevalue(f"{backend}_dataset")
+
+
+@pytest.fixture
+def db(dataset):
+    """A sync adapter on the loaded database of the current backend."""
+    with dataset.session() as adapter:
+        yield adapter
@@ -0,0 +1,153 @@
+"""
+Synthetic rows for the benchmark suite, shaped like the adapters take them.
+
+Every generator is seeded, so two runs at the same scale load the same data
+and their timings can be compared between commits.
+"""
+
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple
+
+from src.handlers.shops import (
+    CHISINAU_LAT_MAX,
+    CHISINAU_LAT_MIN,
+    CHISINAU_LON_MAX,
+    CHISINAU_LON_MIN,
+)
+
+SEED = 1337
+PROVIDER = "google"
+
+Row = Dict[str, Any]
+
+
+class Scale(NamedTuple):
+    """Rows per table, the item tables are the largest."""
+
+    users: int
+    shops: int
+    shop_items: int
+    receipts: int
+    purchased_items: int
+
+    @classmethod
+    def of(cls, items: int) -> "Scale":
+        return cls(
+            users=items // 10,
+            shops=max(items // 100, 100),
+            shop_items=items,
+            receipts=items // 10,
+            purchased_items=items,
+        )
+
+
+SCALES = {
+    "10k": Scale.of(10_000),
+    "100k": Scale.of(100_000),
+    "1m": Scale.of(1_000_000),
+}
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def user_id(i: int) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, f"pbapi-bench-user-{i}"))
+
+
+def identity_id(i: int) -> str:
+    return f"{PROVIDER}-{i:09d}"
+
+
+def make_users(count: int) -> Iterator[Row]:
+    for i in range(count):
+        yield {
+            "id": user_id(i),
+            "email": f"user{i}@example.com",
+            "name": f"User {i}",
+            "login_generation": 1,
+            "banned": False,
+            "gender": i % 5 + 1,
+            "user_rights_group": 1,
+            "creation_time": 1700000000 + i,
+        }
+
+
+def make_identities(count: int) -> Iterator[Row]:
+    for i in range(count):
+        yield {"id": identity_id(i), "provider": PROVIDER, "user_id": user_id(i)}
+
+
+def make_shops(count: int) -> Iterator[Row]:
+    rng = random.Random(SEED)
+    for i in range(count):
+        yield {
+            "id": _uuid(rng),
+            "country_code": "md",
+            "company_id": str(1003600000000 + i % 500),
+            "address": f"str. Stefan cel Mare {i}",
+            "lat": round(rng.uniform(CHISINAU_LAT_MIN, CHISINAU_LAT_MAX), 6),
+            "lon": round(rng.uniform(CHISINAU_LON_MIN, CHISINAU_LON_MAX), 6),
+        }
+
+
+def make_shop_items(count: int, shop_ids: List[str]) -> Iterator[Row]:
+    rng = random.Random(SEED + 1)
+    statuses = ("pending", "missing", "irrelevant", "added")
+    for i in range(count):
+        status = statuses[i % len(statuses)]
+        yield {
+            "id": _uuid(rng),
+            "shop_id": shop_ids[i % len(shop_ids)],
+            "name": f"Item {i % 5000}",
+            "status": status,
+            "barcode": f"{4840000000000 + i}" if status == "added" else None,
+        }
+
+
+def make_receipts(
+    count: int, user_ids: List[str], shop_ids: List[str]
+) -> Iterator[Row]:
+    rng = random.Random(SEED + 2)
+    started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        yield {
+            "id": f"receipt-{i:09d}",
+            "user_id": user_ids[i % len(user_ids)],
+            "date": (started + timedelta(minutes=i)).isoformat(),
+            "company_id": str(1003600000000 + i % 500),
+            "company_name": f"Company {i % 500}",
+            "country_code": "md",
+            "cash_register_id": f"J{i % 2000:09d}",
+            "key": str(i),
+            "currency_code": "mdl",
+            "total_amount": round(rng.uniform(5, 2000), 2),
+            "receipt_url": f"https://mev.sfs.md/receipt-verifier/J{i:09d}",
+            "shop_id": shop_ids[i % len(shop_ids)],
+        }
+
+
+def make_purchased_items(
+    count: int, receipt_ids: List[str], item_ids: List[str]
+) -> Iterator[Row]:
+    rng = random.Random(SEED + 3)
+    for i in range(count):
+        yield {
+            "id": _uuid(rng),
+            "receipt_id": receipt_ids[i % len(receipt_ids)],
+            "name": f"Item {i % 5000}",
+            "quantity": rng.randint(1, 5),
+            "quantity_unit": "pcs",
+            "price": round(rng.uniform(1, 300), 2),
+            "item_id": item_ids[i % len(item_ids)],
+        }
+
+
+def batched(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
@@ -0,0 +1,50 @@
+import argparse
+import logging
+import signal
+
+from dotenv import load_dotenv
+
+from src.adapters.queue.factory import get_job_queue
+from src.adapters.queue.worker import JobWorker
+from src.handlers.jobs import JOB_HANDLERS
+
+
+def run_worker():
+    parser = argparse.ArgumentParser(description="Run queued background jobs")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of jobs processed at once (default: 4)",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds to wait when the queue is empty (default: 1)",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger("job_worker")
+
+    worker = JobWorker(
+        get_job_queue(),
+        JOB_HANDLERS,
+        logger,
+        concurrency=args.concurrency,
+        poll_interval=args.poll_interval,
+    )
+    worker.start()
+    logger.info(f"Worker {worker.worker_id} started with {args.concurrency} threads")
+
+    # finish the jobs in progress before exiting
+    signal.sigwait({signal.SIGINT, signal.SIGTERM})
+    logger.info("Stopping worker")
+    worker.stop()
+
+
+if __name__ == "__main__":
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT, signal.SIGTERM})
+    run_worker()
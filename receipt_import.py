@@ -0,0 +1,280 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Set, TextIO
+from uuid import UUID
+
+from dotenv import load_dotenv
+
+from src.adapters.cache.html import get_html_cache
+from src.adapters.db.postgresql import init_db_session
+from src.adapters.http.fetcher import fetch_html_async
+from src.handlers.parse_from_url import persist_receipt
+from src.helpers.common import make_hash
+from src.parsers.sfs_md.receipt_parser import SfsMdReceiptParser
+from src.schemas.receipt import Receipt
+
+DEFAULT_CHECKPOINT = os.path.join("db", "receipt_import.checkpoint")
+# Seconds between progress lines
+PROGRESS_INTERVAL = 10.0
+
+
+@dataclass
+class ImportStats:
+    total: int = 0
+    skipped: int = 0
+    imported: int = 0
+    fetch_errors: int = 0
+    parse_errors: int = 0
+    write_errors: int = 0
+    started: float = 0.0
+
+    @property
+    def done(self) -> int:
+        return self.imported + self.fetch_errors + self.parse_errors + self.write_errors
+
+    def summary(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f"{self.done}/{self.total - self.skipped} processed, "
+            f"{self.imported} imported ({self.imported / elapsed:.1f} receipts/s), "
+            f"errors: fetch={self.fetch_errors} parse={self.parse_errors} "
+            f"write={self.write_errors}, skipped={self.skipped}"
+        )
+
+
+def read_urls(source: TextIO, done: Set[str], stats: ImportStats) -> List[str]:
+    """Unique urls in input order, without the ones the checkpoint marks as done."""
+    urls, seen = [], set()
+    for line in source:
+        url = line.strip()
+        if not url or url.startswith("#"):
+            continue
+        key = make_hash(url)
+        if key in seen:
+            continue
+        seen.add(key)
+        stats.total += 1
+        if key in done:
+            stats.skipped += 1
+            continue
+        urls.append(url)
+    return urls
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def save_checkpoint(path: str, urls: Iterable[str]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.writelines(f"{make_hash(url)}\n" for url in urls)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def parse_receipt(html: str, user_id: str, url: str) -> Receipt:
+    """Runs in a worker process, parsing is CPU bound and would stall the fetches."""
+    return SfsMdReceiptParser().parse_html(html).build_receipt(user_id, url)
+
+
+async def fetch_receipt_html(url: str, logger) -> str | None:
+    # pages fetched by an earlier, interrupted run are not downloaded again
+    cache = get_html_cache()
+    html = await asyncio.to_thread(cache.get, url)
+    if html is not None:
+        return html
+
+    html = await fetch_html_async(url, logger)
+    if html:
+        try:
+            await asyncio.to_thread(cache.set, url, html)
+        except OSError as e:
+            logger.warning(f"Failed to cache HTML for {url}: {e}")
+    return html
+
+
+def write_batch(
+    session, receipts: List[Receipt], logger, stats: ImportStats
+) -> List[str]:
+    """Commit the batch at once, a receipt the database rejects only rolls back itself."""
+    written = []
+    with session.transaction():
+        for receipt in receipts:
+            try:
+                # a savepoint of its own inside the batch transaction
+                persist_receipt(session, receipt)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error(f"Failed to store {receipt.receipt_url}: {e}")
+                stats.write_errors += 1
+            else:
+                written.append(receipt.receipt_url)
+    stats.imported += len(written)
+    return written
+
+
+async def import_receipts(
+    urls: List[str],
+    user_id: str,
+    logger,
+    stats: ImportStats,
+    checkpoint: str,
+    concurrency: int = 8,
+    processes: int | None = None,
+    batch_size: int = 50,
+) -> None:
+    loop = asyncio.get_running_loop()
+    pending: asyncio.Queue = asyncio.Queue()
+    for url in urls:
+        pending.put_nowait(url)
+    # bounded, so fetching pauses while the writer catches up
+    parsed: asyncio.Queue = asyncio.Queue(maxsize=batch_size * 2)
+
+    async def fetch_and_parse(pool: ProcessPoolExecutor) -> None:
+        while not pending.empty():
+            url = pending.get_nowait()
+            html = await fetch_receipt_html(url, logger)
+            if not html:
+                logger.warning(f"Failed to fetch {url}")
+                stats.fetch_errors += 1
+                continue
+            try:
+                receipt = await loop.run_in_executor(
+                    pool, parse_receipt, html, user_id, url
+                )
+            except ValueError as e:
+                logger.warning(f"Failed to parse {url}: {e}")
+                stats.parse_errors += 1
+                continue
+            await parsed.put(receipt)
+
+    async def write(session) -> None:
+        batch: List[Receipt] = []
+        last_progress = time.monotonic()
+        while True:
+            receipt = await parsed.get()
+            if receipt is not None:
+                batch.append(receipt)
+            if batch and (receipt is None or len(batch) >= batch_size):
+                written = await asyncio.to_thread(
+                    write_batch, session, batch, logger, stats
+                )
+                # only committed receipts are skipped on the next run
+                save_checkpoint(checkpoint, written)
+                batch = []
+            if time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+                print(stats.summary(), flush=True)
+                last_progress = time.monotonic()
+            if receipt is None:
+                return
+
+    with ProcessPoolExecutor(processes) as pool, init_db_session(logger) as session:
+        writer = asyncio.create_task(write(session))
+        fetchers = asyncio.gather(*(fetch_and_parse(pool) for _ in range(concurrency)))
+        try:
+            # a failed writer stops draining `parsed`, the fetchers would then
+            # block on it forever, so either side failing ends the import
+            done, _ = await asyncio.wait(
+                {writer, fetchers}, return_when=asyncio.FIRST_EXCEPTION
+            )
+            if writer in done:
+                # the writer only returns after the end marker, it failed
+                writer.result()
+            await fetchers
+            await parsed.put(None)
+            await writer
+        finally:
+            fetchers.cancel()
+            writer.cancel()
+
+
+def run_import():
+    parser = argparse.ArgumentParser(
+        description="Import sfs.md receipts from a list of urls"
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="File with one receipt url per line (default: stdin)",
+    )
+    parser.add_argument(
+        "--user-id", type=str, required=True, help="Owner of the imported receipts"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Receipts fetched at once (default: 8)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Parser processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50,
+        help="Receipts written per transaction (default: 50)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=DEFAULT_CHECKPOINT,
+        help=f"File of already imported urls (default: {DEFAULT_CHECKPOINT})",
+    )
+    args = parser.parse_args()
+
+    try:
+        user_id = str(UUID(args.user_id))
+    except ValueError:
+        print(f"Invalid user id: {args.user_id}", file=sys.stderr)
+        sys.exit(1)
+
+    load_dotenv()
+    logging.basicConfig(level=logging.WARNING)
+    logger = logging.getLogger("receipt_import")
+
+    stats = ImportStats()
+    done = load_checkpoint(args.checkpoint)
+    if args.input == "-":
+        urls = read_urls(sys.stdin, done, stats)
+    else:
+        with open(args.input, "r", encoding="utf-8") as f:
+            urls = read_urls(f, done, stats)
+    print(f"{len(urls)} receipts to import, {stats.skipped} already imported")
+
+    stats.started = time.monotonic()
+    try:
+        asyncio.run(
+            import_receipts(
+                urls,
+                user_id,
+                logger,
+                stats,
+                args.checkpoint,
+                concurrency=args.concurrency,
+                processes=args.processes,
+                batch_size=args.batch_size,
+            )
+        )
+    except KeyboardInterrupt:
+        print("Interrupted, rerun to resume from the checkpoint", file=sys.stderr)
+    print(stats.summary())
+
+
+if __name__ == "__main__":
+    run_import()
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+
+
+class BaseCacheBackend(ABC):
+    """
+    Key-value store with per-entry expiry.
+    Values are strings so that shared backends (e.g. Redis) can hold them as-is
+    and several workers can read each other's entries.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        """Return the value, or None if it is missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        """Store a value that expires after `ttl` seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
@@ -0,0 +1,85 @@
+import gzip
+import os
+import tempfile
+import time
+
+from src.helpers.common import get_html, make_hash
+
+DEFAULT_HTML_CACHE_DIR = os.path.join("db", "html_cache")
+# receipts never change once issued, the TTL only bounds how long pages stay on disk
+DEFAULT_HTML_CACHE_TTL = 7 * 24 * 3600
+
+
+class HtmlCache:
+    """
+    Fetched receipt pages stored gzip-compressed on disk.
+    Files are addressed by make_hash(url), the same key ReceiptUrl uses as its id.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_HTML_CACHE_DIR,
+        ttl: float = DEFAULT_HTML_CACHE_TTL,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, url: str) -> str:
+        key = make_hash(url)
+        # fan out over subdirectories to keep directory listings short
+        return os.path.join(self.directory, key[:2], f"{key}.html.gz")
+
+    def get(self, url: str) -> str | None:
+        path = self._path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None
+
+    def set(self, url: str, html: str) -> None:
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temp file and rename, so readers never see a partial page
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(html.encode("utf-8")))
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+_html_cache: HtmlCache | None = None
+
+
+def get_html_cache() -> HtmlCache:
+    global _html_cache  # pylint: disable=global-statement
+    if _html_cache is None:
+        _html_cache = HtmlCache(
+            directory=os.environ.get("HTML_CACHE_DIR", DEFAULT_HTML_CACHE_DIR),
+            ttl=float(os.environ.get("HTML_CACHE_TTL", DEFAULT_HTML_CACHE_TTL)),
+        )
+    return _html_cache
+
+
+def get_cached_html(url: str, logger) -> str | None:
+    """get_html() that serves repeated fetches of the same url from the disk cache."""
+    cache = get_html_cache()
+    html = cache.get(url)
+    if html is not None:
+        logger.info(f"HTML cache hit for {url}")
+        return html
+
+    html = get_html(url, logger)
+    if html:
+        try:
+            cache.set(url, html)
+        except OSError as e:
+            logger.warning(f"Failed to cache HTML for {url}: {e}")
+    return html
@@ -0,0 +1,75 @@
+import json
+import os
+from uuid import UUID
+
+from src.adapters.cache.base import BaseCacheBackend
+from src.adapters.cache.memory import InMemoryCacheBackend
+from src.schemas.user import User
+
+
+class IdentityCache:
+    """
+    Resolved users keyed by (provider, identity id).
+    Every cached identity is also listed under its user id, so invalidate_user can
+    drop all identities pointing at a user. UserIdentityHandler.update does so when
+    an identity moves to another user. User rows changed elsewhere (a ban, a
+    rename) are served from the cache for up to `ttl` seconds.
+    """
+
+    def __init__(self, backend: BaseCacheBackend, ttl: float = 300.0):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def _identity_key(provider: str, identity_id: str) -> str:
+        return f"identity:{provider}:{identity_id}"
+
+    @staticmethod
+    def _user_key(user_id: UUID | str) -> str:
+        return f"identity-user:{user_id}"
+
+    async def get(self, provider: str, identity_id: str) -> User | None:
+        cached = await self.backend.get(self._identity_key(provider, identity_id))
+        return User.model_validate_json(cached) if cached else None
+
+    async def set(self, provider: str, identity_id: str, user: User) -> None:
+        identity_key = self._identity_key(provider, identity_id)
+        await self.backend.set(identity_key, user.model_dump_json(), self.ttl)
+
+        user_key = self._user_key(user.id)
+        cached_keys = await self.backend.get(user_key)
+        keys = set(json.loads(cached_keys)) if cached_keys else set()
+        keys.add(identity_key)
+        await self.backend.set(user_key, json.dumps(sorted(keys)), self.ttl)
+
+    async def invalidate(self, provider: str, identity_id: str) -> None:
+        await self.backend.delete(self._identity_key(provider, identity_id))
+
+    async def invalidate_user(self, user_id: UUID | str) -> None:
+        user_key = self._user_key(user_id)
+        cached_keys = await self.backend.get(user_key)
+        for key in json.loads(cached_keys) if cached_keys else []:
+            await self.backend.delete(key)
+        await self.backend.delete(user_key)
+
+
+_identity_cache: IdentityCache | None = None
+
+
+def get_identity_cache() -> IdentityCache:
+    """Process-wide identity cache, in-memory unless a shared backend was installed."""
+    global _identity_cache  # pylint: disable=global-statement
+    if _identity_cache is None:
+        backend = InMemoryCacheBackend(
+            max_size=int(os.environ.get("IDENTITY_CACHE_SIZE", "10000"))
+        )
+        _identity_cache = IdentityCache(
+            backend, ttl=float(os.environ.get("IDENTITY_CACHE_TTL", "300"))
+        )
+    return _identity_cache
+
+
+def set_identity_cache(cache: IdentityCache) -> None:
+    """Install a cache, e.g. one on a shared backend used by all workers."""
+    global _identity_cache  # pylint: disable=global-statement
+    _identity_cache = cache
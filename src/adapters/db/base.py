@@ -1,14 +1,86 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Self, List
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Self,
+)
 
-from src.schemas.common import TableName
+from src.adapters.db.tracing import (
+    StatementTracer,
+    TracedStatement,
+    get_statement_tracer,
+)
+from src.adapters.metrics.request import track_db
+from src.schemas.common import Operator, TableName, WriteResult
+
+OPERATOR_SQL = {
+    Operator.EQ: "=",
+    Operator.NE: "<>",
+    Operator.GT: ">",
+    Operator.GE: ">=",
+    Operator.LT: "<",
+    Operator.LE: "<=",
+}
+
+
+def parse_order_by(order_by: str) -> tuple[str, str]:
+    """Split an `order_by` value like "-name" into ("name", "DESC")."""
+    if order_by.startswith("-"):
+        return order_by[1:], "DESC"
+    return order_by, "ASC"
 
 
 class BaseDBAdapter(ABC):
+    _transaction_depth = 0
+    # primary key column, used for keyset pagination
+    id_column = "id"
+    _tracer: StatementTracer | None = None
+
     @abstractmethod
     def __init__(self, logger):
         self.logger = logger
 
+    @property
+    def tracer(self) -> StatementTracer | None:
+        """The tracer set by use_tracer(), otherwise the process-wide one if enabled."""
+        return self._tracer if self._tracer is not None else get_statement_tracer()
+
+    def use_tracer(self, tracer: StatementTracer) -> Self:
+        self._tracer = tracer
+        return self
+
+    @contextmanager
+    def _trace(self, sql: str, values=None) -> Iterator[TracedStatement]:
+        """
+        Time the statement run inside the block and record it with the tracer.
+        Slow statements are explained with `values` once per shape, leave them
+        out for statements that cannot be explained on their own.
+        """
+        traced = TracedStatement(sql)
+        with track_db():
+            started = time.perf_counter()
+            yield traced
+            traced.seconds = time.perf_counter() - started
+
+        tracer = self.tracer
+        if tracer is None:
+            return
+        stats = tracer.record(traced)
+        if values is not None and tracer.wants_plan(stats, traced.seconds):
+            plan = self._explain(sql, values)
+            if plan is not None:
+                tracer.set_plan(stats, plan)
+
+    @abstractmethod
+    def _explain(self, sql: str, values) -> str | None:
+        """The plan of a traced statement, None if it cannot be explained now."""
+
     @abstractmethod
     def use_db(self, db_name: str) -> Self:
         pass
@@ -25,15 +97,85 @@ class BaseDBAdapter(ABC):
     def create_or_update_one(self, data: Dict[str, Any]) -> bool:
         pass
 
+    @abstractmethod
+    def create_many(self, data: List[Dict[str, Any]]) -> List[str]:
+        """Insert rows in bulk, skipping existing ids. Returns ids in input order."""
+
+    @abstractmethod
+    def upsert_many(self, data: List[Dict[str, Any]]) -> List[WriteResult]:
+        """Insert or overwrite rows in bulk. Returns per-row outcomes in input order."""
+
     @abstractmethod
     def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
         pass
 
     @abstractmethod
     def read_many(
-        self, where: Dict[str, Any] | None = None, limit: int | None = None, **kwargs
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int | None = None,
+        order_by: str | None = None,
+        offset: int | None = None,
+        **kwargs,
     ) -> List[Dict[str, Any]]:
-        pass
+        """
+        Read rows matching `where`. A `where` value is either compared for equality
+        or is a {Operator: value} dict, e.g.
+        {"lat": {Operator.GE: 46.9, Operator.LE: 47.1}}.
+        `order_by` is a column name, prefixed with "-" for descending order.
+        """
+
+    @abstractmethod
+    def count(self, where: Dict[str, Any] | None = None, **kwargs) -> int:
+        """Count rows matching `where`, using the same filters as read_many."""
+
+    def iter_many(
+        self,
+        where: Dict[str, Any] | None = None,
+        batch_size: int = 1000,
+        order_by: str | None = None,
+        **kwargs,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield rows matching `where` lazily, `batch_size` rows per round trip, so a
+        large table can be walked with bounded memory.
+        This default pages by key (`WHERE id > last_id`), so rows can only be
+        ordered by id; each page is a separate query, the walk is not a snapshot.
+        """
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size: {batch_size}")
+        order_by = order_by or self.id_column
+        column, direction = parse_order_by(order_by)
+        if column != self.id_column:
+            raise ValueError(f"Keyset pagination cannot order by '{column}'")
+
+        operator = Operator.GT if direction == "ASC" else Operator.LT
+        return self._iter_keyset(dict(where or {}), batch_size, order_by, operator)
+
+    def _iter_keyset(
+        self,
+        where: Dict[str, Any],
+        batch_size: int,
+        order_by: str,
+        operator: Operator,
+    ) -> Iterator[Dict[str, Any]]:
+        bounds = where.get(self.id_column)
+        bounds = dict(bounds) if isinstance(bounds, dict) else {}
+        while True:
+            rows = self.read_many(where, limit=batch_size, order_by=order_by)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            where[self.id_column] = {**bounds, operator: rows[-1][self.id_column]}
+
+    @abstractmethod
+    def nearest_shops(
+        self, lat: float, lon: float, radius: float, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Shops within `radius` meters of (lat, lon), nearest first.
+        Each row carries its great-circle `distance` in meters.
+        """
 
     @abstractmethod
     def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
@@ -50,3 +192,151 @@ class BaseDBAdapter(ABC):
     @abstractmethod
     def drop_table(self, table_name: TableName) -> None:
         pass
+
+    @abstractmethod
+    def _execute_control(self, statement: str) -> None:
+        """Run a transaction control statement (BEGIN, SAVEPOINT, COMMIT, ...)."""
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._transaction_depth > 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[Self]:
+        """
+        Run the writes of the block as one unit with a single commit.
+        Nested blocks become savepoints: an exception rolls back only the innermost
+        block, so bulk handlers can skip a failing item and keep the rest.
+        """
+        depth = self._transaction_depth
+        savepoint = f"sp_{depth}"
+        self._execute_control("BEGIN" if depth == 0 else f"SAVEPOINT {savepoint}")
+        self._transaction_depth = depth + 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth = depth
+            self._execute_control(
+                "ROLLBACK" if depth == 0 else f"ROLLBACK TO SAVEPOINT {savepoint}"
+            )
+            raise
+        self._transaction_depth = depth
+        self._execute_control(
+            "COMMIT" if depth == 0 else f"RELEASE SAVEPOINT {savepoint}"
+        )
+
+    def close(self) -> None:
+        """Release the underlying connection. Safe to call more than once."""
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class BaseAsyncDBAdapter(ABC):
+    """Awaitable counterpart of BaseDBAdapter for use inside the event loop."""
+
+    _tracer: StatementTracer | None = None
+
+    @abstractmethod
+    def __init__(self, logger):
+        self.logger = logger
+
+    @property
+    def tracer(self) -> StatementTracer | None:
+        return self._tracer if self._tracer is not None else get_statement_tracer()
+
+    def use_tracer(self, tracer: StatementTracer) -> Self:
+        self._tracer = tracer
+        return self
+
+    @asynccontextmanager
+    async def _trace(self, sql: str, values=None) -> AsyncIterator[TracedStatement]:
+        """Async counterpart of BaseDBAdapter._trace."""
+        traced = TracedStatement(sql)
+        with track_db():
+            started = time.perf_counter()
+            yield traced
+            traced.seconds = time.perf_counter() - started
+
+        tracer = self.tracer
+        if tracer is None:
+            return
+        stats = tracer.record(traced)
+        if values is not None and tracer.wants_plan(stats, traced.seconds):
+            plan = await self._explain(sql, values)
+            if plan is not None:
+                tracer.set_plan(stats, plan)
+
+    @abstractmethod
+    async def _explain(self, sql: str, values) -> str | None:
+        """Async counterpart of BaseDBAdapter._explain."""
+
+    @abstractmethod
+    def use_db(self, db_name: str) -> Self:
+        pass
+
+    @abstractmethod
+    def use_table(self, table_name: TableName) -> Self:
+        pass
+
+    @abstractmethod
+    async def create_one(self, data: Dict[str, Any]) -> str:
+        pass
+
+    @abstractmethod
+    async def create_or_update_one(self, data: Dict[str, Any]) -> bool:
+        pass
+
+    @abstractmethod
+    async def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
+        pass
+
+    @abstractmethod
+    async def read_many(
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int | None = None,
+        order_by: str | None = None,
+        offset: int | None = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def count(self, where: Dict[str, Any] | None = None, **kwargs) -> int:
+        pass
+
+    @abstractmethod
+    async def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
+        pass
+
+    @abstractmethod
+    async def delete_one(self, _id: str, **kwargs) -> bool:
+        pass
+
+    @abstractmethod
+    async def create_table(self, table_name: TableName, **kwargs) -> Self:
+        pass
+
+    @abstractmethod
+    async def drop_table(self, table_name: TableName) -> None:
+        pass
+
+    @abstractmethod
+    def transaction(self) -> AsyncContextManager[Self]:
+        """
+        Async counterpart of BaseDBAdapter.transaction, nested blocks are
+        savepoints.
+        """
+
+    async def close(self) -> None:
+        """Release the underlying connection. Safe to call more than once."""
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
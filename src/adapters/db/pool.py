@@ -0,0 +1,258 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+from psycopg2 import connect, InterfaceError, OperationalError
+from psycopg2.extensions import connection as PgConnection, TRANSACTION_STATUS_IDLE
+
+from src.adapters.db.statements import PreparingConnection
+
+# Number of most recent checkouts kept for latency percentiles
+LATENCY_WINDOW = 1000
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class PostgreSQLConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections shared by the whole process.
+
+    - at most `max_size` connections are open at any time, callers block up to
+      `checkout_timeout` seconds waiting for a free one
+    - connections idle for more than `max_idle` seconds are closed, but the
+      pool never shrinks below `min_size`
+    - connections idle for more than `health_check_after` seconds are pinged
+      with `SELECT 1` on checkout and transparently replaced if broken
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 10,
+        checkout_timeout: float = 5.0,
+        max_idle: float = 300.0,
+        health_check_after: float = 30.0,
+        **connect_kwargs,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+        self.connect_kwargs = connect_kwargs
+        self.pid = os.getpid()
+
+        # idle connections with their last checkin time, oldest on the left
+        self._idle: Deque[Tuple[PgConnection, float]] = deque()
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self._checkouts = 0
+        self._checkout_timeouts = 0
+        self._replaced = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+        now = time.monotonic()
+        for _ in range(min_size):
+            self._idle.append((self._connect(), now))
+            self._size += 1
+
+    def _connect(self) -> PgConnection:
+        conn = connect(connection_factory=PreparingConnection, **self.connect_kwargs)
+        conn.autocommit = True
+        return conn
+
+    @staticmethod
+    def _close(conn: PgConnection) -> None:
+        try:
+            conn.close()
+        except (InterfaceError, OperationalError):
+            pass
+
+    def _is_healthy(self, conn: PgConnection, last_used: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except (InterfaceError, OperationalError):
+            return False
+
+    def _reap_idle(self, now: float) -> None:
+        """Close connections idle for too long. Must be called with the lock held."""
+        while (
+            self._idle
+            and self._size > self.min_size
+            and now - self._idle[0][1] > self.max_idle
+        ):
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._close(conn)
+
+    def getconn(self, timeout: float | None = None) -> PgConnection:
+        """Check out a connection, waiting for a free one if the pool is exhausted."""
+        started = time.monotonic()
+        deadline = started + (self.checkout_timeout if timeout is None else timeout)
+
+        with self._cond:
+            if self._closed:
+                raise PoolTimeoutError("Connection pool is closed")
+            self._reap_idle(started)
+            while True:
+                if self._idle:
+                    # most recently used connection is the least likely to be stale
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    conn, last_used = None, started
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._checkout_timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No connection available after {self.checkout_timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._in_use += 1
+
+        try:
+            if conn is None:
+                conn = self._connect()
+            elif not self._is_healthy(conn, last_used):
+                self._close(conn)
+                conn = self._connect()
+                with self._cond:
+                    self._replaced += 1
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._checkouts += 1
+            self._latencies.append(time.monotonic() - started)
+        return conn
+
+    def putconn(self, conn: PgConnection) -> None:
+        """Return a connection to the pool, discarding it if it is broken."""
+        reusable = not conn.closed
+        if reusable and conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            # never hand out a connection in the middle of someone else's transaction
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("ROLLBACK")
+            except (InterfaceError, OperationalError):
+                reusable = False
+
+        now = time.monotonic()
+        with self._cond:
+            self._in_use -= 1
+            if reusable and not self._closed:
+                self._idle.append((conn, now))
+                self._reap_idle(now)
+            else:
+                self._size -= 1
+                self._close(conn)
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close all idle connections; in-use ones are closed when returned."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._size -= 1
+                self._close(conn)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool usage and checkout latency (in milliseconds)."""
+        with self._cond:
+            latencies = sorted(self._latencies)
+            size, idle, in_use, waiting = (
+                self._size,
+                len(self._idle),
+                self._in_use,
+                self._waiting,
+            )
+            checkouts, timeouts, replaced = (
+                self._checkouts,
+                self._checkout_timeouts,
+                self._replaced,
+            )
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "size": size,
+            "idle": idle,
+            "in_use": in_use,
+            "waiting": waiting,
+            "checkouts": checkouts,
+            "checkout_timeouts": timeouts,
+            "replaced_connections": replaced,
+            "checkout_latency_ms": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": latencies[-1] * 1000 if latencies else 0.0,
+            },
+        }
+
+
+_pool: PostgreSQLConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> PostgreSQLConnectionPool:
+    """Get the process-wide connection pool, creating it on first use."""
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        # a forked worker must not share sockets with its parent
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = PostgreSQLConnectionPool(
+                min_size=int(os.environ.get("POSTGRES_POOL_MIN_SIZE", "1")),
+                max_size=int(os.environ.get("POSTGRES_POOL_MAX_SIZE", "10")),
+                checkout_timeout=float(os.environ.get("POSTGRES_POOL_TIMEOUT", "5")),
+                max_idle=float(os.environ.get("POSTGRES_POOL_MAX_IDLE", "300")),
+                host=os.environ.get("POSTGRES_HOST", "localhost"),
+                port=os.environ.get("POSTGRES_PORT", "5432"),
+                database=os.environ.get("POSTGRES_DB", "postgres"),
+                user=os.environ.get("POSTGRES_USER", "postgres"),
+                password=os.environ.get("POSTGRES_PASSWORD", "postgres"),
+            )
+        return _pool
+
+
+def close_pool() -> None:
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
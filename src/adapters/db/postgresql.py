@@ -1,12 +1,36 @@
+import io
+import json
 import os
 import uuid
-from typing import Any, Dict, List, Self
-
-from psycopg2 import connect
-from psycopg2.extras import RealDictCursor, Json
-
-from src.adapters.db.base import BaseDBAdapter
-from src.schemas.common import TableName
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Self, Sequence, Tuple, Type
+
+import orjson
+from psycopg2 import DatabaseError
+from psycopg2.errors import FeatureNotSupported
+from psycopg2.extensions import TRANSACTION_STATUS_INTRANS
+from psycopg2.extras import RealDictCursor, Json, execute_values, register_default_jsonb
+
+from src.adapters.db.base import BaseDBAdapter, OPERATOR_SQL, parse_order_by
+from src.adapters.db.pool import PostgreSQLConnectionPool, get_pool
+from src.adapters.db.rows import M, get_row_factory
+from src.adapters.db.statements import (
+    MAX_PREPARED_PER_CONNECTION,
+    CompiledStatement,
+    statement_cache,
+)
+from src.adapters.db.tracing import statement_shape
+from src.adapters.metrics.request import track_db
+from src.schemas.common import Operator, TableName, WriteResult
+
+# JSONB values are decoded by orjson instead of the json module
+register_default_jsonb(globally=True, loads=orjson.loads)
+
+# Batches above this size are loaded with COPY into a staging table and merged,
+# smaller ones are sent as multi-row INSERT statements
+BULK_COPY_THRESHOLD = 1000
+BULK_PAGE_SIZE = 500
 
 # Define the relational columns for each table (excluding id, data, created_at, updated_at)
 TABLE_COLUMNS = {
@@ -33,7 +57,7 @@ TABLE_COLUMNS = {
         "item_id",
     ],
     TableName.SHOP_ITEM: ["shop_id", "name", "status", "barcode"],
-    TableName.SHOP: ["country_code", "company_id", "address", "osm_data"],
+    TableName.SHOP: ["country_code", "company_id", "address", "osm_data", "lat", "lon"],
     TableName.USER: [
         "email",
         "name",
@@ -51,50 +75,75 @@ TABLE_COLUMNS = {
 }
 
 # Tables that have the 'data' JSONB column for extra fields
-TABLES_WITH_DATA_COLUMN = {
-    TableName.RECEIPT,
-    TableName.SHOP,
-    TableName.USER,
+TABLES_WITH_DATA_COLUMN = frozenset(
+    {
+        TableName.RECEIPT,
+        TableName.SHOP,
+        TableName.USER,
+    }
+)
+
+# Membership checks on the hot write path use sets instead of scanning the lists
+TABLE_COLUMN_SETS = {
+    table: frozenset(columns) for table, columns in TABLE_COLUMNS.items()
 }
 
 
-class PostgreSQLAdapter(BaseDBAdapter):
-    def __init__(self, logger):
-        super().__init__(logger)
-        self.connection = connect(
-            host=os.environ.get("POSTGRES_HOST", "localhost"),
-            port=os.environ.get("POSTGRES_PORT", "5432"),
-            database=os.environ.get("POSTGRES_DB", "postgres"),
-            user=os.environ.get("POSTGRES_USER", "postgres"),
-            password=os.environ.get("POSTGRES_PASSWORD", "postgres"),
-        )
-        self.connection.autocommit = True
-        self.current_table = None
-        self.current_db = None
+class PostgreSQLQueryMixin:
+    """
+    SQL building shared by the sync and async PostgreSQL adapters.
+    Subclasses set `json_wrapper` to their driver's JSON parameter adapter.
 
-    def use_db(self, db_name: str) -> Self:
-        self.current_db = db_name
-        return self
+    Builders return a CompiledStatement from the process-wide statement cache,
+    the SQL text is only built the first time a (table, column set, operation)
+    combination is seen.
+    """
+
+    json_wrapper = Json
+    current_table: TableName | None = None
 
     def use_table(self, table_name: TableName) -> Self:
         self.current_table = table_name
         return self
 
+    @contextmanager
+    def _on_table(self, table_name: TableName) -> Iterator[None]:
+        """Run the block against `table_name`, then switch back to the selected table."""
+        previous = self.current_table
+        self.current_table = table_name
+        try:
+            yield
+        finally:
+            self.current_table = previous
+
+    def _check_table(self) -> None:
+        if not self.current_table:
+            raise ValueError("Table not selected. Use use_table() first.")
+
     def _get_table_columns(self) -> List[str]:
         """Get the relational columns for the current table."""
         return TABLE_COLUMNS.get(self.current_table, [])
 
+    def _get_table_column_set(self) -> frozenset:
+        return TABLE_COLUMN_SETS.get(self.current_table, frozenset())
+
+    def _is_column(self, key: str) -> bool:
+        return key == "id" or key in self._get_table_column_set()
+
     def _has_data_column(self) -> bool:
         """Check if the current table has a data JSONB column."""
         return self.current_table in TABLES_WITH_DATA_COLUMN
 
-    def _build_insert_data(self, data: Dict[str, Any]) -> tuple:
-        """Build column names, placeholders, and values for INSERT."""
+    def _compile(self, key: tuple, build) -> CompiledStatement:
+        return statement_cache.get((self.current_table,) + key, build)
+
+    def _build_insert_data(self, data: Dict[str, Any]) -> Tuple[Tuple[str, ...], list]:
+        """Build column names and values for INSERT."""
         columns = ["id"]
         values = [data.get("id")]
-        placeholders = ["%s"]
 
-        table_columns = self._get_table_columns()
+        table_columns = self._get_table_column_set()
+        has_data_column = self._has_data_column()
         extra_data = {}
 
         for key, value in data.items():
@@ -104,78 +153,19 @@ class PostgreSQLAdapter(BaseDBAdapter):
                 columns.append(key)
                 # Handle special types
                 if isinstance(value, dict):
-                    values.append(Json(value))
+                    values.append(self.json_wrapper(value))
                 else:
                     values.append(value)
-                placeholders.append("%s")
-            elif self._has_data_column():
+            elif has_data_column:
                 # Store non-column fields in data JSONB only if table has data column
                 extra_data[key] = value
 
         # Include data column only for tables that have it
-        if self._has_data_column():
+        if has_data_column:
             columns.append("data")
-            values.append(Json(extra_data))
-            placeholders.append("%s")
-
-        return columns, placeholders, values
-
-    def create_one(self, data: Dict[str, Any]) -> str:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
+            values.append(self.json_wrapper(extra_data))
 
-        _id = data.get("id")
-        if not _id:
-            _id = str(uuid.uuid4())
-            data["id"] = _id
-
-        columns, placeholders, values = self._build_insert_data(data)
-
-        with self.connection.cursor() as cursor:
-            query = (
-                f'INSERT INTO "{self.current_table}" ({", ".join(columns)}) '
-                f"VALUES ({', '.join(placeholders)}) "
-                "ON CONFLICT (id) DO NOTHING RETURNING id"
-            )
-            cursor.execute(query, values)
-            result = cursor.fetchone()
-            return result[0] if result else _id
-
-    def create_or_update_one(self, data: Dict[str, Any]) -> bool:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
-
-        _id = data.get("id")
-        if not _id:
-            raise ValueError("ID is required for create_or_update_one")
-
-        columns, placeholders, values = self._build_insert_data(data)
-
-        # Build UPDATE SET clause (exclude id)
-        update_cols = [c for c in columns if c != "id"]
-        update_set = ", ".join([f"{col} = EXCLUDED.{col}" for col in update_cols])
-
-        with self.connection.cursor() as cursor:
-            query = f"""
-                INSERT INTO "{self.current_table}" ({', '.join(columns)})
-                VALUES ({', '.join(placeholders)})
-                ON CONFLICT (id)
-                DO UPDATE SET {update_set}
-            """
-            cursor.execute(query, values)
-            return True
-
-    def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
-
-        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            query = f'SELECT * FROM "{self.current_table}" WHERE id = %s'
-            cursor.execute(query, (_id,))
-            row = cursor.fetchone()
-            if row:
-                return self._row_to_dict(row)
-            return None
+        return tuple(columns), values
 
     def _row_to_dict(self, row: Dict[str, Any]) -> Dict[str, Any]:
         """Convert a database row to a flat dictionary, merging data JSONB."""
@@ -194,45 +184,258 @@ class PostgreSQLAdapter(BaseDBAdapter):
         result.update(extra_data)
         return result
 
-    def read_many(
-        self, where: Dict[str, Any] | None = None, limit: int | None = None, **kwargs
-    ) -> List[Dict[str, Any]]:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
+    @staticmethod
+    def _rows_to_models(
+        model: Type[M], cursor, rows: Sequence[Sequence[Any]]
+    ) -> List[M]:
+        """Decode plain row tuples straight into `model`, see ModelRowFactory."""
+        if not rows:
+            return []
+        factory = get_row_factory(
+            model, tuple(column.name for column in cursor.description)
+        )
+        return [factory(row) for row in rows]
+
+    def _build_create_one_query(
+        self, data: Dict[str, Any]
+    ) -> Tuple[CompiledStatement, list]:
+        columns, values = self._build_insert_data(data)
+        statement = self._compile(
+            ("create_one", columns),
+            lambda: (
+                f'INSERT INTO "{self.current_table}" ({", ".join(columns)}) '
+                f"VALUES ({', '.join(['%s'] * len(columns))}) "
+                "ON CONFLICT (id) DO NOTHING RETURNING id"
+            ),
+        )
+        return statement, values
 
-        query = f'SELECT * FROM "{self.current_table}"'
-        params = []
+    def _build_create_or_update_one_query(
+        self, data: Dict[str, Any]
+    ) -> Tuple[CompiledStatement, list]:
+        columns, values = self._build_insert_data(data)
 
-        if where:
-            conditions = []
-            table_columns = self._get_table_columns() + ["id"]
-            for key, value in where.items():
-                if key in table_columns:
-                    conditions.append(f"{key} = %s")
-                    params.append(value)
-                elif self._has_data_column():
-                    # Query JSONB field only for tables that have it
-                    conditions.append(f"data->>%s = %s")
-                    params.extend([key, str(value)])
-
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
+        def build() -> str:
+            # Build UPDATE SET clause (exclude id)
+            update_set = ", ".join(
+                [f"{col} = EXCLUDED.{col}" for col in columns if col != "id"]
+            )
+            return (
+                f'INSERT INTO "{self.current_table}" ({", ".join(columns)}) '
+                f"VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON CONFLICT (id) DO UPDATE SET {update_set}"
+            )
 
+        return self._compile(("create_or_update_one", columns), build), values
+
+    def _group_bulk_rows(
+        self, data: List[Dict[str, Any]]
+    ) -> Dict[Tuple[str, ...], Dict[Any, Tuple[int, list]]]:
+        """
+        Group rows by their column set so that each group is one multi-row statement.
+        Within a group rows are keyed by id, a repeated id keeps the last row.
+        """
+        groups = {}
+        for index, row in enumerate(data):
+            columns, values = self._build_insert_data(row)
+            groups.setdefault(columns, {})[str(row["id"])] = (index, values)
+        return groups
+
+    def _build_bulk_insert_query(self, columns: Tuple[str, ...], update: bool) -> str:
+        """INSERT with a single VALUES %s placeholder expanded by execute_values."""
+        return self._compile(
+            ("bulk_insert", columns, update),
+            lambda: (
+                f'INSERT INTO "{self.current_table}" ({", ".join(columns)}) VALUES %s '
+                + self._build_on_conflict_clause(columns, update)
+            ),
+        ).sql
+
+    @staticmethod
+    def _build_on_conflict_clause(columns: Tuple[str, ...], update: bool) -> str:
+        # xmax is 0 only for freshly inserted row versions
+        returning = "RETURNING id, (xmax = 0) AS inserted"
+        update_set = ", ".join([f"{c} = EXCLUDED.{c}" for c in columns if c != "id"])
+        if update and update_set:
+            return f"ON CONFLICT (id) DO UPDATE SET {update_set} {returning}"
+        return f"ON CONFLICT (id) DO NOTHING {returning}"
+
+    def _build_read_one_query(self, _id: str) -> Tuple[CompiledStatement, tuple]:
+        statement = self._compile(
+            ("read_one",), lambda: f'SELECT * FROM "{self.current_table}" WHERE id = %s'
+        )
+        return statement, (_id,)
+
+    def _build_where_conditions(
+        self, where: Dict[str, Any] | None
+    ) -> Tuple[tuple, list]:
+        """
+        Split `where` into a hashable shape, ((column, operator), ...), and its params.
+        JSONB fields have no operator and are compared as text.
+        """
+        if not where:
+            return (), []
+
+        shape = []
+        params = []
+        for key, value in where.items():
+            if isinstance(value, dict):
+                # range predicates, e.g. {Operator.GE: 1, Operator.LT: 10}
+                if not self._is_column(key):
+                    raise ValueError(f"Range filters are not supported on '{key}'")
+                for operator, operand in value.items():
+                    shape.append((key, operator))
+                    params.append(operand)
+            elif self._is_column(key):
+                shape.append((key, Operator.EQ))
+                params.append(value)
+            elif self._has_data_column():
+                # Query JSONB field only for tables that have it
+                shape.append((key, None))
+                params.extend([key, str(value)])
+
+        return tuple(shape), params
+
+    @staticmethod
+    def _render_where_clause(shape: tuple) -> str:
+        if not shape:
+            return ""
+        conditions = [
+            (
+                "data->>%s = %s"
+                if operator is None
+                else f"{key} {OPERATOR_SQL[operator]} %s"
+            )
+            for key, operator in shape
+        ]
+        return " WHERE " + " AND ".join(conditions)
+
+    def _build_where_clause(self, where: Dict[str, Any] | None) -> Tuple[str, list]:
+        shape, params = self._build_where_conditions(where)
+        return self._render_where_clause(shape), params
+
+    def _build_order_by_clause(self, order_by: str | None) -> str:
+        if not order_by:
+            return ""
+        column, direction = parse_order_by(order_by)
+        if not self._is_column(column):
+            raise ValueError(f"Cannot order by '{column}'")
+        return f" ORDER BY {column} {direction}"
+
+    def _build_read_many_query(
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int | None = None,
+        order_by: str | None = None,
+        offset: int | None = None,
+    ) -> Tuple[CompiledStatement, tuple]:
+        shape, params = self._build_where_conditions(where)
+
+        def build() -> str:
+            query = f'SELECT * FROM "{self.current_table}"'
+            query += self._render_where_clause(shape)
+            query += self._build_order_by_clause(order_by)
+            if limit:
+                query += " LIMIT %s"
+            if offset:
+                query += " OFFSET %s"
+            return query
+
+        statement = self._compile(
+            ("read_many", shape, order_by, bool(limit), bool(offset)), build
+        )
         if limit:
-            query += " LIMIT %s"
             params.append(limit)
+        if offset:
+            params.append(offset)
+        return statement, tuple(params)
+
+    def _build_read_user_by_identity_query(
+        self, identity_id: str, provider: str
+    ) -> Tuple[CompiledStatement, tuple]:
+        statement = statement_cache.get(
+            ("read_user_by_identity",),
+            lambda: (
+                f'SELECT u.* FROM "{TableName.USER}" u '
+                f'JOIN "{TableName.USER_IDENTITY}" i ON i.user_id = u.id '
+                "WHERE i.id = %s AND i.provider = %s"
+            ),
+        )
+        return statement, (identity_id, str(provider))
+
+    def _build_get_or_create_user_by_identity_query(
+        self, identity_id: str, provider: str, user_data: Dict[str, Any]
+    ) -> Tuple[CompiledStatement, list]:
+        """
+        One statement that returns the user linked to the identity, or inserts the
+        user and the identity together. Extra columns: `created` (the user row is
+        new) and `linked` (the identity row was written by this statement).
+        """
+        columns, values = self._build_insert_data(user_data)
+
+        def build() -> str:
+            return f"""
+                WITH existing AS (
+                    SELECT u.* FROM "{TableName.USER}" u
+                    JOIN "{TableName.USER_IDENTITY}" i ON i.user_id = u.id
+                    WHERE i.id = %s AND i.provider = %s
+                ), new_user AS (
+                    INSERT INTO "{TableName.USER}" ({", ".join(columns)})
+                    SELECT {", ".join(["%s"] * len(columns))}
+                    WHERE NOT EXISTS (SELECT 1 FROM existing)
+                    ON CONFLICT DO NOTHING
+                    RETURNING *
+                ), new_identity AS (
+                    INSERT INTO "{TableName.USER_IDENTITY}" (id, provider, user_id)
+                    SELECT %s, %s, id FROM new_user
+                    ON CONFLICT DO NOTHING
+                    RETURNING user_id
+                )
+                SELECT existing.*, false AS created, true AS linked FROM existing
+                UNION ALL
+                SELECT new_user.*, true, EXISTS (SELECT 1 FROM new_identity) FROM new_user
+            """
 
-        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
-            return [self._row_to_dict(row) for row in rows]
-
-    def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
-
-        table_columns = self._get_table_columns()
-        set_parts = []
+        statement = statement_cache.get(
+            (TableName.USER, "get_or_create_user_by_identity", columns), build
+        )
+        provider = str(provider)
+        return statement, [identity_id, provider, *values, identity_id, provider]
+
+    @staticmethod
+    def _build_nearest_shops_query(
+        lat: float, lon: float, radius: float, limit: int
+    ) -> Tuple[str, dict]:
+        # earth_box() narrows the candidates through the GiST index on
+        # ll_to_earth(lat, lon), <-> then walks that index in distance order
+        query = """
+            SELECT *, earth_distance(ll_to_earth(lat, lon), ll_to_earth(%(lat)s, %(lon)s)) AS distance
+            FROM shop
+            WHERE lat IS NOT NULL AND lon IS NOT NULL
+              AND earth_box(ll_to_earth(%(lat)s, %(lon)s), %(radius)s) @> ll_to_earth(lat, lon)
+              AND earth_distance(ll_to_earth(lat, lon), ll_to_earth(%(lat)s, %(lon)s)) <= %(radius)s
+            ORDER BY ll_to_earth(lat, lon) <-> ll_to_earth(%(lat)s, %(lon)s)
+            LIMIT %(limit)s
+        """
+        return query, {"lat": lat, "lon": lon, "radius": radius, "limit": limit}
+
+    def _build_count_query(
+        self, where: Dict[str, Any] | None
+    ) -> Tuple[CompiledStatement, tuple]:
+        shape, params = self._build_where_conditions(where)
+        statement = self._compile(
+            ("count", shape),
+            lambda: f'SELECT COUNT(*) FROM "{self.current_table}"'
+            + self._render_where_clause(shape),
+        )
+        return statement, tuple(params)
+
+    def _build_update_one_query(
+        self, _id: str, data: Dict[str, Any]
+    ) -> Tuple[CompiledStatement, list] | None:
+        table_columns = self._get_table_column_set()
+        has_data_column = self._has_data_column()
+        set_columns = []
         values = []
         extra_data = {}
 
@@ -240,57 +443,406 @@ class PostgreSQLAdapter(BaseDBAdapter):
             if key == "id":
                 continue
             if key in table_columns:
-                set_parts.append(f"{key} = %s")
+                set_columns.append(key)
                 if isinstance(value, dict):
-                    values.append(Json(value))
+                    values.append(self.json_wrapper(value))
                 else:
                     values.append(value)
-            elif self._has_data_column():
+            elif has_data_column:
                 extra_data[key] = value
 
         # Update data JSONB column only for tables that have it
-        if self._has_data_column():
-            set_parts.append("data = %s")
-            values.append(Json(extra_data))
+        if has_data_column:
+            set_columns.append("data")
+            values.append(self.json_wrapper(extra_data))
 
-        if not set_parts:
-            return False
+        if not set_columns:
+            return None
 
         values.append(_id)
+        set_columns = tuple(set_columns)
+        statement = self._compile(
+            ("update_one", set_columns),
+            lambda: (
+                f'UPDATE "{self.current_table}" '
+                f'SET {", ".join([f"{c} = %s" for c in set_columns])} WHERE id = %s'
+            ),
+        )
+        return statement, values
 
-        with self.connection.cursor() as cursor:
-            query = f'UPDATE "{self.current_table}" SET {", ".join(set_parts)} WHERE id = %s'
-            cursor.execute(query, values)
-            return cursor.rowcount > 0
-
-    def delete_one(self, _id: str, **kwargs) -> bool:
-        if not self.current_table:
-            raise ValueError("Table not selected. Use use_table() first.")
+    def _build_delete_one_query(self, _id: str) -> Tuple[CompiledStatement, tuple]:
+        statement = self._compile(
+            ("delete_one",), lambda: f'DELETE FROM "{self.current_table}" WHERE id = %s'
+        )
+        return statement, (_id,)
 
-        with self.connection.cursor() as cursor:
-            query = f'DELETE FROM "{self.current_table}" WHERE id = %s'
-            cursor.execute(query, (_id,))
-            return cursor.rowcount > 0
+    @staticmethod
+    def _build_explain_query(sql: str) -> str:
+        # ANALYZE runs the statement, so writes only get the planner's estimate
+        if statement_shape(sql).operation == "SELECT":
+            return f"EXPLAIN (ANALYZE, BUFFERS) {sql}"
+        return f"EXPLAIN {sql}"
 
-    def create_table(self, table_name: TableName, **kwargs) -> Self:
+    @staticmethod
+    def _build_create_table_queries(table_name: TableName) -> List[str]:
         """Create a table with id and jsonb data column, plus a GIN index."""
-        with self.connection.cursor() as cursor:
-            query = f"""
+        return [
+            f"""
                 CREATE TABLE IF NOT EXISTS "{table_name}" (
                     id TEXT PRIMARY KEY,
                     data JSONB NOT NULL DEFAULT '{{}}',
                     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
                 )
-            """
-            cursor.execute(query)
-
-            index_query = f"""
+            """,
+            f"""
                 CREATE INDEX IF NOT EXISTS "idx_{table_name}_data"
                 ON "{table_name}" USING GIN (data)
-            """
-            cursor.execute(index_query)
+            """,
+        ]
+
+
+class PostgreSQLAdapter(PostgreSQLQueryMixin, BaseDBAdapter):
+    def __init__(self, logger, pool: PostgreSQLConnectionPool | None = None):
+        super().__init__(logger)
+        # the adapter leases one pooled connection until close() is called
+        self.pool = pool or get_pool()
+        self.connection = self.pool.getconn()
+        self.current_table = None
+        self.current_db = None
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.pool.putconn(self.connection)
+            self.connection = None
+
+    def use_db(self, db_name: str) -> Self:
+        self.current_db = db_name
+        return self
+
+    def _execute_control(self, statement: str) -> None:
+        # the connection is in autocommit mode, BEGIN opens an explicit transaction
+        with self.connection.cursor() as cursor, track_db():
+            cursor.execute(statement)
+
+    def _execute(self, cursor, statement: CompiledStatement, values) -> None:
+        """
+        Run a cached statement as a server-side prepared statement, so repeat calls
+        on the same connection skip parsing and planning. Connections that do not
+        track their prepared statements run the plain SQL instead.
+        """
+        with self._trace(statement.sql, values) as traced:
+            self._execute_prepared(cursor, statement, values)
+            traced.rows = cursor.rowcount
+
+    def _explain(self, sql: str, values) -> str | None:
+        # a failing EXPLAIN would abort the open transaction
+        if self.in_transaction:
+            return None
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(self._build_explain_query(sql), values)
+                return "\n".join(row[0] for row in cursor.fetchall())
+        except DatabaseError as e:
+            return f"EXPLAIN failed: {e}"
+
+    def _execute_prepared(self, cursor, statement: CompiledStatement, values) -> None:
+        prepared = getattr(self.connection, "prepared_statements", None)
+        if prepared is None:
+            cursor.execute(statement.sql, values)
+            return
+
+        is_prepared = statement.name in prepared
+        if is_prepared:
+            prepared.move_to_end(statement.name)
+        else:
+            if len(prepared) >= MAX_PREPARED_PER_CONNECTION:
+                # the least recently used statement makes room, evicted cache
+                # entries are never executed again and age out this way
+                oldest, _ = prepared.popitem(last=False)
+                cursor.execute(f"DEALLOCATE {oldest}")
+            cursor.execute(statement.prepare_sql)
+            prepared[statement.name] = None
+        statement_cache.record_execution(prepared=is_prepared)
+
+        try:
+            cursor.execute(statement.execute_sql, values)
+        except FeatureNotSupported:
+            # "cached plan must not change result type" after a schema change
+            prepared.pop(statement.name, None)
+            if self.in_transaction:
+                raise
+            cursor.execute(f"DEALLOCATE {statement.name}")
+            cursor.execute(statement.sql, values)
+
+    def create_one(self, data: Dict[str, Any]) -> str:
+        self._check_table()
+
+        _id = data.get("id")
+        if not _id:
+            _id = str(uuid.uuid4())
+            data["id"] = _id
+
+        statement, values = self._build_create_one_query(data)
+        with self.connection.cursor() as cursor:
+            self._execute(cursor, statement, values)
+            result = cursor.fetchone()
+            return result[0] if result else _id
+
+    def create_or_update_one(self, data: Dict[str, Any]) -> bool:
+        self._check_table()
+
+        _id = data.get("id")
+        if not _id:
+            raise ValueError("ID is required for create_or_update_one")
+
+        statement, values = self._build_create_or_update_one_query(data)
+        with self.connection.cursor() as cursor:
+            self._execute(cursor, statement, values)
+            return True
+
+    def create_many(self, data: List[Dict[str, Any]]) -> List[str]:
+        self._check_table()
+
+        for row in data:
+            if not row.get("id"):
+                row["id"] = str(uuid.uuid4())
+
+        self._bulk_write(data, update=False)
+        return [str(row["id"]) for row in data]
+
+    def upsert_many(self, data: List[Dict[str, Any]]) -> List[WriteResult]:
+        self._check_table()
+
+        if any(not row.get("id") for row in data):
+            raise ValueError("ID is required for upsert_many")
+
+        outcomes = self._bulk_write(data, update=True)
+        return [outcomes[str(row["id"])] for row in data]
+
+    def _bulk_write(
+        self, data: List[Dict[str, Any]], update: bool
+    ) -> Dict[str, WriteResult]:
+        """Write rows group by group and report whether each id was created or updated."""
+        outcomes = {}
+        with self.transaction():
+            for columns, rows in self._group_bulk_rows(data).items():
+                self._bulk_write_group(columns, rows, update, outcomes)
+        return outcomes
+
+    def _bulk_write_group(
+        self,
+        columns: Tuple[str, ...],
+        rows: Dict[Any, Tuple[int, list]],
+        update: bool,
+        outcomes: Dict[str, WriteResult],
+    ) -> None:
+        values = [row_values for _, row_values in rows.values()]
+        query = self._build_bulk_insert_query(columns, update)
+        # COPY and merge is traced as the INSERT it stands in for
+        with self.connection.cursor() as cursor, self._trace(query) as traced:
+            if len(values) > BULK_COPY_THRESHOLD:
+                returned = self._copy_and_merge(cursor, columns, values, update)
+            else:
+                returned = execute_values(
+                    cursor, query, values, page_size=BULK_PAGE_SIZE, fetch=True
+                )
+            traced.rows = len(values)
+        for _id in rows:
+            # ids missing from RETURNING already existed and were left untouched
+            outcomes[_id] = WriteResult.UPDATED
+        for _id, inserted in returned:
+            if inserted:
+                outcomes[str(_id)] = WriteResult.CREATED
+
+    def _copy_and_merge(
+        self, cursor, columns: Tuple[str, ...], values: List[list], update: bool
+    ) -> List[tuple]:
+        """COPY rows into a session-local staging table, then merge them in one INSERT."""
+        staging = f"_bulk_{self.current_table}"
+        column_list = ", ".join(columns)
+        cursor.execute(
+            f'CREATE TEMP TABLE IF NOT EXISTS "{staging}" '
+            f'(LIKE "{self.current_table}" INCLUDING DEFAULTS)'
+        )
+        cursor.execute(f'TRUNCATE "{staging}"')
+
+        buffer = io.StringIO()
+        for row_values in values:
+            buffer.write("\t".join(_to_copy_text(v) for v in row_values))
+            buffer.write("\n")
+        buffer.seek(0)
+        cursor.copy_expert(f'COPY "{staging}" ({column_list}) FROM STDIN', buffer)
+
+        cursor.execute(
+            f'INSERT INTO "{self.current_table}" ({column_list}) '
+            f'SELECT {column_list} FROM "{staging}" '
+            + self._build_on_conflict_clause(columns, update)
+        )
+        returned = cursor.fetchall()
+        cursor.execute(f'TRUNCATE "{staging}"')
+        return returned
+
+    def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
+        self._check_table()
+
+        statement, params = self._build_read_one_query(_id)
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            self._execute(cursor, statement, params)
+            row = cursor.fetchone()
+            if row:
+                return self._row_to_dict(row)
+            return None
 
+    def read_many(
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int | None = None,
+        order_by: str | None = None,
+        offset: int | None = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        self._check_table()
+
+        statement, params = self._build_read_many_query(where, limit, order_by, offset)
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            self._execute(cursor, statement, params)
+            rows = cursor.fetchall()
+            return [self._row_to_dict(row) for row in rows]
+
+    def read_one_model(self, model: Type[M], _id: str) -> M | None:
+        """read_one() decoded into `model` without an intermediate dict."""
+        self._check_table()
+
+        statement, params = self._build_read_one_query(_id)
+        with self.connection.cursor() as cursor:
+            self._execute(cursor, statement, params)
+            models = self._rows_to_models(model, cursor, cursor.fetchmany(1))
+            return models[0] if models else None
+
+    def read_many_models(
+        self,
+        model: Type[M],
+        where: Dict[str, Any] | None = None,
+        limit: int | None = None,
+        order_by: str | None = None,
+        offset: int | None = None,
+    ) -> List[M]:
+        """read_many() decoded into `model` without an intermediate dict per row."""
+        self._check_table()
+
+        statement, params = self._build_read_many_query(where, limit, order_by, offset)
+        with self.connection.cursor() as cursor:
+            self._execute(cursor, statement, params)
+            return self._rows_to_models(model, cursor, cursor.fetchall())
+
+    def iter_many(
+        self,
+        where: Dict[str, Any] | None = None,
+        batch_size: int = 1000,
+        order_by: str | None = None,
+        server_cursor: bool = True,
+        **kwargs,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream rows through a server-side cursor, `batch_size` rows per fetch, in
+        any `order_by`. The cursor lives in the session's open transaction, or in
+        one started for it and committed once the iterator is exhausted or closed,
+        so writes made while iterating are part of that transaction too.
+        Inside a transaction block, finish the iteration before the block ends.
+        `server_cursor=False` pages by key instead.
+        """
+        if not server_cursor:
+            return super().iter_many(where, batch_size, order_by)
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size: {batch_size}")
+        self._check_table()
+
+        statement, params = self._build_read_many_query(where, order_by=order_by)
+        return self._iter_named_cursor(statement.sql, params, batch_size)
+
+    def _iter_named_cursor(
+        self, query: str, params: tuple, batch_size: int
+    ) -> Iterator[Dict[str, Any]]:
+        if self.in_transaction:
+            yield from self._fetch_named_cursor(query, params, batch_size)
+            return
+        # cursors only live inside a transaction, this one lasts as long as the
+        # iteration; closing the iterator early is not an error and commits too
+        with self.transaction():
+            try:
+                yield from self._fetch_named_cursor(query, params, batch_size)
+            except GeneratorExit:
+                return
+
+    def _fetch_named_cursor(
+        self, query: str, params: tuple, batch_size: int
+    ) -> Iterator[Dict[str, Any]]:
+        # DECLARE rather than a psycopg2 named cursor, which refuses to run on a
+        # connection in autocommit mode even inside an explicit BEGIN
+        name = f"iter_{uuid.uuid4().hex}"
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._trace(query):
+                cursor.execute(f"DECLARE {name} NO SCROLL CURSOR FOR {query}", params)
+            try:
+                while True:
+                    with track_db():
+                        cursor.execute(f"FETCH FORWARD {batch_size} FROM {name}")
+                    rows = cursor.fetchall()
+                    for row in rows:
+                        yield self._row_to_dict(row)
+                    if len(rows) < batch_size:
+                        return
+            finally:
+                # a failed statement or an ended transaction already dropped it
+                status = self.connection.info.transaction_status
+                if status == TRANSACTION_STATUS_INTRANS:
+                    cursor.execute(f"CLOSE {name}")
+
+    def nearest_shops(
+        self, lat: float, lon: float, radius: float, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        query, params = self._build_nearest_shops_query(lat, lon, radius, limit)
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._trace(query, params) as traced:
+                cursor.execute(query, params)
+                traced.rows = cursor.rowcount
+            rows = cursor.fetchall()
+        with self._on_table(TableName.SHOP):
+            return [self._row_to_dict(row) for row in rows]
+
+    def count(self, where: Dict[str, Any] | None = None, **kwargs) -> int:
+        self._check_table()
+
+        statement, params = self._build_count_query(where)
+        with self.connection.cursor() as cursor:
+            self._execute(cursor, statement, params)
+            return cursor.fetchone()[0]
+
+    def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
+        self._check_table()
+
+        built = self._build_update_one_query(_id, data)
+        if not built:
+            return False
+
+        statement, values = built
+        with self.connection.cursor() as cursor:
+            self._execute(cursor, statement, values)
+            return cursor.rowcount > 0
+
+    def delete_one(self, _id: str, **kwargs) -> bool:
+        self._check_table()
+
+        statement, params = self._build_delete_one_query(_id)
+        with self.connection.cursor() as cursor:
+            self._execute(cursor, statement, params)
+            return cursor.rowcount > 0
+
+    def create_table(self, table_name: TableName, **kwargs) -> Self:
+        with self.connection.cursor() as cursor:
+            for query in self._build_create_table_queries(table_name):
+                cursor.execute(query)
             self.logger.info(f"Table '{table_name}' created or already exists")
         return self
 
@@ -300,6 +852,30 @@ class PostgreSQLAdapter(BaseDBAdapter):
             cursor.execute(query)
 
 
+def _to_copy_text(value: Any) -> str:
+    """Render a value in COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, Json):
+        value = json.dumps(value.adapted)
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
 def init_db_session(logger) -> PostgreSQLAdapter:
+    """
+    Lease a pooled connection wrapped in an adapter.
+    Callers must release it with close() or by using the session as a context manager.
+    """
     db_name = os.environ["POSTGRES_DB"]
     return PostgreSQLAdapter(logger).use_db(db_name)
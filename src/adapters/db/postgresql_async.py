@@ -0,0 +1,291 @@
+import asyncio
+import os
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Self, Tuple, Type
+
+import orjson
+from psycopg import AsyncConnection, DatabaseError, Rollback
+from psycopg.pq import TransactionStatus
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb, set_json_loads
+from psycopg_pool import AsyncConnectionPool
+
+from src.adapters.db.base import BaseAsyncDBAdapter
+from src.adapters.db.postgresql import PostgreSQLQueryMixin
+from src.adapters.db.rows import M, model_row, model_row_with
+from src.adapters.db.statements import CompiledStatement
+from src.schemas.common import TableName
+from src.schemas.user import User
+
+# JSON and JSONB values are decoded by orjson instead of the json module
+set_json_loads(orjson.loads)
+
+
+class EmailInUseError(Exception):
+    """Raised when a first login's email already belongs to another identity's user."""
+
+
+class AsyncPostgreSQLAdapter(PostgreSQLQueryMixin, BaseAsyncDBAdapter):
+    """
+    Non-blocking PostgreSQL adapter built on psycopg 3.
+    Shares the SQL building with PostgreSQLAdapter, so both read and write the same rows.
+    Cached statements are executed with prepare=True, psycopg keeps them prepared
+    per connection.
+    """
+
+    json_wrapper = Jsonb
+
+    def __init__(self, logger, connection: AsyncConnection):
+        super().__init__(logger)
+        self.connection = connection
+        self.current_table = None
+        self.current_db = None
+
+    def use_db(self, db_name: str) -> Self:
+        self.current_db = db_name
+        return self
+
+    async def _execute(self, cursor, statement: CompiledStatement, values) -> None:
+        async with self._trace(statement.sql, values) as traced:
+            await cursor.execute(statement.sql, values, prepare=True)
+            traced.rows = cursor.rowcount
+
+    async def _explain(self, sql: str, values) -> str | None:
+        # a failing EXPLAIN would abort the open transaction
+        if self.connection.info.transaction_status != TransactionStatus.IDLE:
+            return None
+        try:
+            async with self.connection.cursor() as cursor:
+                await cursor.execute(self._build_explain_query(sql), values)
+                return "\n".join(row[0] for row in await cursor.fetchall())
+        except DatabaseError as e:
+            return f"EXPLAIN failed: {e}"
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Self]:
+        async with self.connection.transaction():
+            yield self
+
+    async def create_one(self, data: Dict[str, Any]) -> str:
+        self._check_table()
+
+        _id = data.get("id")
+        if not _id:
+            _id = str(uuid.uuid4())
+            data["id"] = _id
+
+        statement, values = self._build_create_one_query(data)
+        async with self.connection.cursor() as cursor:
+            await self._execute(cursor, statement, values)
+            result = await cursor.fetchone()
+            return str(result[0]) if result else _id
+
+    async def create_or_update_one(self, data: Dict[str, Any]) -> bool:
+        self._check_table()
+
+        if not data.get("id"):
+            raise ValueError("ID is required for create_or_update_one")
+
+        statement, values = self._build_create_or_update_one_query(data)
+        async with self.connection.cursor() as cursor:
+            await self._execute(cursor, statement, values)
+            return True
+
+    async def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
+        self._check_table()
+
+        statement, params = self._build_read_one_query(_id)
+        async with self.connection.cursor(row_factory=dict_row) as cursor:
+            await self._execute(cursor, statement, params)
+            row = await cursor.fetchone()
+            if row:
+                return self._row_to_dict(row)
+            return None
+
+    async def read_many(
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int | None = None,
+        order_by: str | None = None,
+        offset: int | None = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        self._check_table()
+
+        statement, params = self._build_read_many_query(where, limit, order_by, offset)
+        async with self.connection.cursor(row_factory=dict_row) as cursor:
+            await self._execute(cursor, statement, params)
+            rows = await cursor.fetchall()
+            return [self._row_to_dict(row) for row in rows]
+
+    async def read_one_model(self, model: Type[M], _id: str) -> M | None:
+        """read_one() decoded into `model` without an intermediate dict."""
+        self._check_table()
+
+        statement, params = self._build_read_one_query(_id)
+        async with self.connection.cursor(row_factory=model_row(model)) as cursor:
+            await self._execute(cursor, statement, params)
+            return await cursor.fetchone()
+
+    async def read_many_models(
+        self,
+        model: Type[M],
+        where: Dict[str, Any] | None = None,
+        limit: int | None = None,
+        order_by: str | None = None,
+        offset: int | None = None,
+    ) -> List[M]:
+        """read_many() decoded into `model` without an intermediate dict per row."""
+        self._check_table()
+
+        statement, params = self._build_read_many_query(where, limit, order_by, offset)
+        async with self.connection.cursor(row_factory=model_row(model)) as cursor:
+            await self._execute(cursor, statement, params)
+            return await cursor.fetchall()
+
+    async def read_user_by_identity(
+        self, identity_id: str, provider: str
+    ) -> User | None:
+        """Resolve an identity straight to its user in one round trip."""
+        statement, params = self._build_read_user_by_identity_query(
+            identity_id, provider
+        )
+        async with self.connection.cursor(row_factory=model_row(User)) as cursor:
+            await self._execute(cursor, statement, params)
+            return await cursor.fetchone()
+
+    async def get_or_create_user_by_identity(
+        self, identity_id: str, provider: str, user_data: Dict[str, Any]
+    ) -> Tuple[User, bool]:
+        """
+        Atomically return the user linked to an identity, creating both if needed.
+        Returns the user and whether it was created, decoded straight from the row.
+
+        Two concurrent first logins both try to insert a user, but only one
+        user/identity pair wins. The loser rolls back and reads the winner's.
+        Raises EmailInUseError when the email belongs to a user that another
+        identity is linked to.
+        """
+        with self._on_table(TableName.USER):
+            statement, params = self._build_get_or_create_user_by_identity_query(
+                identity_id, provider, user_data
+            )
+
+        conflict = False
+        row_factory = model_row_with(User, "created", "linked")
+        async with self.connection.transaction():
+            async with self.connection.cursor(row_factory=row_factory) as cursor:
+                await self._execute(cursor, statement, params)
+                row = await cursor.fetchone()
+            if row is None or not row[2]:
+                conflict = True
+                raise Rollback()
+
+        if conflict:
+            # anything this statement inserted was rolled back; a concurrent
+            # login of the same identity explains a taken identity or email
+            user = await self.read_user_by_identity(identity_id, provider)
+            if user is not None:
+                return user, False
+            if row is None:
+                raise EmailInUseError(
+                    f"Email {user_data.get('email')} is used by another account"
+                )
+            raise ValueError(f"Identity {identity_id} could not be resolved")
+
+        user, created, _ = row
+        return user, created
+
+    async def count(self, where: Dict[str, Any] | None = None, **kwargs) -> int:
+        self._check_table()
+
+        statement, params = self._build_count_query(where)
+        async with self.connection.cursor() as cursor:
+            await self._execute(cursor, statement, params)
+            return (await cursor.fetchone())[0]
+
+    async def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
+        self._check_table()
+
+        built = self._build_update_one_query(_id, data)
+        if not built:
+            return False
+
+        statement, values = built
+        async with self.connection.cursor() as cursor:
+            await self._execute(cursor, statement, values)
+            return cursor.rowcount > 0
+
+    async def delete_one(self, _id: str, **kwargs) -> bool:
+        self._check_table()
+
+        statement, params = self._build_delete_one_query(_id)
+        async with self.connection.cursor() as cursor:
+            await self._execute(cursor, statement, params)
+            return cursor.rowcount > 0
+
+    async def create_table(self, table_name: TableName, **kwargs) -> Self:
+        async with self.connection.cursor() as cursor:
+            for query in self._build_create_table_queries(table_name):
+                await cursor.execute(query)
+            self.logger.info(f"Table '{table_name}' created or already exists")
+        return self
+
+    async def drop_table(self, table_name: TableName) -> None:
+        async with self.connection.cursor() as cursor:
+            await cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+
+
+_async_pool: AsyncConnectionPool | None = None
+_async_pool_lock = asyncio.Lock()
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """Get the process-wide async connection pool, opening it on first use."""
+    global _async_pool  # pylint: disable=global-statement
+    async with _async_pool_lock:
+        if _async_pool is None:
+            pool = AsyncConnectionPool(
+                kwargs={
+                    "host": os.environ.get("POSTGRES_HOST", "localhost"),
+                    "port": os.environ.get("POSTGRES_PORT", "5432"),
+                    "dbname": os.environ.get("POSTGRES_DB", "postgres"),
+                    "user": os.environ.get("POSTGRES_USER", "postgres"),
+                    "password": os.environ.get("POSTGRES_PASSWORD", "postgres"),
+                    "autocommit": True,
+                },
+                min_size=int(os.environ.get("POSTGRES_POOL_MIN_SIZE", "1")),
+                max_size=int(os.environ.get("POSTGRES_POOL_MAX_SIZE", "10")),
+                timeout=float(os.environ.get("POSTGRES_POOL_TIMEOUT", "5")),
+                max_idle=float(os.environ.get("POSTGRES_POOL_MAX_IDLE", "300")),
+                check=AsyncConnectionPool.check_connection,
+                name="pbapi-async",
+                open=False,
+            )
+            await pool.open()
+            _async_pool = pool
+        return _async_pool
+
+
+def get_async_pool_stats() -> Dict[str, int]:
+    """Usage counters of the async pool, empty if it was never opened."""
+    return _async_pool.get_stats() if _async_pool is not None else {}
+
+
+async def close_async_pool() -> None:
+    global _async_pool  # pylint: disable=global-statement
+    async with _async_pool_lock:
+        if _async_pool is not None:
+            await _async_pool.close()
+            _async_pool = None
+
+
+@asynccontextmanager
+async def init_async_db_session(logger) -> AsyncIterator[AsyncPostgreSQLAdapter]:
+    """Lease a pooled async connection for the duration of the `async with` block."""
+    pool = await get_async_pool()
+    async with pool.connection() as connection:
+        yield AsyncPostgreSQLAdapter(logger, connection).use_db(
+            os.environ["POSTGRES_DB"]
+        )
@@ -0,0 +1,140 @@
+import types
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from inspect import isclass
+from typing import Any, Callable, Dict, Sequence, Tuple, Type, TypeVar, Union
+from typing import get_args, get_origin
+from uuid import UUID
+
+import orjson
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+DATA_COLUMN = "data"
+
+
+def _to_uuid(value: Any) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def _to_datetime(value: Any) -> datetime:
+    # values kept in the data JSONB are ISO strings
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _to_date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    UUID: _to_uuid,
+    datetime: _to_datetime,
+    date: _to_date,
+    # DECIMAL columns come back as Decimal
+    float: float,
+}
+
+
+def _field_converter(annotation: Any) -> Callable[[Any], Any] | None:
+    """
+    How to turn a database value into a value of `annotation`, None when the
+    driver already returns the right type. Only called for non-NULL values.
+    """
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not types.NoneType]
+        return _field_converter(args[0]) if len(args) == 1 else None
+    if not isclass(annotation):
+        return None
+    if issubclass(annotation, Enum):
+        # enums stored as integer codes resolve through their get(), e.g. Gender.get
+        return getattr(annotation, "get", annotation)
+    if issubclass(annotation, BaseModel):
+        return annotation.model_validate
+    return CONVERTERS.get(annotation)
+
+
+class ModelRowFactory:
+    """
+    Builds models straight from row tuples of one column layout.
+
+    Which tuple position feeds which field, and how its value is converted, is
+    worked out once; each row then costs a handful of index lookups and a
+    model_construct() call instead of a dict per row and full validation.
+    Fields without a column of their own are read from the `data` JSONB.
+
+    model_construct() does not validate, so this is only for rows the adapters
+    wrote themselves from validated models.
+    """
+
+    def __init__(self, model: Type[M], columns: Sequence[str]):
+        self.model = model
+        fields = model.model_fields
+        self.plan: Tuple[Tuple[int, str, Callable | None], ...] = tuple(
+            (index, name, _field_converter(fields[name].annotation))
+            for index, name in enumerate(columns)
+            if name in fields
+        )
+        self.data_index = (
+            columns.index(DATA_COLUMN)
+            if DATA_COLUMN in columns and DATA_COLUMN not in fields
+            else None
+        )
+        self.data_fields: Dict[str, Callable | None] = {
+            name: _field_converter(field.annotation)
+            for name, field in fields.items()
+            if name not in columns
+        }
+
+    def __call__(self, row: Sequence[Any]) -> M:
+        values = {}
+        for index, name, convert in self.plan:
+            value = row[index]
+            values[name] = convert(value) if convert and value is not None else value
+
+        if self.data_index is not None and row[self.data_index]:
+            data = row[self.data_index]
+            if isinstance(data, (str, bytes)):
+                data = orjson.loads(data)
+            for name, convert in self.data_fields.items():
+                if name in data:
+                    value = data[name]
+                    values[name] = (
+                        convert(value) if convert and value is not None else value
+                    )
+
+        return self.model.model_construct(**values)
+
+
+@lru_cache(maxsize=256)
+def get_row_factory(model: Type[M], columns: Tuple[str, ...]) -> ModelRowFactory:
+    return ModelRowFactory(model, columns)
+
+
+def model_row(model: Type[M]):
+    """
+    psycopg 3 row factory returning `model` instances,
+    e.g. cursor(row_factory=model_row(User)).
+    """
+
+    def factory(cursor) -> Callable[[Sequence[Any]], M]:
+        columns = tuple(column.name for column in cursor.description or ())
+        return get_row_factory(model, columns)
+
+    return factory
+
+
+def model_row_with(model: Type[M], *extra: str):
+    """
+    model_row() for statements that return columns besides the model's, each row
+    becomes a (model, *values of the `extra` columns) tuple.
+    """
+
+    def factory(cursor) -> Callable[[Sequence[Any]], tuple]:
+        columns = tuple(column.name for column in cursor.description or ())
+        build = get_row_factory(model, columns)
+        indexes = [columns.index(name) for name in extra]
+        return lambda row: (build(row), *(row[index] for index in indexes))
+
+    return factory
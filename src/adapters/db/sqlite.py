@@ -1,9 +1,20 @@
 import sqlite3
+import threading
 from datetime import datetime
 from typing import Dict, Any, List, Self
 
-from src.adapters.db.base import BaseDBAdapter
-from src.schemas.common import TableName
+from src.adapters.db.base import BaseDBAdapter, OPERATOR_SQL, parse_order_by
+from src.adapters.db.sqlite_engine import SQLiteEngine, get_sqlite_engine
+from src.helpers.geo import (
+    encode_geohash,
+    geohash_neighbors,
+    geohash_precision_for_radius,
+    haversine_distance,
+)
+from src.schemas.common import TableName, WriteResult
+
+# SQLite limits the number of host parameters in a single statement
+MAX_SQL_VARIABLES = 500
 
 # Register datetime adapter for Python 3.12+
 sqlite3.register_adapter(datetime, lambda val: val.isoformat())
@@ -14,15 +25,41 @@ sqlite3.register_converter(
 
 
 class SQLiteDBAdapter(BaseDBAdapter):
+    """
+    Adapter over a SQLiteEngine. One instance may be shared by threads: each
+    thread runs on its own connection and its own transaction() nesting.
+    """
+
     table: str
+    id_column = "_id"
 
-    def __init__(self, logger, db_path: str = "db/local.sqlite3"):
+    def __init__(
+        self,
+        logger,
+        db_path: str = "db/local.sqlite3",
+        engine: SQLiteEngine | None = None,
+    ):
         self.logger = logger
         self.db_path = db_path
-        self.conn = sqlite3.connect(
-            db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-        )
-        self.cursor = self.conn.cursor()
+        self.engine = engine or get_sqlite_engine(db_path)
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self.engine.connection()
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """A new cursor on the calling thread's connection."""
+        return self.conn.cursor()
+
+    @property
+    def _transaction_depth(self) -> int:
+        return getattr(self._local, "transaction_depth", 0)
+
+    @_transaction_depth.setter
+    def _transaction_depth(self, depth: int) -> None:
+        self._local.transaction_depth = depth
 
     def use_db(self, db_name: str) -> Self:
         # SQLite doesn't really have multiple DBs in the same connection like Postgres
@@ -33,25 +70,138 @@ class SQLiteDBAdapter(BaseDBAdapter):
         self.table = table_name
         return self
 
+    def _execute_control(self, statement: str) -> None:
+        # transaction() blocks are for writes: take the write lock at BEGIN, a
+        # deferred transaction that read first cannot wait for it and fails with
+        # "database is locked" when another connection wrote in between
+        self.conn.execute("BEGIN IMMEDIATE" if statement == "BEGIN" else statement)
+
+    def _execute(self, query: str, values=()) -> sqlite3.Cursor:
+        with self._trace(query, values) as traced:
+            cursor = self.conn.execute(query, values)
+            traced.rows = cursor.rowcount
+        return cursor
+
+    def _execute_many(self, query: str, rows: List[tuple]) -> None:
+        with self._trace(query) as traced:
+            traced.rows = self.conn.executemany(query, rows).rowcount
+
+    def _select(self, query: str, values=()) -> List[Dict[str, Any]]:
+        # SQLite steps through the result while fetching, so fetchall is timed too
+        with self._trace(query, values) as traced:
+            cursor = self.conn.execute(query, values)
+            rows = cursor.fetchall()
+            traced.rows = len(rows)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
+
+    def _explain(self, sql: str, values) -> str | None:
+        # EXPLAIN QUERY PLAN does not run the statement, so writes are safe too
+        try:
+            cursor = self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", values)
+        except sqlite3.Error as e:
+            return f"EXPLAIN failed: {e}"
+        return "\n".join(row[-1] for row in cursor.fetchall())
+
     def create_one(self, data: Dict[str, Any]) -> str:
-        data = data.copy()
-        if "id" in data and "_id" not in data:
-            data["_id"] = data.pop("id")
+        data = self._with_geohash(self._with_sqlite_id(data))
 
         columns = ", ".join(data.keys())
         placeholders = ", ".join(["?" for _ in range(len(data))])
         values = tuple(data.values())
         query = f"INSERT INTO {self.table} ({columns}) VALUES ({placeholders})"
-        self.cursor.execute(query, values)
-        self.conn.commit()
-        return data.get("_id") or str(self.cursor.lastrowid)
+        cursor = self._execute(query, values)
+        return data.get("_id") or str(cursor.lastrowid)
+
+    @staticmethod
+    def _with_sqlite_id(data: Dict[str, Any]) -> Dict[str, Any]:
+        data = data.copy()
+        if "id" in data and "_id" not in data:
+            data["_id"] = data.pop("id")
+        return data
+
+    def _with_geohash(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Shops keep a geohash next to lat/lon so nearest_shops can scan by prefix."""
+        if self.table != TableName.SHOP:
+            return data
+        if data.get("lat") is None or data.get("lon") is None:
+            return data
+        return {**data, "geohash": encode_geohash(data["lat"], data["lon"])}
+
+    @staticmethod
+    def _group_by_columns(
+        rows: List[Dict[str, Any]],
+    ) -> Dict[tuple, List[tuple[int, Dict[str, Any]]]]:
+        """Group rows (with their input position) so each group is one executemany."""
+        groups = {}
+        for index, row in enumerate(rows):
+            groups.setdefault(tuple(row.keys()), []).append((index, row))
+        return groups
 
     def create_many(self, data: List[Dict[str, Any]]) -> List[str]:
-        ids = []
-        for row in data:
-            ids.append(self.create_one(row))
+        """Insert all rows in a single transaction, one executemany per column set."""
+        rows = [self._with_geohash(self._with_sqlite_id(row)) for row in data]
+        ids = [row.get("_id") for row in rows]
+        with self.transaction():
+            for columns, group in self._group_by_columns(rows).items():
+                placeholders = ", ".join(["?" for _ in columns])
+                query = (
+                    f"INSERT OR IGNORE INTO {self.table} ({', '.join(columns)}) "
+                    f"VALUES ({placeholders})"
+                )
+                if "_id" in columns:
+                    self._execute_many(query, [tuple(row.values()) for _, row in group])
+                    continue
+                # rows without an explicit id need their rowid, so go one by one
+                for index, row in group:
+                    ids[index] = str(
+                        self._execute(query, tuple(row.values())).lastrowid
+                    )
         return ids
 
+    def upsert_many(self, data: List[Dict[str, Any]]) -> List[WriteResult]:
+        """Insert or overwrite all rows in a single transaction."""
+        rows = [self._with_geohash(self._with_sqlite_id(row)) for row in data]
+        if any(not row.get("_id") for row in rows):
+            raise ValueError("ID is required for upsert_many")
+
+        with self.transaction():
+            # looked up under the write lock, so no other writer changes the
+            # outcomes before the rows are written
+            existing = self._existing_ids([row["_id"] for row in rows])
+            outcomes = []
+            for row in rows:
+                if row["_id"] in existing:
+                    outcomes.append(WriteResult.UPDATED)
+                else:
+                    outcomes.append(WriteResult.CREATED)
+                    # a repeated id in the same batch updates the first occurrence
+                    existing.add(row["_id"])
+
+            for columns, group in self._group_by_columns(rows).items():
+                placeholders = ", ".join(["?" for _ in columns])
+                update_set = ", ".join(
+                    [f"{c}=excluded.{c}" for c in columns if c != "_id"]
+                )
+                query = (
+                    f"INSERT INTO {self.table} ({', '.join(columns)}) "
+                    f"VALUES ({placeholders}) ON CONFLICT(_id) DO "
+                    + (f"UPDATE SET {update_set}" if update_set else "NOTHING")
+                )
+                self._execute_many(query, [tuple(row.values()) for _, row in group])
+        return outcomes
+
+    def _existing_ids(self, ids: List[str]) -> set:
+        found = set()
+        for start in range(0, len(ids), MAX_SQL_VARIABLES):
+            chunk = ids[start : start + MAX_SQL_VARIABLES]
+            placeholders = ", ".join(["?" for _ in chunk])
+            rows = self._select(
+                f"SELECT _id FROM {self.table} WHERE _id IN ({placeholders})", chunk
+            )
+            found.update(row["_id"] for row in rows)
+        return found
+
     def create_or_update_one(self, data: Dict[str, Any]) -> bool:
         _id = data.get("_id")
         if not _id:
@@ -64,61 +214,109 @@ class SQLiteDBAdapter(BaseDBAdapter):
 
     def read_one(self, _id: str, **kwargs) -> Dict[str, Any] | None:
         query = f"SELECT * FROM {self.table} WHERE _id=?"
-        self.cursor.execute(query, (_id,))
-        result = self.cursor.fetchone()
-        if not result:
-            return None
-        columns = [col[0] for col in self.cursor.description]
-        return dict(zip(columns, result))
+        rows = self._select(query, (_id,))
+        return rows[0] if rows else None
+
+    @staticmethod
+    def _build_where_clause(where: Dict[str, Any] | None) -> tuple[str, tuple]:
+        if not where:
+            return "", ()
+
+        conditions = []
+        values = []
+        for key, value in where.items():
+            if isinstance(value, dict):
+                for operator, operand in value.items():
+                    conditions.append(f"{key}{OPERATOR_SQL[operator]}?")
+                    values.append(operand)
+            else:
+                conditions.append(f"{key}=?")
+                values.append(value)
+        return " WHERE " + " AND ".join(conditions), tuple(values)
 
     def read_many(
-        self, where: Dict[str, Any] | None = None, limit: int | None = None, **kwargs
+        self,
+        where: Dict[str, Any] | None = None,
+        limit: int | None = None,
+        order_by: str | None = None,
+        offset: int | None = None,
+        **kwargs,
     ) -> List[Dict[str, Any]]:
-        query = f"SELECT * FROM {self.table}"
-        values = ()
-        if where:
-            query_string = " AND ".join([f"{k}=?" for k in where.keys()])
-            values = tuple(where.values())
-            query += f" WHERE {query_string}"
+        where_clause, values = self._build_where_clause(where)
+        query = f"SELECT * FROM {self.table}{where_clause}"
+
+        if order_by:
+            column, direction = parse_order_by(order_by)
+            if not column.isidentifier():
+                raise ValueError(f"Cannot order by '{column}'")
+            query += f" ORDER BY {column} {direction}"
 
         if limit:
-            query += f" LIMIT {limit}"
+            query += f" LIMIT {int(limit)}"
+        elif offset:
+            # SQLite only accepts OFFSET after a LIMIT clause
+            query += " LIMIT -1"
 
-        self.cursor.execute(query, values)
-        results = self.cursor.fetchall()
-        columns = [col[0] for col in self.cursor.description]
-        return [dict(zip(columns, row)) for row in results]
+        if offset:
+            query += f" OFFSET {int(offset)}"
+
+        return self._select(query, values)
+
+    def count(self, where: Dict[str, Any] | None = None, **kwargs) -> int:
+        where_clause, values = self._build_where_clause(where)
+        rows = self._select(
+            f"SELECT COUNT(*) AS count FROM {self.table}{where_clause}", values
+        )
+        return rows[0]["count"]
+
+    def nearest_shops(
+        self, lat: float, lon: float, radius: float, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Geohash fallback for the earthdistance index: scan the cells around (lat, lon)
+        by prefix, then rank the candidates by their exact haversine distance.
+        """
+        precision = geohash_precision_for_radius(radius, lat)
+        cells = geohash_neighbors(encode_geohash(lat, lon, precision))
+        conditions = " OR ".join(["geohash GLOB ?" for _ in cells])
+        rows = self._select(
+            f"SELECT * FROM {TableName.SHOP} WHERE {conditions}",
+            tuple(f"{cell}*" for cell in cells),
+        )
+
+        shops = []
+        for shop in rows:
+            distance = haversine_distance(lat, lon, shop["lat"], shop["lon"])
+            if distance <= radius:
+                shop["distance"] = distance
+                shops.append(shop)
+
+        shops.sort(key=lambda shop: shop["distance"])
+        return shops[:limit]
 
     def update_one(self, _id: str, data: Dict[str, Any]) -> bool:
+        data = self._with_geohash(data)
         columns = ", ".join([f"{k}=?" for k in data.keys()])
         values = tuple(data.values())
         query = f"UPDATE {self.table} SET {columns} WHERE _id=?"
-        self.cursor.execute(query, values + (_id,))
-        self.conn.commit()
-        return self.cursor.rowcount > 0
+        return self._execute(query, values + (_id,)).rowcount > 0
 
     def update_many(self, query: Dict[str, Any], data: Dict[str, Any]) -> int:
         columns = ", ".join([f"{k}=?" for k in data.keys()])
         values = tuple(data.values()) + tuple(query.values())
         query_string = " AND ".join([f"{k}=?" for k in query.keys()])
         query = f"UPDATE {self.table} SET {columns} WHERE {query_string}"
-        self.cursor.execute(query, values)
-        self.conn.commit()
-        return self.cursor.rowcount
+        return self._execute(query, values).rowcount
 
     def delete_one(self, _id: str, **kwargs) -> bool:
         query = f"DELETE FROM {self.table} WHERE _id=?"
-        self.cursor.execute(query, (_id,))
-        self.conn.commit()
-        return self.cursor.rowcount > 0
+        return self._execute(query, (_id,)).rowcount > 0
 
     def delete_many(self, query: Dict[str, Any]) -> int:
         query_string = " AND ".join([f"{k}=?" for k in query.keys()])
         values = tuple(query.values())
         query = f"DELETE FROM {self.table} WHERE {query_string}"
-        self.cursor.execute(query, values)
-        self.conn.commit()
-        return self.cursor.rowcount
+        return self._execute(query, values).rowcount
 
     def create_table(self, table_name: TableName, **kwargs) -> Self:
         # SQLite needs a schema.
@@ -127,5 +325,8 @@ class SQLiteDBAdapter(BaseDBAdapter):
 
     def drop_table(self, table_name: TableName) -> None:
         query = f"DROP TABLE IF EXISTS {table_name}"
-        self.cursor.execute(query)
-        self.conn.commit()
+        self.conn.execute(query)
+
+    def close(self) -> None:
+        """Release the calling thread's connection, the engine stays usable."""
+        self.engine.release()
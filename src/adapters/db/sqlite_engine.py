@@ -0,0 +1,163 @@
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List
+
+# Negative cache_size is in KiB: 64 MiB of page cache per connection
+DEFAULT_CACHE_SIZE = -64 * 1024
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_BUSY_TIMEOUT = 5.0
+
+
+class SQLiteEngine:
+    """
+    sqlite3 connections to one database file, one per thread.
+
+    - the database runs in WAL mode, so readers never block the writer and the
+      writer never blocks readers; writers still take turns, waiting up to
+      `busy_timeout` seconds for the lock
+    - synchronous=NORMAL only syncs the WAL at checkpoints, a commit is a plain
+      write and cannot corrupt the database, at worst the last commits are lost
+      on power failure
+    - connections run in autocommit mode: a statement outside an explicit
+      BEGIN ... COMMIT is its own transaction
+
+    An in-memory database exists only on the connection that created it, so an
+    in-memory engine opens a single connection and every thread uses that one.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        busy_timeout: float = DEFAULT_BUSY_TIMEOUT,
+    ):
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+        self.in_memory = is_in_memory(db_path)
+        if not self.in_memory and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._shared: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            # only the owning thread uses it, close_all() may run elsewhere
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size={int(self.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use."""
+        if self.in_memory:
+            return self._shared_connection()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+                self._opened += 1
+        return conn
+
+    def _shared_connection(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._shared is None:
+                self._shared = self._connect()
+                self._connections.append(self._shared)
+                self._opened += 1
+            return self._shared
+
+    def release(self) -> None:
+        """
+        Close the calling thread's connection, e.g. before the thread exits.
+        An in-memory engine closes its only connection, and the database with it.
+        """
+        if self.in_memory:
+            self.close_all()
+            return
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._connections.remove(conn)
+        conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._shared = None
+        for conn in connections:
+            conn.close()
+        # connections of other threads are closed now, make them reconnect
+        self._local = threading.local()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "db_path": self.db_path,
+                "connections": len(self._connections),
+                "opened": self._opened,
+            }
+
+
+def is_in_memory(db_path: str) -> bool:
+    """`:memory:`, or a `file:` URI naming an in-memory database."""
+    if db_path == ":memory:":
+        return True
+    return db_path.startswith("file:") and (
+        db_path.startswith("file::memory:") or "mode=memory" in db_path
+    )
+
+
+_engines: Dict[str, SQLiteEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def _new_engine(db_path: str) -> SQLiteEngine:
+    return SQLiteEngine(
+        db_path,
+        cache_size=int(os.environ.get("SQLITE_CACHE_SIZE", str(DEFAULT_CACHE_SIZE))),
+        mmap_size=int(os.environ.get("SQLITE_MMAP_SIZE", str(DEFAULT_MMAP_SIZE))),
+        busy_timeout=float(
+            os.environ.get("SQLITE_BUSY_TIMEOUT", str(DEFAULT_BUSY_TIMEOUT))
+        ),
+    )
+
+
+def get_sqlite_engine(db_path: str) -> SQLiteEngine:
+    """
+    Process-wide engine per database file, tuned from the environment.
+    In-memory databases are never shared: each call gets a new, empty one.
+    """
+    if is_in_memory(db_path):
+        return _new_engine(db_path)
+    key = os.path.realpath(db_path)
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = _new_engine(db_path)
+        return _engines[key]
+
+
+def close_sqlite_engines() -> None:
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.close_all()
+        _engines.clear()
@@ -0,0 +1,115 @@
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, NamedTuple
+
+from psycopg2.extensions import connection as PgConnection
+
+# Distinct SQL texts kept in memory, least recently used ones are dropped first
+STATEMENT_CACHE_SIZE = 1024
+# Upper bound on statements prepared in a single server session, the least
+# recently used one is deallocated to make room
+MAX_PREPARED_PER_CONNECTION = 256
+
+
+class CompiledStatement(NamedTuple):
+    """SQL text built once per (table, column set, operation)."""
+
+    name: str
+    # psycopg "%s" form, executable on any connection
+    sql: str
+    # server-side form: PREPARE with $n placeholders, EXECUTE with the values
+    prepare_sql: str
+    execute_sql: str
+
+
+def compile_statement(name: str, sql: str) -> CompiledStatement:
+    parts = sql.split("%s")
+    server_sql = parts[0]
+    for position, part in enumerate(parts[1:], start=1):
+        server_sql += f"${position}{part}"
+
+    placeholders = ", ".join(["%s"] * (len(parts) - 1))
+    execute_sql = (
+        f"EXECUTE {name}({placeholders})" if placeholders else f"EXECUTE {name}"
+    )
+    return CompiledStatement(name, sql, f"PREPARE {name} AS {server_sql}", execute_sql)
+
+
+class StatementCache:
+    """Thread-safe LRU of compiled statements with hit/miss counters."""
+
+    def __init__(self, max_size: int = STATEMENT_CACHE_SIZE):
+        self.max_size = max_size
+        self._statements: OrderedDict[Hashable, CompiledStatement] = OrderedDict()
+        self._names = itertools.count(1)
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._prepares = 0
+        self._prepared_executions = 0
+
+    def get(self, key: Hashable, build: Callable[[], str]) -> CompiledStatement:
+        """Return the statement for `key`, calling `build` for its SQL only on a miss."""
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is not None:
+                self._statements.move_to_end(key)
+                self._hits += 1
+                return statement
+            self._misses += 1
+
+        # build outside the lock, a racing thread at worst builds the same text twice
+        sql = build()
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is None:
+                statement = compile_statement(f"pbapi_{next(self._names)}", sql)
+                self._statements[key] = statement
+                if len(self._statements) > self.max_size:
+                    self._statements.popitem(last=False)
+                    self._evictions += 1
+            return statement
+
+    def record_execution(self, prepared: bool) -> None:
+        """
+        Count one server-side execution, `prepared` is False when it needed a
+        PREPARE.
+        """
+        with self._lock:
+            if prepared:
+                self._prepared_executions += 1
+            else:
+                self._prepares += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._statements.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._statements),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "prepares": self._prepares,
+                "prepared_executions": self._prepared_executions,
+            }
+
+
+class PreparingConnection(PgConnection):
+    """
+    psycopg2 connection that remembers which statements its session has prepared,
+    least recently used first.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: OrderedDict[str, None] = OrderedDict()
+
+
+# SQL text does not depend on the connection, so one cache serves the whole process
+statement_cache = StatementCache()
@@ -0,0 +1,210 @@
+import heapq
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple
+
+from src.adapters.metrics.request import current_request_metrics
+
+logger = logging.getLogger(__name__)
+
+# Distinct statement shapes kept, the least recently seen ones are dropped first
+MAX_SHAPES = 500
+# Runs of one shape within a request before it is reported as an N+1
+N_PLUS_ONE_THRESHOLD = 10
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_TUPLE_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|JOIN)\s+"?([A-Za-z_]\w*)"?', re.IGNORECASE)
+_WRITE = re.compile(r"\b(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+class StatementShape(NamedTuple):
+    """SQL text with its literals and parameters replaced, plus what it touches."""
+
+    text: str
+    operation: str
+    table: str | None
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(sql: str) -> StatementShape:
+    """
+    Normalize `sql` so every execution of the same query maps to one shape: values
+    become "?", IN lists and multi-row VALUES collapse to "(...)".
+    """
+    text = " ".join(sql.split())
+    text = _STRING.sub("?", text)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _PLACEHOLDER_LIST.sub("(...)", text)
+    text = _TUPLE_LIST.sub("(...)", text)
+
+    operation = text.split(" ", 1)[0].upper() if text else ""
+    if operation == "WITH":
+        # a data-modifying CTE is a write, whatever the final SELECT says
+        write = _WRITE.search(text)
+        operation = write.group(1).upper() if write else "SELECT"
+    table = _TABLE.search(text)
+    return StatementShape(text, operation, table.group(1) if table else None)
+
+
+@dataclass
+class StatementStats:
+    shape: str
+    operation: str
+    table: str | None
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    # requests that ran this shape at least N_PLUS_ONE_THRESHOLD times
+    n_plus_one: int = 0
+    plan: str | None = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["mean_seconds"] = self.total_seconds / self.calls if self.calls else 0.0
+        return data
+
+
+class TracedStatement:
+    """One execution, the adapter fills in `rows` once it knows them."""
+
+    __slots__ = ("sql", "rows", "seconds")
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        # -1 when the driver does not report a row count
+        self.rows = -1
+        self.seconds = 0.0
+
+
+class StatementTracer:
+    """
+    Per-shape call counts, time and rows of the statements an adapter runs.
+
+    Memory is bounded by `max_shapes`; the slowest and most frequent shapes are
+    picked from those when asked for. With `explain_ms` set, adapters attach the
+    plan of the first execution of a shape that took longer than that. Within a
+    request (see track_request) a shape repeated `n_plus_one` times is logged and
+    counted as a likely N+1.
+    """
+
+    def __init__(
+        self,
+        max_shapes: int = MAX_SHAPES,
+        explain_ms: float | None = None,
+        n_plus_one: int = N_PLUS_ONE_THRESHOLD,
+    ):
+        self.max_shapes = max_shapes
+        self.explain_ms = explain_ms
+        self.n_plus_one_threshold = n_plus_one
+        self._stats: OrderedDict[str, StatementStats] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, traced: TracedStatement) -> StatementStats:
+        shape = statement_shape(traced.sql)
+        repeats = self._count_in_request(shape.text)
+        with self._lock:
+            stats = self._stats.get(shape.text)
+            if stats is None:
+                stats = StatementStats(shape.text, shape.operation, shape.table)
+                self._stats[shape.text] = stats
+                if len(self._stats) > self.max_shapes:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(shape.text)
+            stats.calls += 1
+            stats.total_seconds += traced.seconds
+            stats.max_seconds = max(stats.max_seconds, traced.seconds)
+            if traced.rows > 0:
+                stats.rows += traced.rows
+            if repeats == self.n_plus_one_threshold:
+                stats.n_plus_one += 1
+
+        if repeats == self.n_plus_one_threshold:
+            logger.warning(
+                f"Possible N+1: {shape.text} ran {repeats} times in one request"
+            )
+        return stats
+
+    @staticmethod
+    def _count_in_request(shape: str) -> int:
+        metrics = current_request_metrics()
+        if metrics is None:
+            return 0
+        metrics.statement_shapes[shape] += 1
+        return metrics.statement_shapes[shape]
+
+    def wants_plan(self, stats: StatementStats, seconds: float) -> bool:
+        return (
+            self.explain_ms is not None
+            and stats.plan is None
+            and seconds * 1000 >= self.explain_ms
+        )
+
+    def set_plan(self, stats: StatementStats, plan: str) -> None:
+        with self._lock:
+            stats.plan = plan
+
+    def slowest(self, n: int = 10) -> List[StatementStats]:
+        with self._lock:
+            return heapq.nlargest(
+                n, self._stats.values(), key=lambda stats: stats.max_seconds
+            )
+
+    def most_frequent(self, n: int = 10) -> List[StatementStats]:
+        with self._lock:
+            return heapq.nlargest(
+                n, self._stats.values(), key=lambda stats: stats.calls
+            )
+
+    def n_plus_one(self) -> List[StatementStats]:
+        with self._lock:
+            flagged = [stats for stats in self._stats.values() if stats.n_plus_one]
+        return sorted(flagged, key=lambda stats: stats.n_plus_one, reverse=True)
+
+    def report(self, n: int = 10) -> Dict[str, Any]:
+        return {
+            "shapes": len(self._stats),
+            "slowest": [stats.as_dict() for stats in self.slowest(n)],
+            "most_frequent": [stats.as_dict() for stats in self.most_frequent(n)],
+            "n_plus_one": [stats.as_dict() for stats in self.n_plus_one()],
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+_tracer: StatementTracer | None = None
+_tracer_lock = threading.Lock()
+
+
+def get_statement_tracer() -> StatementTracer | None:
+    """The process-wide tracer, None unless PBAPI_SQL_TRACE is set."""
+    global _tracer  # pylint: disable=global-statement
+    if _tracer is None and os.environ.get("PBAPI_SQL_TRACE"):
+        with _tracer_lock:
+            if _tracer is None:
+                explain_ms = os.environ.get("PBAPI_SQL_EXPLAIN_MS")
+                _tracer = StatementTracer(
+                    max_shapes=int(
+                        os.environ.get("PBAPI_SQL_TRACE_SHAPES", str(MAX_SHAPES))
+                    ),
+                    explain_ms=float(explain_ms) if explain_ms else None,
+                    n_plus_one=int(
+                        os.environ.get(
+                            "PBAPI_SQL_N_PLUS_ONE", str(N_PLUS_ONE_THRESHOLD)
+                        )
+                    ),
+                )
+    return _tracer
@@ -1,10 +1,112 @@
+import hashlib
+import json
 import os
+import stat
+import tempfile
+import time
+from typing import Dict
 
-from dopplersdk import DopplerSDK
 from dotenv import load_dotenv
 
 from src import constants as c
 
+# Seconds a snapshot is trusted, 0 (the default) disables snapshots
+DEFAULT_SNAPSHOT_TTL = 0
+
+
+def _snapshot_dir() -> str:
+    """A directory private to the current user, unless DOPPLER_SNAPSHOT_DIR is set."""
+    return os.environ.get("DOPPLER_SNAPSHOT_DIR") or os.path.join(
+        tempfile.gettempdir(), f"pbapi-{os.getuid()}"
+    )
+
+
+def _snapshot_ttl() -> float:
+    return float(os.environ.get("DOPPLER_SNAPSHOT_TTL", str(DEFAULT_SNAPSHOT_TTL)))
+
+
+def snapshot_path(
+    token: str, project: str, config: str, directory: str | None = None
+) -> str:
+    """One file per token, project and config, so a dev snapshot never serves prd."""
+    key = hashlib.sha256(f"{token}\0{project}\0{config}".encode()).hexdigest()[:32]
+    return os.path.join(directory or _snapshot_dir(), f"doppler-{key}.json")
+
+
+def _is_private(info: os.stat_result) -> bool:
+    """Owned by the current user, no access for group or others."""
+    return info.st_uid == os.getuid() and not info.st_mode & (
+        stat.S_IRWXG | stat.S_IRWXO
+    )
+
+
+def read_secrets_snapshot(path: str, ttl: float) -> Dict[str, str] | None:
+    """
+    Secrets saved by an earlier start, None when missing, unreadable, expired,
+    or not a file owned by and private to the current user.
+    """
+    if ttl <= 0:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if not _is_private(os.fstat(f.fileno())):
+                return None
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or not isinstance(snapshot.get("secrets"), dict):
+        return None
+    if time.time() - snapshot.get("saved_at", 0) > ttl:
+        return None
+    return snapshot["secrets"]
+
+
+def write_secrets_snapshot(path: str, secrets: Dict[str, str]) -> None:
+    """
+    Readable by the owner only, replaced atomically so readers never see half a file.
+    Skipped when the directory belongs to someone else or others may write to it.
+    """
+    directory = os.path.dirname(path) or "."
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if not _is_private(os.stat(directory)):
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".doppler-")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "secrets": secrets}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def fetch_doppler_secrets(token: str, project: str, config: str) -> Dict[str, str]:
+    # the SDK is only imported when a start actually has to ask Doppler
+    from dopplersdk import DopplerSDK  # pylint: disable=import-outside-toplevel
+
+    sdk = DopplerSDK()
+    sdk.set_access_token(token)
+    response = sdk.secrets.list(project=project, config=config)
+    secrets = {}
+    if response and response.secrets:
+        for key, value in response.secrets.items():
+            secret_value = getattr(value, "raw", None)
+            if secret_value is None and isinstance(value, dict):
+                secret_value = (
+                    value.get("raw") or value.get("value") or value.get("secret")
+                )
+            elif secret_value is None and isinstance(value, str):
+                secret_value = value
+
+            if secret_value is not None:
+                secrets[key] = secret_value
+    return secrets
+
 
 def load_doppler_secrets():
     load_dotenv()
@@ -25,20 +127,15 @@ def load_doppler_secrets():
     if not config:
         raise EnvironmentError("DOPPLER_ENVIRONMENT is not set")
 
-    sdk = DopplerSDK()
-    sdk.set_access_token(token)
-    response = sdk.secrets.list(project=project, config=config)
-    if response and response.secrets:
-        for key, value in response.secrets.items():
-            if key in os.environ:
-                continue
-            secret_value = getattr(value, "raw", None)
-            if secret_value is None and isinstance(value, dict):
-                secret_value = (
-                    value.get("raw") or value.get("value") or value.get("secret")
-                )
-            elif secret_value is None and isinstance(value, str):
-                secret_value = value
+    # with DOPPLER_SNAPSHOT_TTL set, a start shortly after another one reuses its
+    # secrets instead of asking Doppler
+    path, ttl = snapshot_path(token, project, config), _snapshot_ttl()
+    secrets = read_secrets_snapshot(path, ttl)
+    if secrets is None:
+        secrets = fetch_doppler_secrets(token, project, config)
+        if ttl > 0:
+            write_secrets_snapshot(path, secrets)
 
-            if secret_value is not None:
-                os.environ[key] = secret_value
+    for key, value in secrets.items():
+        if key not in os.environ:
+            os.environ[key] = value
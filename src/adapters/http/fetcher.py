@@ -0,0 +1,319 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.adapters.metrics.registry import get_metrics_registry
+from src.adapters.metrics.request import track_http
+
+try:
+    import h2  # noqa: F401  pylint: disable=unused-import
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+OXYLABS_ENDPOINT = "https://realtime.oxylabs.io/v1/queries"
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)",
+    "Accept-Language": "ro-MD,ro;q=0.9,en-US;q=0.8,en;q=0.7,ru;q=0.6",
+}
+
+DIRECT_PATH = "direct"
+PROXY_PATH = "proxy"
+
+# Number of most recent requests per path kept for latency percentiles
+LATENCY_WINDOW = 500
+# Below this many samples the hedge delay falls back to the configured default
+HEDGE_MIN_SAMPLES = 20
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+FETCH_ATTEMPT_SECONDS = get_metrics_registry().histogram(
+    "pbapi_fetch_attempt_duration_seconds",
+    "Time of each receipt fetch attempt, per path (direct or proxy)",
+)
+
+
+class LatencyRecorder:
+    """Rolling request latencies and error counts per fetch path."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, path: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self._latencies.setdefault(path, deque(maxlen=self.window)).append(
+                    seconds
+                )
+            else:
+                self._errors[path] = self._errors.get(path, 0) + 1
+
+    def percentile(self, path: str, q: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._latencies.get(path, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+    def sample_count(self, path: str) -> int:
+        with self._lock:
+            return len(self._latencies.get(path, ()))
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        paths = set(self._latencies) | set(self._errors)
+        return {
+            path: {
+                "count": self.sample_count(path),
+                "errors": self._errors.get(path, 0),
+                "p50_ms": _to_ms(self.percentile(path, 0.50)),
+                "p95_ms": _to_ms(self.percentile(path, 0.95)),
+                "p99_ms": _to_ms(self.percentile(path, 0.99)),
+            }
+            for path in paths
+        }
+
+
+def _to_ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+class AsyncFetcher:
+    """
+    Receipt page fetcher on a pooled keep-alive httpx client.
+
+    - the direct request to the receipt host is hedged: if it has not answered
+      after the p95 of recent direct latencies, the Oxylabs proxy request starts
+      in parallel and the first successful response wins
+    - at most `max_per_host` requests run against the same host at once
+    - transport errors and 429/5xx responses are retried with jittered
+      exponential backoff
+    """
+
+    def __init__(
+        self,
+        timeout: float = 5.0,
+        proxy_timeout: float = 60.0,
+        max_per_host: int = 4,
+        retries: int = 2,
+        backoff: float = 0.2,
+        hedge_delay: float | None = None,
+        hedge_default_delay: float = 2.0,
+        hedge_min_delay: float = 0.2,
+        proxy_endpoint: str = OXYLABS_ENDPOINT,
+        http2: bool = True,
+    ):
+        self.timeout = timeout
+        self.proxy_timeout = proxy_timeout
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_delay = hedge_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.proxy_endpoint = proxy_endpoint
+        self.http2 = http2 and HTTP2_AVAILABLE
+
+        self.latencies = LatencyRecorder()
+        self._client: httpx.AsyncClient | None = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                headers=DEFAULT_HEADERS,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=60,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
+
+    def current_hedge_delay(self) -> float:
+        """Seconds to wait for the direct request before starting the proxy one."""
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        if self.latencies.sample_count(DIRECT_PATH) < HEDGE_MIN_SAMPLES:
+            return self.hedge_default_delay
+        p95 = self.latencies.percentile(DIRECT_PATH, 0.95)
+        return min(max(p95, self.hedge_min_delay), self.timeout)
+
+    async def _request(
+        self, path: str, method: str, url: str, retries: int, logger, **kwargs
+    ) -> httpx.Response | None:
+        async with self._host_limit(url):
+            for attempt in range(retries + 1):
+                started = time.monotonic()
+                try:
+                    resp = await self.client.request(method, url, **kwargs)
+                except httpx.HTTPError as e:
+                    logger.warning("%s %s %s failed: %s", path, method, url, e)
+                    resp = None
+
+                ok = resp is not None and resp.status_code == 200
+                elapsed = time.monotonic() - started
+                self.latencies.record(path, elapsed, ok)
+                FETCH_ATTEMPT_SECONDS.observe(elapsed, path=path, ok=str(ok).lower())
+                if ok:
+                    return resp
+                if resp is not None:
+                    logger.warning(
+                        "%s %s %s response_code=%s", path, method, url, resp.status_code
+                    )
+                    if resp.status_code not in RETRYABLE_STATUS_CODES:
+                        return None
+
+                if attempt < retries:
+                    delay = self.backoff * 2**attempt * random.uniform(0.5, 1.5)
+                    await asyncio.sleep(delay)
+        return None
+
+    async def fetch_direct(self, url: str, logger) -> str | None:
+        resp = await self._request(
+            DIRECT_PATH, "GET", url, self.retries, logger, timeout=self.timeout
+        )
+        return resp.text if resp is not None else None
+
+    async def fetch_via_proxy(self, url: str, logger) -> str | None:
+        api_user = os.environ.get("OXYLABS_API_USER")
+        api_pass = os.environ.get("OXYLABS_API_PASS")
+        if not (api_user and api_pass):
+            logger.warning("missing OXYLABS_API_USER and OXYLABS_API_PASS")
+            return None
+
+        # the proxy is billed per request, so it is not retried
+        resp = await self._request(
+            PROXY_PATH,
+            "POST",
+            self.proxy_endpoint,
+            0,
+            logger,
+            auth=(api_user, api_pass),
+            json={"source": "universal", "url": url},
+            timeout=self.proxy_timeout,
+        )
+        if resp is None:
+            return None
+        try:
+            return resp.json()["results"][0]["content"]
+        except (ValueError, KeyError, IndexError) as e:
+            logger.warning("oxylabs %s failed: %s", url, e)
+            return None
+
+    async def get_html(self, url: str, logger) -> str | None:
+        """Fetch directly, hedging with the proxy when the direct request runs slow."""
+        direct = asyncio.create_task(self.fetch_direct(url, logger))
+        done, _ = await asyncio.wait({direct}, timeout=self.current_hedge_delay())
+        if done and direct.result():
+            return direct.result()
+
+        proxy = asyncio.create_task(self.fetch_via_proxy(url, logger))
+        pending = {direct, proxy} - done
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.result():
+                        return task.result()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def head(self, url: str, timeout: float) -> int:
+        """Status code of a single HEAD request, not retried or hedged."""
+        resp = await self.client.head(url, timeout=timeout)
+        return resp.status_code
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return self.latencies.stats()
+
+
+def create_fetcher() -> AsyncFetcher:
+    hedge_delay = os.environ.get("HTTP_HEDGE_DELAY")
+    return AsyncFetcher(
+        timeout=float(os.environ.get("HTTP_TIMEOUT", "5")),
+        max_per_host=int(os.environ.get("HTTP_MAX_PER_HOST", "4")),
+        retries=int(os.environ.get("HTTP_RETRIES", "2")),
+        hedge_delay=float(hedge_delay) if hedge_delay else None,
+    )
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_fetcher: AsyncFetcher | None = None
+_lock = threading.Lock()
+
+
+def _get_background_fetcher() -> tuple[asyncio.AbstractEventLoop, AsyncFetcher]:
+    """
+    The shared fetcher lives on its own event loop thread, so its pooled
+    connections are reused by every caller, sync handlers included.
+    """
+    global _loop, _fetcher  # pylint: disable=global-statement
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="http-fetcher", daemon=True
+            ).start()
+            _fetcher = create_fetcher()
+        return _loop, _fetcher
+
+
+def fetch_html(url: str, logger) -> str | None:
+    """Blocking entry point for sync code."""
+    loop, fetcher = _get_background_fetcher()
+    # timed here, the fetcher's loop thread does not see the caller's request
+    with track_http(urlsplit(url).hostname or "unknown"):
+        return asyncio.run_coroutine_threadsafe(
+            fetcher.get_html(url, logger), loop
+        ).result()
+
+
+async def fetch_html_async(url: str, logger) -> str | None:
+    """Entry point for code already running inside an event loop."""
+    loop, fetcher = _get_background_fetcher()
+    with track_http(urlsplit(url).hostname or "unknown"):
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(fetcher.get_html(url, logger), loop)
+        )
+
+
+async def head_async(url: str, timeout: float) -> int:
+    """HEAD `url` on the shared client, e.g. to check that a host is reachable."""
+    loop, fetcher = _get_background_fetcher()
+    with track_http(urlsplit(url).hostname or "unknown"):
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(fetcher.head(url, timeout), loop)
+        )
+
+
+def get_fetcher_stats() -> Dict[str, Dict[str, float]]:
+    return _fetcher.stats() if _fetcher is not None else {}
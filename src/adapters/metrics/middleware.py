@@ -0,0 +1,123 @@
+import logging
+import os
+import re
+import tempfile
+import time
+
+from src.adapters.metrics.profiler import (
+    DEFAULT_INTERVAL,
+    SamplingProfiler,
+    write_folded,
+)
+from src.adapters.metrics.registry import (
+    COUNT_BUCKETS,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+from src.adapters.metrics.request import track_request
+
+logger = logging.getLogger(__name__)
+
+# requests that match no route share one label, so scanners cannot blow up the series
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Per-route latency, database and outbound HTTP time of every request.
+
+    A plain ASGI middleware, so it measures the same under uvicorn and behind
+    the Appwrite adapter. With `slow_ms` set (env PBAPI_PROFILE_SLOW_MS), every
+    request is sampled by a SamplingProfiler and the stacks of requests slower
+    than that are written to `profile_dir` as folded stacks.
+    """
+
+    def __init__(
+        self,
+        app,
+        registry: MetricsRegistry | None = None,
+        slow_ms: float | None = None,
+        profile_dir: str | None = None,
+    ):
+        self.app = app
+        registry = registry or get_metrics_registry()
+        self.request_seconds = registry.histogram(
+            "pbapi_request_duration_seconds", "Request latency per route"
+        )
+        self.db_seconds = registry.histogram(
+            "pbapi_request_db_duration_seconds", "Database time per request"
+        )
+        self.db_statements = registry.histogram(
+            "pbapi_request_db_statements",
+            "Database statements per request",
+            buckets=COUNT_BUCKETS,
+        )
+        self.http_seconds = registry.histogram(
+            "pbapi_request_http_duration_seconds", "Outbound HTTP time per request"
+        )
+
+        if slow_ms is None and os.environ.get("PBAPI_PROFILE_SLOW_MS"):
+            slow_ms = float(os.environ["PBAPI_PROFILE_SLOW_MS"])
+        self.slow_ms = slow_ms
+        self.profile_dir = profile_dir or os.environ.get(
+            "PBAPI_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "pbapi_profiles")
+        )
+        self.profiler = (
+            SamplingProfiler(
+                float(os.environ.get("PBAPI_PROFILE_INTERVAL", str(DEFAULT_INTERVAL)))
+            )
+            if slow_ms
+            else None
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        session = self.profiler.start() if self.profiler else None
+        started = time.perf_counter()
+        with track_request() as metrics:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                elapsed = time.perf_counter() - started
+                route = _route_label(scope)
+                self.request_seconds.observe(
+                    elapsed, method=scope["method"], route=route, status=str(status)
+                )
+                self.db_seconds.observe(metrics.db_seconds, route=route)
+                self.db_statements.observe(metrics.db_statements, route=route)
+                self.http_seconds.observe(metrics.http_seconds, route=route)
+                if session is not None:
+                    stacks = self.profiler.stop(session)
+                    if elapsed * 1000 >= self.slow_ms and stacks:
+                        self._dump(scope["method"], route, elapsed, metrics, stacks)
+
+    def _dump(self, method: str, route: str, elapsed: float, metrics, stacks) -> None:
+        name = re.sub(r"[^A-Za-z0-9]+", "_", f"{method}{route}").strip("_")
+        path = os.path.join(self.profile_dir, f"{time.time_ns()}-{name}.folded")
+        try:
+            write_folded(path, stacks)
+        except OSError as e:
+            logger.warning(f"Failed to write profile {path}: {e}")
+            return
+        logger.warning(
+            f"Slow request {method} {route}: {elapsed * 1000:.0f} ms, "
+            f"db {metrics.db_statements} statements {metrics.db_seconds * 1000:.0f} ms, "
+            f"http {metrics.http_calls} calls {metrics.http_seconds * 1000:.0f} ms, "
+            f"profile in {path}"
+        )
@@ -0,0 +1,82 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+
+DEFAULT_INTERVAL = 0.005
+# Frames kept per sample, from the root
+MAX_DEPTH = 64
+
+
+def _fold(frame) -> str:
+    """A stack as "file:function;file:function" from the outermost frame in."""
+    names: List[str] = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of every thread while at least one session is open.
+
+    The sampler thread only runs while something is being profiled, so an
+    idle profiler costs nothing. Samples are not attributed to a request: a
+    session sees every thread, including other requests running at the same
+    time. That is fine for finding what a slow request was stuck on, not for
+    exact per-request accounting.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self._sessions: Dict[int, Counter] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> int:
+        with self._lock:
+            session = self._next_id
+            self._next_id += 1
+            self._sessions[session] = Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sampling-profiler", daemon=True
+                )
+                self._thread.start()
+            return session
+
+    def stop(self, session: int) -> Counter:
+        """Folded stacks and their sample counts seen during the session."""
+        with self._lock:
+            return self._sessions.pop(session, Counter())
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            stacks = [
+                _fold(frame)
+                for thread_id, frame in sys._current_frames().items()  # pylint: disable=protected-access
+                if thread_id != own
+            ]
+            with self._lock:
+                if not self._sessions:
+                    self._thread = None
+                    return
+                for counts in self._sessions.values():
+                    counts.update(stacks)
+
+
+def write_folded(path: str, stacks: Counter) -> None:
+    """Folded stack format, e.g. for flamegraph.pl or speedscope."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
@@ -0,0 +1,79 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from src.adapters.metrics.registry import get_metrics_registry
+
+
+@dataclass
+class RequestMetrics:
+    """Time a request spent waiting on the database and on outbound HTTP."""
+
+    db_statements: int = 0
+    db_seconds: float = 0.0
+    http_calls: int = 0
+    http_seconds: float = 0.0
+    # statement shape -> runs, for the N+1 check of StatementTracer
+    statement_shapes: Counter = field(default_factory=Counter)
+
+
+# Set by MetricsMiddleware for the duration of a request. Sync routes run in
+# the threadpool with a copy of the context, which still holds the same object.
+_current: ContextVar[RequestMetrics | None] = ContextVar(
+    "request_metrics", default=None
+)
+
+_registry = get_metrics_registry()
+DB_STATEMENT_SECONDS = _registry.histogram(
+    "pbapi_db_statement_duration_seconds", "Time to execute one database statement"
+)
+HTTP_REQUEST_SECONDS = _registry.histogram(
+    "pbapi_http_client_duration_seconds", "Time of outbound HTTP calls, per target"
+)
+
+
+def current_request_metrics() -> RequestMetrics | None:
+    return _current.get()
+
+
+@contextmanager
+def track_request() -> Iterator[RequestMetrics]:
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def track_db() -> Iterator[None]:
+    """Wraps one statement, counted against the current request if there is one."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        DB_STATEMENT_SECONDS.observe(elapsed)
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.db_statements += 1
+            metrics.db_seconds += elapsed
+
+
+@contextmanager
+def track_http(target: str) -> Iterator[None]:
+    """Wraps one outbound call; `target` is a host or service name, not a full url."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        HTTP_REQUEST_SECONDS.observe(elapsed, target=target)
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.http_calls += 1
+            metrics.http_seconds += elapsed
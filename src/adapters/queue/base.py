@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+from uuid import UUID
+
+from src.schemas.job import Job
+
+# A running job not finished within this many seconds is handed to another worker
+DEFAULT_VISIBILITY_TIMEOUT = 300.0
+
+ABANDONED_ERROR = "Timed out on its last attempt"
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before a failed job is retried: 5s, 10s, 20s, ..."""
+    return 5.0 * 2 ** max(attempts - 1, 0)
+
+
+class BaseJobQueue(ABC):
+    """
+    At-least-once job queue. A job is claimed by one worker at a time; if the
+    worker dies, the job becomes claimable again after the visibility timeout,
+    or fails if that was its last attempt. Only the worker holding the job can
+    complete or fail it, a worker that overran the timeout finds it taken.
+    """
+
+    @abstractmethod
+    def enqueue(self, kind: str, payload: Dict[str, Any], max_attempts: int = 3) -> Job:
+        pass
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Job | None:
+        """Take the oldest runnable job and mark it running, None if there is none."""
+
+    @abstractmethod
+    def complete(self, job_id: UUID, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Store the result, False if `worker_id` no longer holds the job."""
+
+    @abstractmethod
+    def fail(
+        self, job_id: UUID, worker_id: str, error: str, retry: bool = True
+    ) -> Job | None:
+        """
+        Requeue the job with a backoff, or mark it failed once out of attempts.
+        None if `worker_id` no longer holds the job.
+        """
+
+    @abstractmethod
+    def get(self, job_id: UUID) -> Job | None:
+        pass
@@ -0,0 +1,25 @@
+import os
+
+from src.adapters.queue.base import BaseJobQueue
+
+_job_queue: BaseJobQueue | None = None
+
+
+def get_job_queue() -> BaseJobQueue:
+    """Process-wide job queue, JOB_QUEUE_BACKEND=memory keeps jobs in this process."""
+    global _job_queue  # pylint: disable=global-statement
+    if _job_queue is None:
+        if os.environ.get("JOB_QUEUE_BACKEND", "postgresql") == "memory":
+            from src.adapters.queue.memory import InMemoryJobQueue
+
+            _job_queue = InMemoryJobQueue()
+        else:
+            from src.adapters.queue.postgresql import PostgreSQLJobQueue
+
+            _job_queue = PostgreSQLJobQueue()
+    return _job_queue
+
+
+def set_job_queue(queue: BaseJobQueue | None) -> None:
+    global _job_queue  # pylint: disable=global-statement
+    _job_queue = queue
@@ -0,0 +1,93 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+from uuid import UUID
+
+from src.adapters.queue.base import (
+    ABANDONED_ERROR,
+    BaseJobQueue,
+    DEFAULT_VISIBILITY_TIMEOUT,
+    retry_delay,
+)
+from src.schemas.common import JobStatus
+from src.schemas.job import Job
+
+
+class InMemoryJobQueue(BaseJobQueue):
+    """Single-process queue for tests and local runs."""
+
+    def __init__(self, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT):
+        self.visibility_timeout = visibility_timeout
+        # insertion ordered, so iteration yields the oldest jobs first
+        self._jobs: Dict[UUID, Job] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], max_attempts: int = 3) -> Job:
+        job = Job(kind=kind, payload=payload, max_attempts=max_attempts)
+        with self._lock:
+            self._jobs[job.id] = job
+        return job.model_copy()
+
+    def claim(self, worker_id: str) -> Job | None:
+        now = datetime.now(tz=timezone.utc)
+        stale_before = now - timedelta(seconds=self.visibility_timeout)
+        with self._lock:
+            for job in self._jobs.values():
+                runnable = job.status == JobStatus.QUEUED and job.run_after <= now
+                abandoned = (
+                    job.status == JobStatus.RUNNING and job.started_at < stale_before
+                )
+                if abandoned and job.attempts >= job.max_attempts:
+                    self._finish(job, JobStatus.FAILED, now)
+                    job.error = ABANDONED_ERROR
+                elif runnable or abandoned:
+                    job.status = JobStatus.RUNNING
+                    job.attempts += 1
+                    job.locked_by = worker_id
+                    job.started_at = now
+                    return job.model_copy()
+        return None
+
+    def _held(self, job_id: UUID, worker_id: str) -> Job | None:
+        job = self._jobs.get(job_id)
+        if job is None or job.status != JobStatus.RUNNING:
+            return None
+        return job if job.locked_by == worker_id else None
+
+    @staticmethod
+    def _finish(job: Job, status: JobStatus, now: datetime) -> None:
+        job.status = status
+        job.locked_by = None
+        job.finished_at = now
+
+    def complete(self, job_id: UUID, worker_id: str, result: Dict[str, Any]) -> bool:
+        with self._lock:
+            job = self._held(job_id, worker_id)
+            if job is None:
+                return False
+            self._finish(job, JobStatus.DONE, datetime.now(tz=timezone.utc))
+            job.result = result
+            job.error = None
+            return True
+
+    def fail(
+        self, job_id: UUID, worker_id: str, error: str, retry: bool = True
+    ) -> Job | None:
+        now = datetime.now(tz=timezone.utc)
+        with self._lock:
+            job = self._held(job_id, worker_id)
+            if job is None:
+                return None
+            job.error = error
+            if retry and job.attempts < job.max_attempts:
+                job.status = JobStatus.QUEUED
+                job.locked_by = None
+                job.run_after = now + timedelta(seconds=retry_delay(job.attempts))
+            else:
+                self._finish(job, JobStatus.FAILED, now)
+            return job.model_copy()
+
+    def get(self, job_id: UUID) -> Job | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job else None
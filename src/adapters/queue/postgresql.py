@@ -0,0 +1,154 @@
+from typing import Any, Dict
+from uuid import UUID
+
+from psycopg2.extras import Json, RealDictCursor
+
+from src.adapters.db.pool import PostgreSQLConnectionPool, get_pool
+from src.adapters.queue.base import (
+    ABANDONED_ERROR,
+    BaseJobQueue,
+    DEFAULT_VISIBILITY_TIMEOUT,
+    retry_delay,
+)
+from src.schemas.common import JobStatus, TableName
+from src.schemas.job import Job
+
+JOB_COLUMNS = (
+    "id, kind, payload, status, attempts, max_attempts, result, error, locked_by, "
+    "run_after, started_at, finished_at, created_at"
+)
+
+
+class PostgreSQLJobQueue(BaseJobQueue):
+    """
+    Job table polled with FOR UPDATE SKIP LOCKED: concurrent workers each lock a
+    different row instead of queueing up behind the same one.
+    """
+
+    def __init__(
+        self,
+        pool: PostgreSQLConnectionPool | None = None,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+    ):
+        self.pool = pool or get_pool()
+        self.visibility_timeout = visibility_timeout
+        self.table = TableName.JOB.value
+
+    def _fetch_one(self, sql: str, params: tuple | dict) -> Dict[str, Any] | None:
+        conn = self.pool.getconn()
+        try:
+            # pooled connections are in autocommit mode, every statement is atomic
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchone() if cursor.description else None
+        finally:
+            self.pool.putconn(conn)
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], max_attempts: int = 3) -> Job:
+        job = Job(kind=kind, payload=payload, max_attempts=max_attempts)
+        row = self._fetch_one(
+            f"""
+            INSERT INTO {self.table} (id, kind, payload, status, max_attempts)
+            VALUES (%s, %s, %s, %s, %s)
+            RETURNING {JOB_COLUMNS}
+            """,
+            (str(job.id), kind, Json(payload), job.status.value, max_attempts),
+        )
+        return Job(**row)
+
+    def claim(self, worker_id: str) -> Job | None:
+        # abandoned jobs on their last attempt fail instead of running again
+        row = self._fetch_one(
+            f"""
+            WITH expired AS (
+                UPDATE {self.table}
+                SET status = %(failed)s, error = %(abandoned)s, locked_by = NULL,
+                    finished_at = now(), updated_at = now()
+                WHERE status = %(running)s
+                  AND started_at < now() - %(timeout)s * interval '1 second'
+                  AND attempts >= max_attempts
+            )
+            UPDATE {self.table}
+            SET status = %(running)s, attempts = attempts + 1,
+                locked_by = %(worker_id)s, started_at = now(), updated_at = now()
+            WHERE id = (
+                SELECT id FROM {self.table}
+                WHERE (status = %(queued)s AND run_after <= now())
+                   OR (status = %(running)s
+                       AND started_at < now() - %(timeout)s * interval '1 second'
+                       AND attempts < max_attempts)
+                ORDER BY run_after
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {JOB_COLUMNS}
+            """,
+            {
+                "failed": JobStatus.FAILED.value,
+                "abandoned": ABANDONED_ERROR,
+                "running": JobStatus.RUNNING.value,
+                "queued": JobStatus.QUEUED.value,
+                "worker_id": worker_id,
+                "timeout": self.visibility_timeout,
+            },
+        )
+        return Job(**row) if row else None
+
+    def complete(self, job_id: UUID, worker_id: str, result: Dict[str, Any]) -> bool:
+        row = self._fetch_one(
+            f"""
+            UPDATE {self.table}
+            SET status = %s, result = %s, error = NULL, locked_by = NULL,
+                finished_at = now(), updated_at = now()
+            WHERE id = %s AND locked_by = %s AND status = %s
+            RETURNING id
+            """,
+            (
+                JobStatus.DONE.value,
+                Json(result),
+                str(job_id),
+                worker_id,
+                JobStatus.RUNNING.value,
+            ),
+        )
+        return row is not None
+
+    def fail(
+        self, job_id: UUID, worker_id: str, error: str, retry: bool = True
+    ) -> Job | None:
+        # retry_delay() evaluated in SQL against the row's attempt count
+        row = self._fetch_one(
+            f"""
+            UPDATE {self.table}
+            SET error = %s, locked_by = NULL, updated_at = now(),
+                status = CASE WHEN %s AND attempts < max_attempts
+                              THEN %s ELSE %s END,
+                run_after = CASE WHEN %s AND attempts < max_attempts
+                                 THEN now() + %s * power(2, greatest(attempts - 1, 0))
+                                      * interval '1 second'
+                                 ELSE run_after END,
+                finished_at = CASE WHEN %s AND attempts < max_attempts
+                                   THEN NULL ELSE now() END
+            WHERE id = %s AND locked_by = %s AND status = %s
+            RETURNING {JOB_COLUMNS}
+            """,
+            (
+                error,
+                retry,
+                JobStatus.QUEUED.value,
+                JobStatus.FAILED.value,
+                retry,
+                retry_delay(1),
+                retry,
+                str(job_id),
+                worker_id,
+                JobStatus.RUNNING.value,
+            ),
+        )
+        return Job(**row) if row else None
+
+    def get(self, job_id: UUID) -> Job | None:
+        row = self._fetch_one(
+            f"SELECT {JOB_COLUMNS} FROM {self.table} WHERE id = %s", (str(job_id),)
+        )
+        return Job(**row) if row else None
@@ -0,0 +1,102 @@
+import os
+import socket
+import threading
+from typing import Any, Callable, Dict, List
+
+from src.adapters.queue.base import BaseJobQueue
+from src.schemas.job import Job
+
+JobHandler = Callable[[Dict[str, Any], Any], Dict[str, Any]]
+
+
+class PermanentJobError(Exception):
+    """Raised by a job handler when retrying the job cannot succeed."""
+
+
+class JobWorker:
+    """
+    Runs queued jobs on `concurrency` threads. Each thread polls the queue,
+    sleeping `poll_interval` seconds whenever it finds nothing to do.
+    """
+
+    def __init__(
+        self,
+        queue: BaseJobQueue,
+        handlers: Dict[str, JobHandler],
+        logger,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        worker_id: str | None = None,
+    ):
+        if concurrency < 1:
+            raise ValueError(f"Invalid concurrency: {concurrency}")
+        self.queue = queue
+        self.handlers = handlers
+        self.logger = logger
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def run_once(self, thread_id: str | None = None) -> bool:
+        """Claim and run a single job. Returns False if the queue had nothing runnable."""
+        job = self.queue.claim(thread_id or self.worker_id)
+        if job is None:
+            return False
+        self._run(job)
+        return True
+
+    def _run(self, job: Job) -> None:
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            self.logger.error(f"No handler for job {job.id} of kind {job.kind}")
+            self.queue.fail(
+                job.id, job.locked_by, f"Unknown job kind: {job.kind}", retry=False
+            )
+            return
+
+        try:
+            result = handler(job.payload, self.logger)
+        except PermanentJobError as e:
+            self.logger.warning(f"Job {job.id} failed: {e}")
+            held = self.queue.fail(job.id, job.locked_by, str(e), retry=False)
+        except Exception as e:  # pylint: disable=broad-except
+            self.logger.error(f"Job {job.id} attempt {job.attempts} failed: {e}")
+            held = self.queue.fail(job.id, job.locked_by, str(e))
+        else:
+            held = self.queue.complete(job.id, job.locked_by, result)
+        if not held:
+            # ran past the visibility timeout, the job was reclaimed or failed
+            self.logger.warning(
+                f"Job {job.id} attempt {job.attempts} outlived its claim, "
+                "its outcome was dropped"
+            )
+
+    def _loop(self, thread_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                busy = self.run_once(thread_id)
+            except Exception as e:  # pylint: disable=broad-except
+                # the queue itself is unavailable, back off and keep polling
+                self.logger.error(f"Job queue error: {e}")
+                busy = False
+            if not busy:
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> None:
+        self._stop.clear()
+        for n in range(self.concurrency):
+            thread_id = f"{self.worker_id}/{n}"
+            thread = threading.Thread(
+                target=self._loop, args=(thread_id,), name=f"job-worker-{n}"
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop polling and wait for running jobs to finish."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
@@ -1,20 +1,70 @@
 import asyncio
+from typing import Dict, List, Tuple
 
 from fastapi import FastAPI
 
 
+def _request_body(req) -> bytes:
+    # the raw bytes when the runtime has them, body_text is decoded from them
+    body = getattr(req, "body_binary", None)
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+    text = getattr(req, "body_text", None)
+    return text.encode("utf-8") if isinstance(text, str) else b""
+
+
+class ResponseBuffer:
+    """
+    Collects an ASGI response.
+
+    A body sent in one message, which is what JSON responses are, is kept as
+    the bytes the app produced. Streamed bodies are appended to one bytearray,
+    so collecting n chunks costs O(total size) instead of the O(n * size) of
+    concatenating bytes. Headers stay as the raw pairs until asked for.
+    """
+
+    def __init__(self):
+        self.status = 500
+        self.raw_headers: List[Tuple[bytes, bytes]] = []
+        self.complete = asyncio.Event()
+        self._first: bytes = b""
+        self._buffer: bytearray | None = None
+
+    def start(self, message) -> None:
+        self.status = message["status"]
+        self.raw_headers = list(message.get("headers", []))
+
+    def append(self, message) -> None:
+        chunk = message.get("body", b"")
+        if chunk:
+            if self._buffer is not None:
+                self._buffer += chunk
+            elif self._first:
+                self._buffer = bytearray(self._first)
+                self._buffer += chunk
+            else:
+                self._first = chunk
+        if not message.get("more_body", False):
+            self.complete.set()
+
+    @property
+    def body(self) -> bytes | bytearray:
+        return self._buffer if self._buffer is not None else self._first
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in self.raw_headers
+        }
+
+
 class AppwriteFastAPIAdapter:
     def __init__(self, app: FastAPI):
         self.app = app
 
     async def handle(self, context):
         # Prepare scope for ASGI
-        headers = []
-        for key, value in context.req.headers.items():
-            headers.append(
-                (key.lower().encode("latin-1"), str(value).encode("latin-1"))
-            )
-
         scope = {
             "type": "http",
             "asgi": {"version": "3.0", "spec_version": "2.0"},
@@ -27,52 +77,52 @@ class AppwriteFastAPIAdapter:
                 if hasattr(context.req, "query_string")
                 else b""
             ),
-            "headers": headers,
+            "headers": [
+                (key.lower().encode("latin-1"), str(value).encode("latin-1"))
+                for key, value in context.req.headers.items()
+            ],
             "appwrite_context": context,
         }
 
-        response_body = b""
-        response_status = 200
-        response_headers = {}
+        response = ResponseBuffer()
+        body_sent = False
 
         async def receive():
-            return {
-                "type": "http.request",
-                "body": (
-                    context.req.body_text.encode("utf-8")
-                    if isinstance(context.req.body_text, str)
-                    else (context.req.body_binary or b"")
-                ),
-                "more_body": False,
-            }
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {
+                    "type": "http.request",
+                    "body": _request_body(context.req),
+                    "more_body": False,
+                }
+            # streaming responses listen for the client going away,
+            # which for a function execution is when the response is done
+            await response.complete.wait()
+            return {"type": "http.disconnect"}
 
         async def send(message):
-            nonlocal response_body, response_status, response_headers
             if message["type"] == "http.response.start":
-                response_status = message["status"]
-                for key, value in message.get("headers", []):
-                    response_headers[key.decode("latin-1")] = value.decode("latin-1")
+                response.start(message)
             elif message["type"] == "http.response.body":
-                response_body += message.get("body", b"")
+                response.append(message)
 
-        await self.app(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            response.complete.set()
 
         # Return Appwrite response
-        # Note: context.res.send or context.res.json depending on content type
-        content_type = response_headers.get("content-type", "")
-
-        # Binary or text?
-        if "application/json" in content_type:
-            import json
-
-            try:
-                data = json.loads(response_body.decode("utf-8"))
-                return context.res.json(data, response_status)
-            except:
-                pass
+        if hasattr(context.res, "binary"):
+            # the body is already encoded, JSON included, pass the bytes through
+            # instead of decoding it only for the runtime to encode it again
+            return context.res.binary(
+                bytes(response.body), response.status, response.headers
+            )
 
+        # runtimes without binary() only take text
         return context.res.send(
-            response_body.decode("utf-8"), response_status, response_headers
+            bytes(response.body).decode("utf-8"), response.status, response.headers
         )
 
 
@@ -10,12 +10,27 @@ if base_dir not in sys.path:
     sys.path.append(base_dir)
 
 
-from src.adapters.doppler import load_doppler_secrets
-from src.adapters.rest.fastapi_app import app
-from src.adapters.rest.appwrite_fastapi_adapter import run_fastapi_on_appwrite
+from src.helpers.startup import StartupProfile
 
-load_doppler_secrets()
+# cold start phases, reported through the first execution's log
+startup_profile = StartupProfile.from_env()
+
+with startup_profile.phase("secrets"):
+    from src.adapters.doppler import load_doppler_secrets
+
+    load_doppler_secrets()
+
+with startup_profile.phase("app"):
+    from src.adapters.rest.fastapi_app import app
+    from src.adapters.rest.appwrite_fastapi_adapter import run_fastapi_on_appwrite
+
+startup_profile.finish()
+_startup_reported = False
 
 
 async def main(context):
+    global _startup_reported  # pylint: disable=global-statement
+    if not _startup_reported:
+        _startup_reported = True
+        context.log(startup_profile.report())
     return await run_fastapi_on_appwrite(app, context)
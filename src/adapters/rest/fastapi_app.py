@@ -7,25 +7,57 @@ load_dotenv()
 
 sys.path.insert(0, os.path.dirname(__file__))
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
-from src.adapters.rest.fastapi_routes import HealthRouter, UserRouter, HomeRouter
+from src.adapters.rest.fastapi_routes import (
+    HealthRouter,
+    UserRouter,
+    HomeRouter,
+    ShopRouter,
+    ReceiptRouter,
+    JobRouter,
+    MetricsRouter,
+)
+from src.adapters.metrics.middleware import MetricsMiddleware
+from src.adapters.rest.responses import FastJSONResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    yield
+    # imported here, not at the top, so that starting the app does not load the
+    # database drivers before a request needs them
+    # pylint: disable=import-outside-toplevel
+    from src.adapters.db.pool import close_pool
+    from src.adapters.db.postgresql_async import close_async_pool
+
+    await close_async_pool()
+    close_pool()
+
+
 app = FastAPI(
     title="Plant-Based API",
     description="All things vegan and plant-based API",
     version="0.0.1",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.include_router(HealthRouter)
 app.include_router(UserRouter)
 app.include_router(HomeRouter)
+app.include_router(ShopRouter)
+app.include_router(ReceiptRouter)
+app.include_router(JobRouter)
+app.include_router(MetricsRouter)
 
 # Enable CORS for dashboard
 app.add_middleware(
@@ -35,3 +67,5 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# outermost, so the latency includes every other middleware
+app.add_middleware(MetricsMiddleware)
@@ -1,28 +1,41 @@
-import time
+from http import HTTPStatus
 from typing import Optional
 
 from fastapi import APIRouter, Depends
 from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
+from starlette.responses import Response
 
+from src.adapters.db.base import BaseAsyncDBAdapter
+from src.adapters.metrics.registry import get_metrics_registry
+from src.adapters.queue.factory import get_job_queue
+from src.adapters.rest.responses import FastJSONResponse
 from src.helpers.common import get_logger
-
-from src.handlers.add_barcodes import add_barcodes_handler
-from src.handlers.link_shop import link_shop_handler
-from src.handlers.parse_from_url import parse_from_url_handler
-from src.handlers.shops import shops_handler
-from src.handlers.user_identity import UserIdentityHandler
 from src.schemas.request_schemas import (
     ParseFromUrlRequest,
-    LinkShopRequest,
-    AddBarcodesRequest,
     GetOrCreateUserByIdentityRequest,
 )
-from src.schemas.response_schemas import Health
+from src.schemas.response_schemas import DeepHealth, Health
+
+# Handlers and database drivers are imported inside the routes that use them,
+# so an Appwrite cold start only loads what its one request needs; importing
+# them all added about half of the app's import time.
+# pylint: disable=import-outside-toplevel
 
 HomeRouter = APIRouter(tags=["home"])
 HealthRouter = APIRouter(prefix="/health", tags=["health"])
 UserRouter = APIRouter(prefix="/user", tags=["user"])
+ShopRouter = APIRouter(prefix="/shops", tags=["shops"])
+ReceiptRouter = APIRouter(tags=["receipts"])
+JobRouter = APIRouter(prefix="/jobs", tags=["jobs"])
+MetricsRouter = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+async def get_async_db_session(logger=Depends(get_logger)):
+    """Lease a pooled async DB session for the duration of the request."""
+    from src.adapters.db.postgresql_async import init_async_db_session
+
+    async with init_async_db_session(logger) as session:
+        yield session
 
 
 @HomeRouter.get("/", response_model=Health)
@@ -37,23 +50,146 @@ async def health(request: Request, logger=Depends(get_logger)):
     return Health()
 
 
-@HealthRouter.get("/deep-ping", response_model=Health)
+@HealthRouter.get("/deep-ping", response_model=DeepHealth)
 async def deep_ping(request: Request, logger=Depends(get_logger)):
+    """Latency of each dependency, 503 when a critical one is unusable."""
     logger.info("Deep ping endpoint called")
-    time.sleep(1)
-    return Health()
+    from src.helpers.health import get_health_checker
+
+    result = await get_health_checker().check()
+    status = (
+        HTTPStatus.SERVICE_UNAVAILABLE if result.status == "down" else HTTPStatus.OK
+    )
+    return FastJSONResponse(content=result, status_code=status.value)
+
+
+@HealthRouter.get("/db-pool")
+async def db_pool_stats(request: Request, logger=Depends(get_logger)):
+    logger.info("DB pool stats endpoint called")
+    from src.adapters.db.pool import get_pool
+    from src.adapters.db.postgresql_async import get_async_pool_stats
+    from src.adapters.db.statements import statement_cache
+
+    return {
+        "sync": get_pool().stats(),
+        "async": get_async_pool_stats(),
+        "statements": statement_cache.stats(),
+    }
+
+
+@HealthRouter.get("/db-statements")
+async def db_statement_stats(
+    request: Request, top: int = 10, logger=Depends(get_logger)
+):
+    """Slowest, most frequent and N+1 statements, empty unless PBAPI_SQL_TRACE is set."""
+    logger.info("DB statement stats endpoint called")
+    from src.adapters.db.tracing import get_statement_tracer
+
+    tracer = get_statement_tracer()
+    return tracer.report(top) if tracer is not None else {}
+
+
+@MetricsRouter.get("", include_in_schema=False)
+def metrics():
+    """This process's metrics in the Prometheus text format."""
+    return Response(
+        content=get_metrics_registry().render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
 
 
 @UserRouter.post("/get-or-create-by-identity")
 async def get_or_create_user_by_identity(
-    request: GetOrCreateUserByIdentityRequest, logger=Depends(get_logger)
+    request: GetOrCreateUserByIdentityRequest,
+    logger=Depends(get_logger),
+    session: BaseAsyncDBAdapter = Depends(get_async_db_session),
 ):
+    from src.adapters.db.postgresql_async import EmailInUseError
+    from src.handlers.user_identity import UserIdentityHandler
+
     logger.info(f"User identity: {request.id} for provider: {request.provider}")
-    handler = UserIdentityHandler(logger)
-    user = handler.get_or_create_user_by_identity(
-        request.id, request.provider, request.email, request.name
+    handler = UserIdentityHandler(logger, db=session)
+    try:
+        user = await handler.get_or_create_user_by_identity(
+            request.id, request.provider, request.email, request.name
+        )
+    except EmailInUseError as e:
+        logger.warning(f"Cannot create a user for identity {request.id}: {e}")
+        return FastJSONResponse(
+            content={"msg": str(e)}, status_code=HTTPStatus.CONFLICT.value
+        )
+    # rendered straight from the model, without a jsonable_encoder() pass
+    return FastJSONResponse(content=user)
+
+
+# Shop handlers use the blocking adapter, so these routes run in the threadpool
+@ShopRouter.get("")
+def get_shops(
+    country_code: Optional[str] = None,
+    company_id: Optional[str] = None,
+    lat_min: Optional[float] = None,
+    lat_max: Optional[float] = None,
+    lon_min: Optional[float] = None,
+    lon_max: Optional[float] = None,
+    limit: Optional[int] = 50,
+    offset: Optional[int] = 0,
+    cursor: Optional[str] = None,
+    logger=Depends(get_logger),
+):
+    query_params = {
+        key: value
+        for key, value in {
+            "country_code": country_code,
+            "company_id": company_id,
+            "lat_min": lat_min,
+            "lat_max": lat_max,
+            "lon_min": lon_min,
+            "lon_max": lon_max,
+            "limit": limit,
+            "offset": offset,
+            "cursor": cursor,
+        }.items()
+        if value is not None
+    }
+    from src.handlers.shops import shops_handler
+
+    status, response = shops_handler(query_params, logger)
+    return FastJSONResponse(content=response, status_code=status.value)
+
+
+@ShopRouter.get("/nearest")
+def get_nearest_shops(
+    lat: float,
+    lon: float,
+    radius: float = 1000,
+    limit: int = 10,
+    logger=Depends(get_logger),
+):
+    logger.info(f"Nearest shops to {lat}, {lon} within {radius}m")
+    from src.handlers.shops import nearest_shops_handler
+
+    status, response = nearest_shops_handler(lat, lon, logger, radius, limit)
+    return FastJSONResponse(content=response, status_code=status.value)
+
+
+# Parsing a receipt can take tens of seconds behind the proxy, so the request only
+# queues it; the client polls /jobs/{job_id} and job_worker.py does the work
+@ReceiptRouter.post("/parse-from-url")
+def parse_from_url(request: ParseFromUrlRequest, logger=Depends(get_logger)):
+    from src.handlers.jobs import enqueue_parse_from_url_handler
+
+    status, response = enqueue_parse_from_url_handler(
+        request.url, request.user_id, logger, get_job_queue()
     )
-    return user
+    return FastJSONResponse(content=response, status_code=status.value)
+
+
+@JobRouter.get("/{job_id}")
+def get_job(job_id: str, logger=Depends(get_logger)):
+    from src.handlers.jobs import job_status_handler
+
+    status, response = job_status_handler(job_id, logger, get_job_queue())
+    return FastJSONResponse(content=response, status_code=status.value)
 
 
 # @app.get("/items/{item_id}")
@@ -0,0 +1,37 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not serialize natively, encoded the way jsonable_encoder does."""
+    if isinstance(obj, BaseModel):
+        # goes through model_dump overrides, e.g. User's enum codes
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dump_json(content: Any) -> bytes:
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson.
+    Models, UUIDs, datetimes and enums are serialized directly, so routes can
+    return them without a jsonable_encoder() pass first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
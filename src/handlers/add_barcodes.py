@@ -1,31 +1,64 @@
 import json
+from collections import Counter
 from http import HTTPStatus
-from uuid import UUID
+from uuid import UUID, uuid4
+
+from psycopg2 import DatabaseError
 
 from src.adapters.db.postgresql import init_db_session
-from src.schemas.common import TableName, ItemBarcodeStatus
+from src.helpers.barcode import normalize_barcode, validate_barcodes
+from src.schemas.common import TableName, ItemBarcodeStatus, WriteResult
 from src.schemas.shop_item import ShopItem
 
 
 def add_barcodes_handler(shop_id: str, items: list[dict], logger) -> (HTTPStatus, dict):
-    session = init_db_session(logger)
-    session.use_table(TableName.SHOP_ITEM)
-
     invalid_items = []
-    for item in items:
+    shop_items = []
+    # check digits of the whole submission are computed in one vectorized pass
+    barcodes = [_normalized_barcode(item.get("barcode")) for item in items]
+    barcodes_valid = validate_barcodes(barcodes).valid.tolist()
+    for item, barcode, barcode_valid in zip(items, barcodes, barcodes_valid):
         try:
-            item = ShopItem(
-                id=UUID(item["item_id"]) if item.get("item_id") else None,
-                shop_id=UUID(shop_id),
-                name="_".join(item["purchase_id"].split("_")[:-1]),
-                status=ItemBarcodeStatus(item["status"]),
-                barcode=item.get("barcode"),
-            ).model_dump(mode="json")
-            session.create_or_update_one(item)
+            status = ItemBarcodeStatus(item["status"])
+            if not isinstance(barcode, str):
+                raise ValueError("Barcode must be a string")
+            if status == ItemBarcodeStatus.ADDED and barcode and not barcode_valid:
+                raise ValueError("Invalid barcode")
+            shop_items.append(
+                ShopItem.model_validate(
+                    {
+                        "id": UUID(item["item_id"]) if item.get("item_id") else uuid4(),
+                        "shop_id": UUID(shop_id),
+                        "name": "_".join(item["purchase_id"].split("_")[:-1]),
+                        "status": status,
+                        "barcode": item.get("barcode"),
+                    },
+                    context={"barcode_checked": True},
+                ).model_dump(mode="json")
+            )
         except ValueError as e:
             invalid_items.append({"name": item["name"], "error": str(e)})
             logger.error(f"Failed to add item: {json.dumps(item)}. Error: {e}")
 
+    # all valid items are written in one round trip instead of one per item
+    if shop_items:
+        with init_db_session(logger) as session, session.transaction():
+            session.use_table(TableName.SHOP_ITEM)
+            try:
+                with session.transaction():
+                    outcomes = session.upsert_many(shop_items)
+            except DatabaseError as e:
+                # one bad row fails the whole batch, retry row by row so the
+                # others are still saved, each in its own savepoint
+                logger.error(f"Batch upsert failed, retrying per item. Error: {e}")
+                outcomes = [_upsert_one(session, item, logger) for item in shop_items]
+        logger.info(f"Shop items saved: {dict(Counter(map(str, outcomes)))}")
+        invalid_items.extend(
+            {"name": item["name"], "error": "Failed to save item"}
+            for item, outcome in zip(shop_items, outcomes)
+            if outcome == WriteResult.FAILED
+        )
+
     if invalid_items:
         return HTTPStatus.BAD_REQUEST, {
             "msg": "Failed to add some items",
@@ -34,3 +67,19 @@ def add_barcodes_handler(shop_id: str, items: list[dict], logger) -> (HTTPStatus
     return HTTPStatus.OK, {
         "msg": "Purchases successfully added. You can add another URL"
     }
+
+
+def _normalized_barcode(barcode):
+    """Anything but a string is kept as is, for its item to be reported invalid."""
+    if barcode is None:
+        return ""
+    return normalize_barcode(barcode) if isinstance(barcode, str) else barcode
+
+
+def _upsert_one(session, item: dict, logger) -> WriteResult:
+    try:
+        with session.transaction():
+            return session.upsert_many([item])[0]
+    except DatabaseError as e:
+        logger.error(f"Failed to save item: {json.dumps(item)}. Error: {e}")
+        return WriteResult.FAILED
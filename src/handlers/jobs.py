@@ -0,0 +1,66 @@
+from http import HTTPStatus
+from typing import Any, Dict
+from uuid import UUID
+
+from src.adapters.queue.base import BaseJobQueue
+from src.adapters.queue.worker import JobHandler, PermanentJobError
+from src.handlers.parse_from_url import FETCH_FAILED_MSG, parse_from_url_handler
+
+PARSE_RECEIPT_JOB = "parse_receipt"
+
+
+def run_parse_receipt_job(payload: Dict[str, Any], logger: Any) -> Dict[str, Any]:
+    status, response = parse_from_url_handler(
+        payload["url"], payload["user_id"], logger
+    )
+    if status == HTTPStatus.OK:
+        return response["data"]
+    if response["msg"] == FETCH_FAILED_MSG:
+        # a network or proxy failure, worth another attempt after the backoff
+        raise RuntimeError(response["msg"])
+    if HTTPStatus.BAD_REQUEST <= status < HTTPStatus.INTERNAL_SERVER_ERROR:
+        # bad input or an unparsable receipt, retrying would give the same answer
+        raise PermanentJobError(response["msg"])
+    raise RuntimeError(response["msg"])
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    PARSE_RECEIPT_JOB: run_parse_receipt_job,
+}
+
+
+def enqueue_parse_from_url_handler(
+    url: str, user_id: str, logger: Any, queue: BaseJobQueue
+) -> tuple[HTTPStatus, dict]:
+    if not url:
+        return HTTPStatus.BAD_REQUEST, {"msg": "URL is required"}
+
+    try:
+        UUID(user_id)
+    except ValueError:
+        return HTTPStatus.BAD_REQUEST, {"msg": "Invalid user ID"}
+
+    job = queue.enqueue(PARSE_RECEIPT_JOB, {"url": url, "user_id": user_id})
+    logger.info(f"Queued job {job.id} for {url}")
+    return HTTPStatus.ACCEPTED, {
+        "msg": "Receipt queued for processing",
+        "job_id": str(job.id),
+        "status": job.status.value,
+    }
+
+
+def job_status_handler(
+    job_id: str, logger: Any, queue: BaseJobQueue
+) -> tuple[HTTPStatus, dict]:
+    try:
+        job = queue.get(UUID(job_id))
+    except ValueError:
+        return HTTPStatus.BAD_REQUEST, {"msg": "Invalid job ID"}
+
+    if job is None:
+        logger.info(f"Job {job_id} not found")
+        return HTTPStatus.NOT_FOUND, {"msg": "Job not found"}
+
+    return HTTPStatus.OK, {
+        "data": job.model_dump(mode="json", exclude={"payload"}),
+    }
@@ -1,9 +1,79 @@
 from http import HTTPStatus
 
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from src.helpers.common import get_html
+from pydantic import ValidationError
+
+from src.adapters.cache.html import get_cached_html
+from src.adapters.db.base import BaseDBAdapter
+from src.adapters.db.postgresql import init_db_session
+from src.helpers.common import make_hash
+from src.parsers.sfs_md.receipt_parser import SfsMdReceiptParser
+from src.schemas.common import TableName
+from src.schemas.purchased_item import PurchasedItem
+from src.schemas.receipt import Receipt
+from src.schemas.receipt_url import ReceiptUrl
+
+# sfs.md or the proxy did not answer, the same request may succeed later
+FETCH_FAILED_MSG = "Failed to fetch receipt"
+
+
+def find_stored_receipt(url: str, user_id: UUID, logger: Any) -> Receipt | None:
+    """
+    Look the url up in receipt_url, whose id is make_hash(url), and load its
+    receipt if `user_id` imported it. Another user's receipt is not returned.
+    """
+    with init_db_session(logger) as session:
+        session.use_table(TableName.RECEIPT_URL)
+        receipt_url = session.read_one(make_hash(url))
+        if not receipt_url:
+            return None
+
+        session.use_table(TableName.RECEIPT)
+        receipt = session.read_one(receipt_url["receipt_id"])
+        if not receipt or str(receipt["user_id"]) != str(user_id):
+            return None
+
+        session.use_table(TableName.PURCHASED_ITEM)
+        purchases = session.read_many({"receipt_id": receipt["id"]})
+
+    try:
+        return Receipt(
+            **receipt, purchases=[PurchasedItem(**item) for item in purchases]
+        )
+    except ValidationError as e:
+        logger.warning(f"Stored receipt {receipt['id']} is incomplete: {e}")
+        return None
+
+
+def persist_receipt(session: BaseDBAdapter, receipt: Receipt) -> None:
+    """
+    Store the receipt with its purchases and the receipt_url row for `receipt.receipt_url`
+    in one transaction. A receipt already stored under another url is only linked.
+    """
+    with session.transaction():
+        session.use_table(TableName.RECEIPT)
+        if not session.read_one(receipt.id):
+            session.create_one(receipt.model_dump(mode="json", exclude={"purchases"}))
+            session.use_table(TableName.PURCHASED_ITEM)
+            session.create_many(
+                [
+                    {
+                        **item.model_dump(mode="json"),
+                        "id": str(uuid4()),
+                        "receipt_id": receipt.id,
+                        # placeholder until the item is matched to a shop item
+                        "item_id": str(item.item_id or uuid4()),
+                    }
+                    for item in receipt.purchases
+                ]
+            )
+
+        session.use_table(TableName.RECEIPT_URL)
+        session.create_or_update_one(
+            ReceiptUrl(url=receipt.receipt_url, receipt_id=receipt.id).model_dump()
+        )
 
 
 def parse_from_url_handler(
@@ -17,22 +87,29 @@ def parse_from_url_handler(
     except ValueError:
         return HTTPStatus.BAD_REQUEST, {"msg": "Invalid user ID"}
 
-    receipt = None
-
-    if receipt:
-        logger.info("Receipt found in the db")
-    else:
-        receipt_html = get_html(url, logger)
-        if not receipt_html:
-            return HTTPStatus.BAD_REQUEST, {"msg": "Failed to fetch receipt"}
-
-        try:
-            receipt = parser.parse_html(receipt_html).build_receipt().persist()
-        except ValueError as e:
-            return HTTPStatus.BAD_REQUEST, {"msg": str(e)}
-        except Exception as e:  # pylint: disable=broad-except
-            logger.error(f"Unexpected error parsing receipt: {e}")
-            return HTTPStatus.INTERNAL_SERVER_ERROR, {"msg": "Internal server error"}
+    try:
+        # scanning an already imported receipt must not hit sfs.md or the paid proxy
+        receipt = find_stored_receipt(url, user_id, logger)
+
+        if receipt:
+            logger.info("Receipt found in the db")
+        else:
+            receipt_html = get_cached_html(url, logger)
+            if not receipt_html:
+                return HTTPStatus.BAD_REQUEST, {"msg": FETCH_FAILED_MSG}
+
+            receipt = (
+                SfsMdReceiptParser()
+                .parse_html(receipt_html)
+                .build_receipt(user_id, url)
+            )
+            with init_db_session(logger) as session:
+                persist_receipt(session, receipt)
+    except ValueError as e:
+        return HTTPStatus.BAD_REQUEST, {"msg": str(e)}
+    except Exception as e:  # pylint: disable=broad-except
+        logger.error(f"Unexpected error parsing receipt: {e}")
+        return HTTPStatus.INTERNAL_SERVER_ERROR, {"msg": "Internal server error"}
 
     return HTTPStatus.OK, {
         "msg": "Receipt successfully processed",
@@ -1,9 +1,8 @@
-import os
 from http import HTTPStatus
 from typing import Any
 
-from src.adapters.db.postgresql import PostgreSQLAdapter
-from src.schemas.common import EnvType, TableName
+from src.adapters.db.postgresql import init_db_session
+from src.schemas.common import Operator, TableName
 
 # Chisinau area approximate bounding box
 CHISINAU_LAT_MIN = 46.95
@@ -12,12 +11,6 @@ CHISINAU_LON_MIN = 28.77
 CHISINAU_LON_MAX = 28.90
 
 
-def init_postgres_session(logger):
-    """Initialize PostgreSQL database session."""
-    env_name = os.environ.get("ENV_NAME", "local")
-    return PostgreSQLAdapter(EnvType(env_name), logger)
-
-
 def shops_handler(query_params: dict[str, Any], logger) -> tuple[HTTPStatus, dict]:
     """
     Get shops with optional filtering by query parameters.
@@ -28,10 +21,9 @@ def shops_handler(query_params: dict[str, Any], logger) -> tuple[HTTPStatus, dic
     - lat_min, lat_max, lon_min, lon_max: bounding box for location (optional)
     - limit: max number of results (default 50)
     - offset: pagination offset (default 0)
+    - cursor: id of the last shop of the previous page, replaces offset
+      for deep pagination (returned as `next_cursor`)
     """
-    session = init_postgres_session(logger)
-    session.use_table(TableName.SHOP)
-
     # Build where clause from query params
     where = {}
 
@@ -44,12 +36,12 @@ def shops_handler(query_params: dict[str, Any], logger) -> tuple[HTTPStatus, dic
     # Get limit and offset
     try:
         limit = int(query_params.get("limit", 50))
-        limit = min(limit, 100)  # Cap at 100
+        limit = max(1, min(limit, 100))  # Between 1 and 100
     except (ValueError, TypeError):
         limit = 50
 
     try:
-        offset = int(query_params.get("offset", 0))
+        offset = max(0, int(query_params.get("offset", 0)))
     except (ValueError, TypeError):
         offset = 0
 
@@ -58,10 +50,7 @@ def shops_handler(query_params: dict[str, Any], logger) -> tuple[HTTPStatus, dic
         key in query_params for key in ["lat_min", "lat_max", "lon_min", "lon_max"]
     )
 
-    # Read shops from database
-    shops = session.read_many(where if where else None, limit=limit + offset)
-
-    # Apply location filter only if explicitly requested
+    # The bounding box is evaluated by the database on the indexed lat/lon columns
     if has_location_filter:
         try:
             lat_min = float(query_params.get("lat_min", CHISINAU_LAT_MIN))
@@ -72,26 +61,64 @@ def shops_handler(query_params: dict[str, Any], logger) -> tuple[HTTPStatus, dic
             lat_min, lat_max = CHISINAU_LAT_MIN, CHISINAU_LAT_MAX
             lon_min, lon_max = CHISINAU_LON_MIN, CHISINAU_LON_MAX
 
-        filtered_shops = []
-        for shop in shops:
-            osm_data = shop.get("osm_data", {})
-            if osm_data:
-                try:
-                    lat = float(osm_data.get("lat", 0))
-                    lon = float(osm_data.get("lon", 0))
-                    if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max:
-                        filtered_shops.append(shop)
-                except (ValueError, TypeError):
-                    continue
-        shops = filtered_shops
-
-    # Apply offset and limit
-    total = len(shops)
-    result_shops = shops[offset : offset + limit]
+        where["lat"] = {Operator.GE: lat_min, Operator.LE: lat_max}
+        where["lon"] = {Operator.GE: lon_min, Operator.LE: lon_max}
+
+    page_where = dict(where)
+    cursor = query_params.get("cursor")
+    if cursor:
+        # shop ids are integers, anything else would fail in the database
+        try:
+            cursor = int(cursor)
+        except (ValueError, TypeError):
+            return HTTPStatus.BAD_REQUEST, {"error": "Invalid cursor"}
+        # keyset pagination: continue after the last seen id instead of skipping rows
+        page_where["id"] = {Operator.GT: cursor}
+        offset = 0
+
+    with init_db_session(logger) as session:
+        session.use_table(TableName.SHOP)
+        total = session.count(where)
+        shops = session.read_many(page_where, limit=limit, order_by="id", offset=offset)
 
     return HTTPStatus.OK, {
-        "items": result_shops,
+        "items": shops,
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": shops[-1]["id"] if len(shops) == limit else None,
     }
+
+
+DEFAULT_NEAREST_RADIUS_M = 1000
+MAX_NEAREST_RADIUS_M = 50000
+DEFAULT_NEAREST_LIMIT = 10
+MAX_NEAREST_LIMIT = 100
+
+
+def nearest_shops_handler(
+    lat: float,
+    lon: float,
+    logger,
+    radius: float = DEFAULT_NEAREST_RADIUS_M,
+    limit: int = DEFAULT_NEAREST_LIMIT,
+) -> tuple[HTTPStatus, dict]:
+    """
+    Get the shops closest to a point, nearest first.
+
+    - lat, lon: the point to search around
+    - radius: search radius in meters (default 1000, capped at 50000)
+    - limit: max number of results (default 10, capped at 100)
+    """
+    if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+        return HTTPStatus.BAD_REQUEST, {"error": "Invalid coordinates"}
+    if radius <= 0 or limit <= 0:
+        return HTTPStatus.BAD_REQUEST, {"error": "radius and limit must be positive"}
+
+    radius = min(radius, MAX_NEAREST_RADIUS_M)
+    limit = min(limit, MAX_NEAREST_LIMIT)
+
+    with init_db_session(logger) as session:
+        shops = session.nearest_shops(lat, lon, radius, limit)
+
+    return HTTPStatus.OK, {"items": shops, "radius": radius, "limit": limit}
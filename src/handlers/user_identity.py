@@ -1,20 +1,26 @@
 from typing import Optional
-from uuid import UUID
 
 from pydantic import EmailStr
 
-from src.adapters.db.postgresql import PostgreSQLAdapter, init_db_session
+from src.adapters.cache.identity import IdentityCache, get_identity_cache
+from src.adapters.db.postgresql_async import AsyncPostgreSQLAdapter
 from src.schemas.common import TableName
 from src.schemas.user import User
-from src.schemas.user_identity import UserIdentity, IdentityProvider
+from src.schemas.user_identity import UserIdentity
 
 
 class UserIdentityHandler:
-    def __init__(self, logger):
+    def __init__(
+        self,
+        logger,
+        db: AsyncPostgreSQLAdapter,
+        cache: IdentityCache | None = None,
+    ):
         self.logger = logger
-        self.db: PostgreSQLAdapter = init_db_session(self.logger)
+        self.db = db
+        self.cache = cache or get_identity_cache()
 
-    def find(self, identity_id: str, provider: str) -> Optional[UserIdentity]:
+    async def find(self, identity_id: str, provider: str) -> Optional[UserIdentity]:
         """
         Find a UserIdentity by its id and provider.
         """
@@ -23,7 +29,7 @@ class UserIdentityHandler:
         )
 
         self.db.use_table(TableName.USER_IDENTITY)
-        data = self.db.read_one(identity_id)
+        data = await self.db.read_one(identity_id)
 
         if not data:
             return None
@@ -37,7 +43,7 @@ class UserIdentityHandler:
 
         return UserIdentity(**data)
 
-    def create(self, identity: UserIdentity) -> str:
+    async def create(self, identity: UserIdentity) -> str:
         """
         Create a new UserIdentity.
         """
@@ -47,9 +53,9 @@ class UserIdentityHandler:
 
         self.db.use_table(TableName.USER_IDENTITY)
         data = identity.model_dump(mode="json")
-        return self.db.create_one(data)
+        return await self.db.create_one(data)
 
-    def update(self, identity: UserIdentity) -> bool:
+    async def update(self, identity: UserIdentity) -> bool:
         """
         Update an existing UserIdentity.
         """
@@ -58,40 +64,36 @@ class UserIdentityHandler:
         self.db.use_table(TableName.USER_IDENTITY)
         data = identity.model_dump(mode="json")
         identity_id = data.pop("id")
-        return self.db.update_one(identity_id, data)
-
-    def get_or_create_user_by_identity(
+        previous = await self.db.read_one(identity_id)
+        updated = await self.db.update_one(identity_id, data)
+
+        await self.cache.invalidate(identity.provider, identity_id)
+        if previous:
+            # the cache may still hold the identity under its old provider or user
+            await self.cache.invalidate(previous["provider"], identity_id)
+            if str(previous["user_id"]) != str(identity.user_id):
+                await self.cache.invalidate_user(previous["user_id"])
+        return updated
+
+    async def get_or_create_user_by_identity(
         self, _id: str, provider: str, email: EmailStr, name: str
     ) -> User:
         """
         Get or create a user by their identity.
+        Known identities are served from the cache, a miss finds or creates
+        the user and the identity in a single atomic statement.
         """
-        identity = self.find(_id, provider)
-
-        if identity:
-            self.logger.info(f"Found existing identity for user: {identity.user_id}")
-            self.db.use_table(TableName.USER)
-            user_data = self.db.read_one(str(identity.user_id))
-            if user_data:
-                return User(**user_data)
-            else:
-                self.logger.error(
-                    f"User {identity.user_id} not found for identity {_id}"
-                )
-                # This should not happen if DB integrity is maintained
-                raise ValueError(f"User {identity.user_id} not found")
-
-        # Identity not found, create user and then identity
-        self.logger.info(f"Identity not found. Creating new user for {email}")
-        self.db.use_table(TableName.USER)
-        new_user = User(email=email, name=name)
-        user_id = self.db.create_one(new_user.model_dump(mode="json"))
-        new_user.id = UUID(user_id)
-
-        self.logger.info(f"Creating new identity for user: {user_id}")
-        new_identity = UserIdentity(
-            id=_id, provider=IdentityProvider(provider), user_id=UUID(user_id)
-        )
-        self.create(new_identity)
+        user = await self.cache.get(provider, _id)
+        if user:
+            return user
 
-        return new_user
+        # Unknown to the cache: find or create user and identity in one statement
+        user, created = await self.db.get_or_create_user_by_identity(
+            _id, provider, User(email=email, name=name).model_dump(mode="json")
+        )
+        if created:
+            self.logger.info(f"Created new user {user.id} for {email}")
+        else:
+            self.logger.info(f"Found existing identity for user: {user.id}")
+        await self.cache.set(provider, _id, user)
+        return user
@@ -0,0 +1,100 @@
+from typing import Collection, List, NamedTuple, Sequence
+
+import numpy as np
+
+GTIN_LENGTHS = frozenset({8, 12, 13, 14})
+GTIN14_LENGTH = 14
+UPC_E_LENGTH = 8
+
+# GTIN weights run 3, 1, 3, ... from the digit next to the check digit. Codes are
+# left-padded with zeros to 14 digits, which keeps every weight in place, so one
+# weight vector serves GTIN-8, 12, 13 and 14 alike.
+GTIN14_WEIGHTS = np.array([3, 1] * 6 + [3], dtype=np.int32)
+
+_INVALID = "0" * GTIN14_LENGTH
+
+
+class BarcodeBatch(NamedTuple):
+    # validity of each input barcode, in input order
+    valid: np.ndarray
+    # the GTIN-14 form of each valid barcode, None for invalid ones
+    gtin14: List[str | None]
+
+
+def expand_upc_e(code: str) -> str | None:
+    """Expand an 8 digit UPC-E code to the 12 digit UPC-A it stands for."""
+    if len(code) != UPC_E_LENGTH or code[0] not in "01":
+        return None
+    system, d, check = code[0], code[1:7], code[7]
+    last = d[5]
+    if last in "012":
+        body = f"{d[0:2]}{last}0000{d[2:5]}"
+    elif last == "3":
+        body = f"{d[0:3]}00000{d[3:5]}"
+    elif last == "4":
+        body = f"{d[0:4]}00000{d[4]}"
+    else:
+        body = f"{d[0:5]}0000{last}"
+    return f"{system}{body}{check}"
+
+
+def _to_digits(codes: Sequence[str]) -> np.ndarray:
+    """(n, 14) array of the digits of `codes`, which must be 14 ASCII digits each."""
+    if not codes:
+        return np.empty((0, GTIN14_LENGTH), dtype=np.int32)
+    raw = np.frombuffer("".join(codes).encode("ascii"), dtype=np.uint8)
+    return raw.reshape(len(codes), GTIN14_LENGTH).astype(np.int32) - ord("0")
+
+
+def check_digits(bodies: Sequence[str]) -> np.ndarray:
+    """Check digits for barcodes given without theirs, up to 13 digits each."""
+    padded = [body.zfill(GTIN14_LENGTH - 1) + "0" for body in bodies]
+    digits = _to_digits(padded)
+    return (10 - (digits[:, :-1] @ GTIN14_WEIGHTS) % 10) % 10
+
+
+def validate_barcodes(
+    barcodes: Sequence[str],
+    lengths: Collection[int] = GTIN_LENGTHS,
+    upc_e: bool = False,
+) -> BarcodeBatch:
+    """
+    Check digits of a batch of barcodes in one pass.
+    With `upc_e`, 8 digit codes are read as UPC-E and checked as their UPC-A expansion.
+    """
+    padded = []
+    well_formed = np.zeros(len(barcodes), dtype=bool)
+    for i, code in enumerate(barcodes):
+        if not (isinstance(code, str) and code.isascii() and code.isdigit()):
+            padded.append(_INVALID)
+            continue
+        if upc_e and len(code) == UPC_E_LENGTH:
+            code = expand_upc_e(code)
+        elif len(code) not in lengths:
+            code = None
+        if code is None or len(code) > GTIN14_LENGTH:
+            padded.append(_INVALID)
+            continue
+        padded.append(code.zfill(GTIN14_LENGTH))
+        well_formed[i] = True
+
+    digits = _to_digits(padded)
+    checks = (10 - (digits[:, :-1] @ GTIN14_WEIGHTS) % 10) % 10
+    valid = well_formed & (checks == digits[:, -1])
+    return BarcodeBatch(
+        valid=valid,
+        gtin14=[code if ok else None for code, ok in zip(padded, valid.tolist())],
+    )
+
+
+def normalize_barcode(barcode: str) -> str:
+    """Drop the spaces users type or scanners add around digit groups."""
+    return barcode.strip().replace(" ", "")
+
+
+def validate_barcode(barcode: str) -> bool:
+    return bool(validate_barcodes([barcode]).valid[0])
+
+
+def to_gtin14(barcode: str) -> str | None:
+    return validate_barcodes([barcode]).gtin14[0]
@@ -3,7 +3,6 @@ import logging
 import os
 from itertools import groupby
 
-import requests
 from starlette.requests import Request
 
 
@@ -37,57 +36,13 @@ def get_html(url: str, logger) -> str | None:
             with open(stub_path, "r", encoding="utf-8") as f:
                 return f.read()
 
-    try:
-        resp = requests.get(
-            url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)",
-                "Accept-Language": "ro-MD,ro;q=0.9,en-US;q=0.8,en;q=0.7,ru;q=0.6",
-            },
-            timeout=5,
-        )
-
-        if resp.status_code == 200:
-            return resp.text
-        logger.warning("GET %s response_code=%s", url, resp.status_code)
-    except requests.RequestException as e:
-        logger.warning("GET %s failed: %s", url, e)
-
-    try:
-        api_user = os.environ.get("OXYLABS_API_USER")
-        api_pass = os.environ.get("OXYLABS_API_PASS")
-
-        if not (api_user and api_pass):
-            logger.warning("missing OXYLABS_API_USER and OXYLABS_API_PASS")
-            return None
-
-        resp = requests.request(
-            "POST",
-            "https://realtime.oxylabs.io/v1/queries",
-            auth=(api_user, api_pass),
-            json={"source": "universal", "url": url},
-            timeout=60,
-        )
-
-        if resp.status_code == 200:
-            return resp.json()["results"][0]["content"]
-        logger.warning("oxylabs %s response_code=%s", url, resp.status_code)
-    except (requests.RequestException, ValueError, KeyError, IndexError) as e:
-        logger.warning("oxylabs %s failed: %s", url, e)
-
-    return None
-
-
-def validate_barcode(barcode: str) -> bool:
-    if not barcode.isdigit() or len(barcode) not in (8, 12, 13, 14):
-        return False
-
-    total = 0
-    for i, num in enumerate(barcode[:-1]):
-        multiplier = (i + 1) % 2 if len(barcode) == 14 else i % 2
-        total += int(num) * (1 + (2 * multiplier))
+    # httpx is only loaded by the code paths that fetch pages
+    from src.adapters.http.fetcher import (  # pylint: disable=import-outside-toplevel
+        fetch_html,
+    )
 
-    return str((10 - (total % 10)) % 10) == barcode[-1]
+    # pooled, hedged fetch: direct first, Oxylabs proxy once the direct call runs slow
+    return fetch_html(url, logger)
 
 
 def is_localhost() -> bool:
@@ -0,0 +1,114 @@
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = 111320.0
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_MAX_PRECISION = 12
+
+
+def encode_geohash(
+    lat: float, lon: float, precision: int = GEOHASH_MAX_PRECISION
+) -> str:
+    """Encode a coordinate as a geohash string of `precision` characters."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash interleaves bits starting with longitude
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if lon >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """Height and width of a geohash cell in degrees: (lat_degrees, lon_degrees)."""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def decode_geohash(geohash: str) -> Tuple[float, float]:
+    """Decode a geohash to the (lat, lon) of its cell center."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            target = lon_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            target[0 if bit else 1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def geohash_neighbors(geohash: str) -> List[str]:
+    """The cell itself plus its 8 surrounding cells of the same precision."""
+    lat, lon = decode_geohash(geohash)
+    lat_step, lon_step = geohash_cell_size(len(geohash))
+    cells = []
+    for d_lat in (-1, 0, 1):
+        for d_lon in (-1, 0, 1):
+            n_lat = lat + d_lat * lat_step
+            if not -90 <= n_lat <= 90:
+                continue
+            # wrap around the antimeridian
+            n_lon = (lon + d_lon * lon_step + 180) % 360 - 180
+            cell = encode_geohash(n_lat, n_lon, len(geohash))
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def geohash_precision_for_radius(radius_m: float, lat: float) -> int:
+    """
+    Longest geohash precision whose cells are at least `radius_m` across at `lat`,
+    so a cell and its neighbors always cover a circle of that radius.
+    """
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    for precision in range(GEOHASH_MAX_PRECISION, 0, -1):
+        lat_deg, lon_deg = geohash_cell_size(precision)
+        height_m = lat_deg * METERS_PER_DEGREE
+        width_m = lon_deg * METERS_PER_DEGREE * cos_lat
+        if min(height_m, width_m) >= radius_m:
+            return precision
+    return 1
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in meters."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
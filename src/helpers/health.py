@@ -0,0 +1,145 @@
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, NamedTuple
+
+from src.schemas.response_schemas import DeepHealth, DependencyHealth
+
+# Seconds each dependency gets before it counts as failed
+DEFAULT_TIMEOUT = 2.0
+# Seconds a result is served from memory, so probe storms cost nothing
+DEFAULT_TTL = 5.0
+
+RECEIPT_SOURCE_URL = "https://mev.sfs.md/"
+
+
+class Probe(NamedTuple):
+    name: str
+    # raises if the dependency is unusable
+    check: Callable[[float], Awaitable[None]]
+    critical: bool
+
+
+class HealthChecker:
+    """
+    Runs all probes concurrently, each under its own timeout, and caches the
+    aggregated result for `ttl` seconds. Callers arriving while a check runs
+    wait for that check instead of starting another one.
+    """
+
+    def __init__(
+        self,
+        probes: List[Probe],
+        timeout: float = DEFAULT_TIMEOUT,
+        ttl: float = DEFAULT_TTL,
+    ):
+        self.probes = probes
+        self.timeout = timeout
+        self.ttl = ttl
+        self._result: DeepHealth | None = None
+        self._expires = 0.0
+        self._running: asyncio.Future | None = None
+
+    async def check(self) -> DeepHealth:
+        if self._result is not None and time.monotonic() < self._expires:
+            return self._result
+        if self._running is None:
+            self._running = asyncio.ensure_future(self._check_all())
+        # a caller that goes away must not cancel the check the others wait for
+        return await asyncio.shield(self._running)
+
+    async def _check_all(self) -> DeepHealth:
+        try:
+            results = await asyncio.gather(*(self._run(probe) for probe in self.probes))
+            checks = dict(zip((probe.name for probe in self.probes), results))
+            if any(check.critical and not check.ok for check in checks.values()):
+                status = "down"
+            elif all(check.ok for check in checks.values()):
+                status = "ok"
+            else:
+                status = "degraded"
+            self._result = DeepHealth(
+                status=status,
+                checked_at=datetime.now(timezone.utc),
+                checks=checks,
+            )
+            self._expires = time.monotonic() + self.ttl
+            return self._result
+        finally:
+            self._running = None
+
+    async def _run(self, probe: Probe) -> DependencyHealth:
+        started = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(probe.check(self.timeout), self.timeout)
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.timeout}s"
+        except Exception as e:  # pylint: disable=broad-except
+            error = f"{type(e).__name__}: {e}"
+        return DependencyHealth(
+            ok=error is None,
+            latency_ms=round((time.perf_counter() - started) * 1000, 2),
+            critical=probe.critical,
+            error=error,
+        )
+
+
+# pylint: disable=import-outside-toplevel
+async def check_postgres(timeout: float) -> None:
+    """Check out a pooled connection and run a trivial query on it."""
+    from src.adapters.db.postgresql_async import get_async_pool
+
+    pool = await get_async_pool()
+    async with pool.connection(timeout=timeout) as connection:
+        await connection.execute("SELECT 1")
+
+
+async def _check_reachable(url: str, timeout: float) -> None:
+    from src.adapters.http.fetcher import head_async
+
+    status = await head_async(url, timeout)
+    if status >= 500:
+        raise RuntimeError(f"{url} answered {status}")
+
+
+async def check_receipt_source(timeout: float) -> None:
+    await _check_reachable(RECEIPT_SOURCE_URL, timeout)
+
+
+async def check_osm(timeout: float) -> None:
+    from src.helpers.osm import NOMINATIM_STATUS_URL
+
+    await _check_reachable(NOMINATIM_STATUS_URL, timeout)
+
+
+# pylint: enable=import-outside-toplevel
+
+
+_checker: HealthChecker | None = None
+_checker_lock = threading.Lock()
+
+
+def get_health_checker() -> HealthChecker:
+    """
+    Process-wide checker. Only the database is critical: the receipt source and
+    OSM being unreachable degrades some features but should not take the
+    instance out of the load balancer.
+    """
+    global _checker  # pylint: disable=global-statement
+    with _checker_lock:
+        if _checker is None:
+            _checker = HealthChecker(
+                [
+                    Probe("postgres", check_postgres, critical=True),
+                    Probe("receipt_source", check_receipt_source, critical=False),
+                    Probe("osm", check_osm, critical=False),
+                ],
+                timeout=float(
+                    os.environ.get("HEALTH_CHECK_TIMEOUT", str(DEFAULT_TIMEOUT))
+                ),
+                ttl=float(os.environ.get("HEALTH_CHECK_TTL", str(DEFAULT_TTL))),
+            )
+        return _checker
@@ -5,6 +5,7 @@ from typing import Tuple
 import requests
 
 OSM_HOST = "https://www.openstreetmap.org"
+NOMINATIM_STATUS_URL = "https://nominatim.openstreetmap.org/status"
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import Loader, MetaPathFinder
+from typing import Dict, Iterator, List, Self, Tuple
+
+
+class _TimedLoader(Loader):
+    def __init__(self, loader: Loader, name: str, timer: "ImportTimer"):
+        self.loader = loader
+        self.name = name
+        self.timer = timer
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        started = time.perf_counter()
+        children_before = self.timer.children_time
+        self.timer.children_time = 0.0
+        try:
+            self.loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - started
+            # self time excludes the modules this one imported
+            self.timer.times[self.name] = (
+                elapsed - self.timer.children_time,
+                elapsed,
+            )
+            self.timer.children_time = children_before + elapsed
+
+    def __getattr__(self, name):
+        # get_resource_reader(), is_package() and the like
+        return getattr(self.loader, name)
+
+
+class ImportTimer(MetaPathFinder):
+    """
+    Times the execution of every module imported while installed, like
+    `python -X importtime` but readable from inside the process.
+    """
+
+    def __init__(self):
+        self.times: Dict[str, Tuple[float, float]] = {}
+        self.children_time = 0.0
+        self._finding = set()
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(fullname)
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, fullname, self)
+        return spec
+
+    def install(self) -> None:
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def slowest(self, top: int = 20) -> List[Tuple[str, float, float]]:
+        """(module, self seconds, cumulative seconds), slowest by self time first."""
+        ranked = sorted(self.times.items(), key=lambda item: item[1][0], reverse=True)
+        return [(name, own, total) for name, (own, total) in ranked[:top]]
+
+
+class StartupProfile:
+    """
+    Wall time of the startup phases, with per-module import times when
+    `imports` is on. Phases that raise are still recorded.
+    """
+
+    def __init__(self, imports: bool = False):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.import_timer = ImportTimer() if imports else None
+        if self.import_timer:
+            self.import_timer.install()
+
+    @classmethod
+    def from_env(cls) -> Self:
+        """PBAPI_STARTUP_PROFILE=1 adds the per-module import times."""
+        return cls(imports=os.environ.get("PBAPI_STARTUP_PROFILE", "") == "1")
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def finish(self) -> None:
+        self.phases["total"] = time.perf_counter() - self.started
+        if self.import_timer:
+            self.import_timer.uninstall()
+
+    def report(self, top: int = 20) -> str:
+        lines = [
+            "startup: "
+            + ", ".join(
+                f"{name} {seconds * 1000:.1f} ms"
+                for name, seconds in self.phases.items()
+            )
+        ]
+        if self.import_timer:
+            lines.append(
+                f"slowest of {len(self.import_timer.times)} imports (self / cumulative):"
+            )
+            lines.extend(
+                f"  {own * 1000:7.1f} ms {total * 1000:8.1f} ms  {name}"
+                for name, own, total in self.import_timer.slowest(top)
+            )
+        return "\n".join(lines)
@@ -0,0 +1,324 @@
+import codecs
+import re
+from collections import deque
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Deque, Iterable, Iterator, List, Self
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from src.schemas.common import QuantityUnit
+from src.schemas.purchased_item import PurchasedItem
+from src.schemas.sfs_md.receipt import SfsMdReceipt
+
+# Tags whose start or end closes the current line of receipt text
+BLOCK_TAGS = frozenset(
+    {
+        "br",
+        "div",
+        "p",
+        "tr",
+        "li",
+        "ul",
+        "ol",
+        "table",
+        "section",
+        "article",
+        "header",
+        "footer",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "hr",
+    }
+)
+# Table cells are kept on one line, separated by a space
+CELL_TAGS = frozenset({"td", "th"})
+# Text inside these never belongs to the receipt
+SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "title"})
+
+RECEIPT_TIMEZONE = ZoneInfo("Europe/Chisinau")
+
+NUMBER = r"\d+(?:[.,]\d+)?"
+COMPANY_ID_RE = re.compile(r"COD\s*FISCAL\s*:?\s*(\d+)", re.IGNORECASE)
+CASH_REGISTER_RE = re.compile(
+    r"NUM[AĂ]RUL\s+DE\s+[IÎ]NREGISTRARE\s*:?\s*(\S+)", re.IGNORECASE
+)
+# "1.000 x 15.90", "0.456 kg x 89.90 = 40.99 A", optionally preceded by the item name
+QUANTITY_RE = re.compile(
+    rf"^(?:(?P<name>.+?)\s+)?(?P<quantity>{NUMBER})\s*"
+    rf"(?P<unit>kg|g|l|ml|m|cm|buc|pcs)?\.?\s*[xX×*]\s*(?P<price>{NUMBER})"
+    rf"(?:\s*=?\s*(?P<amount>{NUMBER})\s*[A-Z]?)?$",
+    re.IGNORECASE,
+)
+# the amount of the previous item on a line of its own, e.g. "= 15.90 A"
+AMOUNT_RE = re.compile(rf"^=?\s*-?{NUMBER}\s*[A-Z]?$")
+TOTAL_RE = re.compile(rf"^TOTAL\s*(?:LEI|MDL)?\s*:?\s*({NUMBER})$", re.IGNORECASE)
+DATE_RE = re.compile(
+    r"(\d{2})[./-](\d{2})[./-](\d{4})\D{1,12}?(\d{2}):(\d{2})(?::(\d{2}))?"
+)
+KEY_RE = re.compile(
+    r"BON\s+FISCAL\s*(?:NR\.?|N[º°o]\.?|#)?\s*:?\s*(\d+)", re.IGNORECASE
+)
+
+UNITS = {
+    "kg": QuantityUnit.KILOGRAM,
+    "g": QuantityUnit.GRAM,
+    "l": QuantityUnit.LITER,
+    "ml": QuantityUnit.MILLILITER,
+    "m": QuantityUnit.METER,
+    "cm": QuantityUnit.CENTIMETER,
+    "buc": QuantityUnit.PIECE,
+    "pcs": QuantityUnit.PIECE,
+}
+
+HEADER, ITEMS, FOOTER = "header", "items", "footer"
+# Address lines kept between "COD FISCAL" and "NUMARUL DE INREGISTRARE"
+MAX_ADDRESS_LINES = 4
+
+
+def _to_float(value: str) -> float:
+    return float(value.replace(",", "."))
+
+
+class _ReceiptLines(HTMLParser):
+    """
+    Turns receipt markup into text lines, each one available as soon as it is
+    closed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self._parts: List[str] = []
+        self._skip_depth = 0
+        self._pre_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "pre":
+            self.end_line()
+            self._pre_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.end_line()
+        elif tag in CELL_TAGS:
+            self._parts.append(" ")
+
+    def handle_startendtag(self, tag, attrs):
+        # void elements like <br/> have no content to skip
+        if tag not in SKIP_TAGS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == "pre":
+            self.end_line()
+            self._pre_depth = max(self._pre_depth - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self.end_line()
+        elif tag in CELL_TAGS:
+            self._parts.append(" ")
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if not self._pre_depth:
+            self._parts.append(data)
+            return
+        # preformatted receipts keep one receipt line per text line
+        first, *rest = data.split("\n")
+        self._parts.append(first)
+        for part in rest:
+            self.end_line()
+            self._parts.append(part)
+
+    def end_line(self) -> None:
+        line = " ".join("".join(self._parts).split())
+        self._parts = []
+        if line:
+            self.lines.append(line)
+
+
+class SfsMdReceiptParser:
+    """
+    Incremental parser for the receipt pages of mev.sfs.md.
+
+    Markup is fed in chunks of any size, as str or bytes, and each feed() returns
+    the purchases completed by that chunk, so they can be stored while the rest
+    of the page is still downloading. Memory use is bounded by the longest line,
+    not by the page size.
+
+    The page is read as lines of text: the header up to "NUMARUL DE INREGISTRARE"
+    names the company and the shop, item lines follow until "TOTAL", and the
+    footer carries the date and the fiscal receipt number.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        self._lines = _ReceiptLines()
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._section = HEADER
+        # only the last few lines before "COD FISCAL" can be the company and address
+        self._before_company_id: Deque[str] = deque(maxlen=2)
+        self._after_company_id: List[str] = []
+        self._pending_name: str | None = None
+
+        self.company_name: str | None = None
+        self.company_id: str | None = None
+        self.shop_address: str | None = None
+        self.cash_register_id: str | None = None
+        self.key: int | None = None
+        self.date: datetime | None = None
+        self.total_amount: float | None = None
+        self.purchases: List[PurchasedItem] = []
+
+    def feed(self, chunk: str | bytes) -> List[PurchasedItem]:
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        self._lines.feed(chunk)
+        return self._consume_lines()
+
+    def close(self) -> List[PurchasedItem]:
+        tail = self._decoder.decode(b"", final=True)
+        if tail:
+            self._lines.feed(tail)
+        self._lines.close()
+        self._lines.end_line()
+        return self._consume_lines()
+
+    def parse_html(self, html: str | bytes) -> Self:
+        self.feed(html)
+        self.close()
+        return self
+
+    def parse_chunks(self, chunks: Iterable[str | bytes]) -> Iterator[PurchasedItem]:
+        """Feed every chunk and yield the purchases as they are recognized."""
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+    def build_receipt(self, user_id: UUID | str, receipt_url: str) -> SfsMdReceipt:
+        fields = {
+            "company_name": self.company_name,
+            "company_id": self.company_id,
+            "shop_address": self.shop_address,
+            "cash_register_id": self.cash_register_id,
+            "key": self.key,
+            "date": self.date,
+            "total_amount": self.total_amount,
+        }
+        missing = [name for name, value in fields.items() if value is None]
+        if missing:
+            raise ValueError(f"Receipt is missing {', '.join(missing)}")
+        if not self.purchases:
+            raise ValueError("Receipt has no purchases")
+
+        return SfsMdReceipt(
+            user_id=user_id,
+            purchases=self.purchases,
+            receipt_url=receipt_url,
+            **fields,
+        )
+
+    def _consume_lines(self) -> List[PurchasedItem]:
+        items = []
+        for line in self._lines.lines:
+            item = self._parse_line(line)
+            if item is not None:
+                items.append(item)
+        self._lines.lines.clear()
+        self.purchases.extend(items)
+        return items
+
+    def _parse_line(self, line: str) -> PurchasedItem | None:
+        if self.date is None and (match := DATE_RE.search(line)):
+            day, month, year, hour, minute, second = match.groups()
+            self.date = datetime(
+                int(year),
+                int(month),
+                int(day),
+                int(hour),
+                int(minute),
+                int(second or 0),
+                tzinfo=RECEIPT_TIMEZONE,
+            )
+        if self.key is None and (match := KEY_RE.search(line)):
+            self.key = int(match.group(1))
+
+        if self._section == HEADER:
+            self._parse_header_line(line)
+        elif self._section == ITEMS:
+            return self._parse_item_line(line)
+        return None
+
+    def _parse_header_line(self, line: str) -> None:
+        if self.company_id is None:
+            match = COMPANY_ID_RE.search(line)
+            if not match:
+                self._before_company_id.append(line)
+                return
+            self.company_id = match.group(1)
+            prefix = line[: match.start()].strip()
+            if prefix:
+                self._before_company_id.append(prefix)
+            return
+
+        match = CASH_REGISTER_RE.search(line)
+        if not match:
+            # a page without the register line would otherwise keep every line
+            if len(self._after_company_id) < MAX_ADDRESS_LINES:
+                self._after_company_id.append(line)
+            return
+
+        self.cash_register_id = match.group(1)
+        # either "name, address, COD FISCAL" or "name, COD FISCAL, address"
+        before = list(self._before_company_id)
+        if self._after_company_id:
+            self.company_name = before[-1] if before else None
+            self.shop_address = " ".join(self._after_company_id)
+        elif len(before) == 2:
+            self.company_name, self.shop_address = before
+        self._section = ITEMS
+
+    def _parse_item_line(self, line: str) -> PurchasedItem | None:
+        if match := TOTAL_RE.match(line):
+            self.total_amount = _to_float(match.group(1))
+            self._pending_name = None
+            self._section = FOOTER
+            return None
+
+        if match := QUANTITY_RE.match(line):
+            name = match.group("name") or self._pending_name
+            self._pending_name = None
+            if not name:
+                return None
+
+            quantity = _to_float(match.group("quantity"))
+            unit = match.group("unit")
+            if unit:
+                quantity_unit = UNITS[unit.lower()]
+            else:
+                # weighed goods are printed with a fractional quantity
+                quantity_unit = (
+                    QuantityUnit.PIECE
+                    if quantity.is_integer()
+                    else QuantityUnit.KILOGRAM
+                )
+            amount = match.group("amount")
+            # price is what was paid for the whole line
+            price = (
+                _to_float(amount)
+                if amount
+                else round(quantity * _to_float(match.group("price")), 2)
+            )
+            return PurchasedItem(
+                name=name, quantity=quantity, quantity_unit=quantity_unit, price=price
+            )
+
+        if not AMOUNT_RE.match(line):
+            self._pending_name = line
+        return None
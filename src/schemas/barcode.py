@@ -3,6 +3,7 @@
 from enum import Enum
 from pydantic import field_validator
 
+from src.helpers.barcode import check_digits, validate_barcodes
 from src.schemas.schema_base import SchemaBase
 
 
@@ -15,22 +16,13 @@ class BarcodeType(Enum):
 
 def generate_checkdigit(code: int) -> int:
     """Generate check digit for a barcode."""
-    digits = [int(d) for d in str(code)]
-    for i in range(0, len(digits), 2):
-        digits[i] *= 3
-    checkdigit = (10 - (sum(digits) % 10)) % 10
-    return checkdigit
+    return int(check_digits([str(code)])[0])
 
 
 def validate_upc(code) -> bool:
     """Validate a UPC/EAN barcode check digit."""
     digits = str(code)
-    try:
-        check_digit = int(digits[-1])
-        calculated = generate_checkdigit(int(digits[:-1]))
-        return check_digit == calculated
-    except (ValueError, IndexError):
-        return False
+    return bool(validate_barcodes([digits], lengths=range(2, 15)).valid[0])
 
 
 class Barcode(SchemaBase):
@@ -60,7 +52,13 @@ class Barcode(SchemaBase):
                 f"code must be {self.type.value} digits long, got {len(str(self.code))}"
             )
         # Validate check digit
-        if not validate_upc(self.code):
+        digits = str(self.code)
+        if self.type == BarcodeType.UPC_E:
+            # a 7 digit UPC-E is the 8 digit one with its 0 number system dropped
+            valid = validate_barcodes(["0" + digits], upc_e=True).valid[0]
+        else:
+            valid = validate_upc(digits)
+        if not valid:
             raise ValueError("invalid barcode")
 
     def __repr__(self):
@@ -18,6 +18,7 @@ class TableName(StrEnum):
     USER = "user"
     USER_IDENTITY = "user_identity"
     USER_SESSION = "user_session"
+    JOB = "job"
 
 
 class TablePartitionKey(StrEnum):
@@ -72,6 +73,23 @@ class ItemBarcodeStatus(StrEnum):
     ADDED = "added"  # barcode is added by the user
 
 
+class WriteResult(StrEnum):
+    CREATED = "created"  # row did not exist and was inserted
+    UPDATED = "updated"  # row existed and was overwritten
+    FAILED = "failed"  # row was rejected by the database and skipped
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"  # waiting for a worker, possibly until run_after for a retry
+    RUNNING = "running"  # claimed by a worker
+    DONE = "done"
+    FAILED = "failed"  # gave up after max_attempts or a permanent error
+
+
 class Operator(Enum):
     EQ = "eq"
     NE = "ne"
+    GT = "gt"
+    GE = "ge"
+    LT = "lt"
+    LE = "le"
@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+from typing import Any, Dict
+from uuid import UUID, uuid4
+
+from pydantic import Field
+
+from src.schemas.common import JobStatus
+from src.schemas.schema_base import SchemaBase
+
+
+class Job(SchemaBase):
+    id: UUID = Field(default_factory=uuid4)
+    kind: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    max_attempts: int = 3
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+    # the worker that claimed the job while it runs
+    locked_by: str | None = None
+    run_after: datetime = Field(default_factory=lambda: datetime.now(tz=timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(tz=timezone.utc))
@@ -1,5 +1,23 @@
+from datetime import datetime
+from typing import Dict
+
 from pydantic import BaseModel
 
 
 class Health(BaseModel):
     message: str = "Plant-Based API is healthy"
+
+
+class DependencyHealth(BaseModel):
+    ok: bool
+    latency_ms: float
+    # a failing critical dependency makes the whole service unhealthy
+    critical: bool
+    error: str | None = None
+
+
+class DeepHealth(Health):
+    # "ok", "degraded" (a non-critical dependency failed) or "down"
+    status: str
+    checked_at: datetime
+    checks: Dict[str, DependencyHealth]
@@ -14,3 +14,10 @@ class Shop(SchemaBase):
     company_id: str
     shop_address: str
     osm_data: OsmData
+    # numeric copies of the OSM coordinates, indexed for map viewport queries
+    lat: float | None = None
+    lon: float | None = None
+
+    def model_post_init(self, __context) -> None:
+        self.lat = float(self.osm_data.lat)
+        self.lon = float(self.osm_data.lon)
@@ -3,7 +3,7 @@ from uuid import UUID, uuid4
 
 from pydantic import Field
 
-from src.helpers.common import validate_barcode
+from src.helpers.barcode import normalize_barcode, validate_barcode
 from src.schemas.common import ItemBarcodeStatus
 from src.schemas.schema_base import SchemaBase
 
@@ -22,6 +22,10 @@ class ShopItem(SchemaBase):
             if not self.barcode:
                 raise ValueError("Barcode must be provided for added items")
 
-            self.barcode = self.barcode.strip().replace(" ", "")
+            self.barcode = normalize_barcode(self.barcode)
+            # batch imports check all barcodes at once with validate_barcodes()
+            # and pass {"barcode_checked": True} as the validation context
+            if __context and __context.get("barcode_checked"):
+                return
             if not validate_barcode(self.barcode):
                 raise ValueError("Invalid barcode")
@@ -0,0 +1,223 @@
+import logging
+import os
+import uuid
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.adapters.db.postgresql import init_db_session
+from src.adapters.db.statements import statement_cache
+from src.adapters.db.tracing import StatementTracer
+from src.schemas.common import TableName, WriteResult
+from src.schemas.user import User
+
+logger = logging.getLogger("test")
+
+
+class TestPostgreSQLAdapter(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("ENV_NAME", "test")
+        os.environ.setdefault("POSTGRES_HOST", "localhost")
+        os.environ.setdefault("POSTGRES_PORT", "5433")
+        os.environ.setdefault("POSTGRES_DB", "pbapi_test")
+        os.environ.setdefault("POSTGRES_USER", "postgres")
+        os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+
+    def setUp(self):
+        self.session = init_db_session(logger)
+
+    def tearDown(self):
+        self.session.close()
+
+    @staticmethod
+    def _shop_items(count: int, shop_id: str) -> list[dict]:
+        return [
+            {
+                "id": str(uuid.uuid4()),
+                "shop_id": shop_id,
+                "name": f"item {i}",
+                "status": "pending",
+            }
+            for i in range(count)
+        ]
+
+    def _check_upsert_many(self):
+        shop_id = str(uuid.uuid4())
+        self.session.use_table(TableName.SHOP_ITEM)
+        items = self._shop_items(3, shop_id)
+        self.session.create_one(dict(items[0]))
+
+        items[0]["name"] = "renamed"
+        outcomes = self.session.upsert_many(items)
+
+        self.assertEqual(
+            outcomes, [WriteResult.UPDATED, WriteResult.CREATED, WriteResult.CREATED]
+        )
+        self.assertEqual(self.session.read_one(items[0]["id"])["name"], "renamed")
+        self.assertEqual(len(self.session.read_many({"shop_id": shop_id})), 3)
+
+    def test_upsert_many_multi_row_insert(self):
+        self._check_upsert_many()
+
+    def test_upsert_many_copy(self):
+        with patch("src.adapters.db.postgresql.BULK_COPY_THRESHOLD", 1):
+            self._check_upsert_many()
+
+    def test_create_many_copy_with_data_column(self):
+        self.session.use_table(TableName.USER)
+        users = [
+            {
+                "email": f"bulk-{uuid.uuid4()}@example.com",
+                "name": "Bulk\tUser",
+                "creation_time": int(datetime.now().timestamp()),
+                "login_generation": 1,
+                "banned": False,
+                "locale": "ro",
+            }
+            for _ in range(2)
+        ]
+        with patch("src.adapters.db.postgresql.BULK_COPY_THRESHOLD", 1):
+            ids = self.session.create_many(users)
+
+        user = self.session.read_one(ids[1])
+        self.assertEqual(user["name"], "Bulk\tUser")
+        self.assertEqual(user["locale"], "ro")
+
+    def test_transaction_commits_once_and_savepoints_roll_back(self):
+        shop_id = str(uuid.uuid4())
+        self.session.use_table(TableName.SHOP_ITEM)
+        kept, dropped = self._shop_items(2, shop_id)
+
+        with self.session.transaction():
+            self.session.create_one(kept)
+            with self.assertRaises(RuntimeError):
+                with self.session.transaction():
+                    self.session.create_one(dropped)
+                    raise RuntimeError("item failed")
+
+        self.assertIsNotNone(self.session.read_one(kept["id"]))
+        self.assertIsNone(self.session.read_one(dropped["id"]))
+
+    def test_transaction_rolls_back_on_error(self):
+        self.session.use_table(TableName.SHOP_ITEM)
+        (item,) = self._shop_items(1, str(uuid.uuid4()))
+
+        with self.assertRaises(RuntimeError):
+            with self.session.transaction():
+                self.session.create_one(item)
+                raise RuntimeError("request failed")
+
+        self.assertFalse(self.session.in_transaction)
+        self.assertIsNone(self.session.read_one(item["id"]))
+
+    def test_iter_many_named_cursor(self):
+        shop_id = str(uuid.uuid4())
+        self.session.use_table(TableName.SHOP_ITEM)
+        self.session.create_many(self._shop_items(5, shop_id))
+
+        in_use = self.session.pool.stats()["in_use"]
+        rows = self.session.iter_many(
+            {"shop_id": shop_id}, batch_size=2, order_by="-name"
+        )
+        self.assertEqual(next(rows)["name"], "item 4")
+        # the cursor runs in a transaction on the session's own connection
+        self.assertTrue(self.session.in_transaction)
+        self.assertEqual(self.session.pool.stats()["in_use"], in_use)
+        self.assertEqual(
+            [row["name"] for row in rows], [f"item {i}" for i in (3, 2, 1, 0)]
+        )
+        self.assertFalse(self.session.in_transaction)
+
+        rows = self.session.iter_many({"shop_id": shop_id}, batch_size=2)
+        next(rows)
+        self.session.create_many(self._shop_items(1, shop_id))
+        rows.close()
+        # closing early commits the writes made while iterating
+        self.assertFalse(self.session.in_transaction)
+        self.assertEqual(self.session.count({"shop_id": shop_id}), 6)
+
+    def test_iter_many_inside_transaction(self):
+        shop_id = str(uuid.uuid4())
+        self.session.use_table(TableName.SHOP_ITEM)
+        with self.session.transaction():
+            self.session.create_many(self._shop_items(3, shop_id))
+            # the cursor sees the transaction's own uncommitted rows
+            rows = list(self.session.iter_many({"shop_id": shop_id}, batch_size=2))
+            self.assertEqual(len(rows), 3)
+            self.assertTrue(self.session.in_transaction)
+
+    def test_iter_many_keyset(self):
+        shop_id = str(uuid.uuid4())
+        self.session.use_table(TableName.SHOP_ITEM)
+        items = self._shop_items(5, shop_id)
+        self.session.create_many(items)
+
+        with patch.object(
+            self.session, "read_many", wraps=self.session.read_many
+        ) as read_many:
+            rows = list(
+                self.session.iter_many(
+                    {"shop_id": shop_id}, batch_size=2, server_cursor=False
+                )
+            )
+        self.assertEqual(
+            [str(row["id"]) for row in rows], sorted(item["id"] for item in items)
+        )
+        self.assertEqual(read_many.call_count, 3)
+
+        with self.assertRaises(ValueError):
+            self.session.iter_many(order_by="name", server_cursor=False)
+
+    def test_prepared_statements_are_capped_per_connection(self):
+        self.session.use_table(TableName.SHOP_ITEM)
+        prepared = self.session.connection.prepared_statements
+        with self.session.connection.cursor() as cursor:
+            cursor.execute("DEALLOCATE ALL")
+        prepared.clear()
+        prepares = statement_cache.stats()["prepares"]
+        with patch("src.adapters.db.postgresql.MAX_PREPARED_PER_CONNECTION", 2):
+            for where in (
+                {"name": "a"},
+                {"status": "pending"},
+                {"shop_id": str(uuid.uuid4())},
+            ):
+                self.session.read_many(where)
+                # the newest shape is always prepared, the oldest makes room
+                self.assertLessEqual(len(prepared), 2)
+
+            with self.session.connection.cursor() as cursor:
+                cursor.execute("SELECT name FROM pg_prepared_statements")
+                on_server = {row[0] for row in cursor.fetchall()}
+        self.assertEqual(on_server, set(prepared))
+        self.assertEqual(statement_cache.stats()["prepares"] - prepares, 3)
+
+    def test_read_models(self):
+        self.session.use_table(TableName.USER)
+        user = User(email=f"typed-{uuid.uuid4()}@example.com", name="Typed")
+        self.session.create_one(user.model_dump(mode="json") | {"locale": "ro"})
+
+        read = self.session.read_one_model(User, str(user.id))
+        self.assertIsInstance(read, User)
+        self.assertEqual(read.model_dump(), user.model_dump())
+        # fields the model does not declare stay behind in the data column
+        self.assertEqual(self.session.read_one(str(user.id))["locale"], "ro")
+        self.assertIsNone(self.session.read_one_model(User, str(uuid.uuid4())))
+
+        users = self.session.read_many_models(User, {"email": user.email})
+        self.assertEqual([u.id for u in users], [user.id])
+
+    def test_tracer_explains_slow_reads(self):
+        tracer = StatementTracer(explain_ms=0)
+        self.session.use_tracer(tracer).use_table(TableName.SHOP_ITEM)
+        shop_id = str(uuid.uuid4())
+        self.session.create_many(self._shop_items(2, shop_id))
+        self.session.read_many({"shop_id": shop_id})
+
+        (read,) = [s for s in tracer.most_frequent(10) if s.operation == "SELECT"]
+        self.assertEqual((read.table, read.rows), ("shop_item", 2))
+        self.assertIn("actual time", read.plan)
+        # bulk writes run in a transaction and are not explained
+        (write,) = [s for s in tracer.most_frequent(10) if s.operation == "INSERT"]
+        self.assertEqual(write.rows, 2)
+        self.assertIsNone(write.plan)
@@ -1,8 +1,13 @@
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from unittest import TestCase
 
 from src.adapters.db.sqlite import SQLiteDBAdapter
-from src.schemas.common import EnvType
+from src.adapters.db.sqlite_engine import SQLiteEngine
+from src.adapters.db.tracing import StatementTracer
+from src.schemas.common import Operator, TableName, WriteResult
 from src.schemas.product import Product
 from src.tests.integration import TEST_SQLITE_DB_PATH
 
@@ -10,10 +15,11 @@ from src.tests.integration import TEST_SQLITE_DB_PATH
 class TestSQLiteDBAdapter(TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.adapter = SQLiteDBAdapter(EnvType.TEST, None, TEST_SQLITE_DB_PATH)
+        cls.adapter = SQLiteDBAdapter(None, TEST_SQLITE_DB_PATH)
         cls.adapter.table = "products"
 
     def setUp(self):
+        self.adapter.use_table("products")
         self.adapter.drop_table("products")
         self.adapter.cursor.execute("""
             CREATE TABLE products (
@@ -83,3 +89,214 @@ class TestSQLiteDBAdapter(TestCase):
         self.adapter.create_one(product.model_dump())
         self.assertTrue(self.adapter.delete_one(product_id))
         self.assertIsNone(self.adapter.read_one(product_id))
+
+    def test_create_many(self):
+        products = [
+            Product(
+                id=f"test-_id-many-{i}",
+                name=f"product {i}",
+                created_at=datetime.now(),
+                created_by="admin",
+            ).model_dump()
+            for i in range(3)
+        ]
+        ids = self.adapter.create_many(products)
+        self.assertEqual(ids, [f"test-_id-many-{i}" for i in range(3)])
+        self.assertEqual(len(self.adapter.read_many()), 3)
+
+    def test_upsert_many(self):
+        existing = Product(
+            id="test-_id-upsert-0",
+            name="old name",
+            created_at=datetime.now(),
+            created_by="admin",
+        )
+        self.adapter.create_one(existing.model_dump())
+
+        products = [
+            Product(
+                id=f"test-_id-upsert-{i}",
+                name=f"new name {i}",
+                created_at=datetime.now(),
+                created_by="admin",
+            ).model_dump()
+            for i in range(2)
+        ]
+        outcomes = self.adapter.upsert_many(products)
+        self.assertEqual(outcomes, [WriteResult.UPDATED, WriteResult.CREATED])
+        self.assertEqual(
+            self.adapter.read_one("test-_id-upsert-0")["name"], "new name 0"
+        )
+        self.assertEqual(len(self.adapter.read_many()), 2)
+
+    def test_read_many_with_range_order_and_offset(self):
+        self.adapter.create_many(
+            [
+                Product(
+                    id=f"test-_id-range-{i}",
+                    name=f"product {i}",
+                    created_at=datetime.now(),
+                    created_by="admin",
+                ).model_dump()
+                for i in range(5)
+            ]
+        )
+        where = {"name": {Operator.GE: "product 1", Operator.LT: "product 4"}}
+
+        self.assertEqual(self.adapter.count(where), 3)
+        rows = self.adapter.read_many(where, limit=2, order_by="-name", offset=1)
+        self.assertEqual([r["name"] for r in rows], ["product 2", "product 1"])
+
+    def test_transaction_with_savepoint(self):
+        def product(i):
+            return Product(
+                id=f"test-_id-tx-{i}",
+                name=f"product {i}",
+                created_at=datetime.now(),
+                created_by="admin",
+            ).model_dump()
+
+        with self.adapter.transaction():
+            self.adapter.create_one(product(0))
+            with self.assertRaises(RuntimeError):
+                with self.adapter.transaction():
+                    self.adapter.create_one(product(1))
+                    raise RuntimeError("item failed")
+            # nothing is committed until the outer block ends
+            self.assertTrue(self.adapter.conn.in_transaction)
+
+        self.assertIsNotNone(self.adapter.read_one("test-_id-tx-0"))
+        self.assertIsNone(self.adapter.read_one("test-_id-tx-1"))
+
+    def test_nearest_shops(self):
+        self.adapter.drop_table(TableName.SHOP)
+        self.adapter.cursor.execute(
+            "CREATE TABLE shop "
+            "(_id TEXT PRIMARY KEY, name TEXT, lat REAL, lon REAL, geohash TEXT)"
+        )
+        self.adapter.use_table(TableName.SHOP)
+        self.adapter.create_many(
+            [
+                {"id": "center", "name": "center", "lat": 47.0245, "lon": 28.8323},
+                {"id": "near", "name": "near", "lat": 47.0270, "lon": 28.8323},
+                {"id": "far", "name": "far", "lat": 47.0600, "lon": 28.8323},
+                {"id": "no-coords", "name": "no coords"},
+            ]
+        )
+
+        shops = self.adapter.nearest_shops(47.0246, 28.8323, radius=1000, limit=10)
+
+        self.assertEqual([s["_id"] for s in shops], ["center", "near"])
+        self.assertLess(shops[0]["distance"], shops[1]["distance"])
+        self.assertEqual(len(self.adapter.nearest_shops(47.0246, 28.8323, 1000, 1)), 1)
+
+    def test_wal_mode(self):
+        journal_mode = self.adapter.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(
+            self.adapter.conn.execute("PRAGMA synchronous").fetchone()[0], 1
+        )
+
+    def test_threads_share_adapter(self):
+        stop = threading.Event()
+
+        def write(n):
+            for i in range(50):
+                self.adapter.create_one({"id": f"w{n}-{i}", "name": f"product {i}"})
+
+        def read(_):
+            counts = []
+            while not stop.is_set():
+                counts.append(self.adapter.count())
+            return counts
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            readers = [executor.submit(read, n) for n in range(3)]
+            list(executor.map(write, range(3)))
+            stop.set()
+            counts = [future.result() for future in readers]
+
+        self.assertEqual(self.adapter.count(), 150)
+        # every reader saw a growing table, never a torn write
+        for seen in counts:
+            self.assertEqual(seen, sorted(seen))
+
+    def test_transaction_is_per_thread(self):
+        in_other_thread = []
+        with self.adapter.transaction():
+            self.adapter.create_one({"id": "tx-own", "name": "own"})
+            thread = threading.Thread(
+                target=lambda: in_other_thread.append(
+                    (self.adapter.in_transaction, self.adapter.read_one("tx-own"))
+                )
+            )
+            thread.start()
+            thread.join()
+
+        # the other thread is outside the block and cannot see uncommitted rows
+        self.assertEqual(in_other_thread, [(False, None)])
+        self.assertIsNotNone(self.adapter.read_one("tx-own"))
+
+    def test_transaction_takes_write_lock(self):
+        other = SQLiteEngine(TEST_SQLITE_DB_PATH, busy_timeout=0)
+        self.addCleanup(other.close_all)
+        with self.adapter.transaction():
+            # no write yet, the lock is already held
+            with self.assertRaisesRegex(sqlite3.OperationalError, "locked"):
+                other.connection().execute("BEGIN IMMEDIATE")
+        other.connection().execute("BEGIN IMMEDIATE")
+        other.connection().execute("ROLLBACK")
+
+    def test_iter_many(self):
+        self.adapter.create_many(
+            [{"id": f"iter-{i}", "name": f"product {i % 2}"} for i in range(5)]
+        )
+        rows = self.adapter.iter_many({"name": "product 0"}, batch_size=2)
+        self.assertEqual([row["_id"] for row in rows], ["iter-0", "iter-2", "iter-4"])
+
+        rows = self.adapter.iter_many(batch_size=2, order_by="-_id")
+        self.assertEqual([row["_id"] for row in rows][:2], ["iter-4", "iter-3"])
+
+    def test_tracer_records_statements_and_plans(self):
+        tracer = StatementTracer(explain_ms=0)
+        adapter = SQLiteDBAdapter(None, TEST_SQLITE_DB_PATH).use_tracer(tracer)
+        adapter.use_table("products")
+        adapter.create_many([{"_id": f"p{i}", "name": f"p{i}"} for i in range(3)])
+        adapter.read_one("p1")
+        adapter.read_one("p2")
+
+        stats = {stats.shape: stats for stats in tracer.most_frequent(10)}
+        read = stats["SELECT * FROM products WHERE _id=?"]
+        self.assertEqual((read.calls, read.rows), (2, 2))
+        self.assertIn("products", read.plan)
+        insert = stats["INSERT OR IGNORE INTO products (_id, name) VALUES (...)"]
+        self.assertEqual(insert.rows, 3)
+
+
+class TestSQLiteInMemory(TestCase):
+    def test_memory_adapters_are_independent(self):
+        first = SQLiteDBAdapter(None, ":memory:").use_table("products")
+        second = SQLiteDBAdapter(None, ":memory:").use_table("products")
+        for adapter in (first, second):
+            adapter.conn.execute(
+                "CREATE TABLE products (_id TEXT PRIMARY KEY, name TEXT)"
+            )
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+
+        first.create_one({"id": "only-first", "name": "first"})
+
+        self.assertIsNotNone(first.read_one("only-first"))
+        self.assertIsNone(second.read_one("only-first"))
+        self.assertEqual(second.count(), 0)
+
+    def test_memory_adapter_same_database_across_threads(self):
+        adapter = SQLiteDBAdapter(None, ":memory:").use_table("products")
+        adapter.conn.execute("CREATE TABLE products (_id TEXT PRIMARY KEY, name TEXT)")
+        self.addCleanup(adapter.close)
+        adapter.create_one({"id": "shared", "name": "shared"})
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            found = executor.submit(adapter.read_one, "shared").result()
+
+        self.assertIsNotNone(found)
@@ -0,0 +1,103 @@
+import json
+import logging
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from src.adapters.http.fetcher import AsyncFetcher, DIRECT_PATH, PROXY_PATH
+
+logger = logging.getLogger("test")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Plays both the receipt host and the Oxylabs endpoint."""
+
+    flaky_failures = {}
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def _reply(self, status: int, body: str, content_type="text/html"):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if self.path.startswith("/slow"):
+            time.sleep(1)
+            return self._reply(200, "<html>direct</html>")
+        if self.path.startswith("/flaky"):
+            with self.lock:
+                failures = self.flaky_failures.get(self.path, 0)
+                self.flaky_failures[self.path] = failures + 1
+            if failures < 2:
+                return self._reply(503, "busy")
+        if self.path.startswith("/missing"):
+            return self._reply(404, "not found")
+        return self._reply(200, "<html>direct</html>")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        length = int(self.headers["Content-Length"])
+        url = json.loads(self.rfile.read(length))["url"]
+        body = json.dumps({"results": [{"content": f"<html>proxy {url}</html>"}]})
+        self._reply(200, body, "application/json")
+
+
+class TestAsyncFetcher(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncSetUp(self):
+        self.fetcher = AsyncFetcher(
+            backoff=0.01,
+            hedge_delay=0.1,
+            proxy_endpoint=f"{self.base_url}/v1/queries",
+        )
+        env = {"OXYLABS_API_USER": "user", "OXYLABS_API_PASS": "pass"}
+        self.env = patch.dict(os.environ, env)
+        self.env.start()
+
+    async def asyncTearDown(self):
+        self.env.stop()
+        await self.fetcher.aclose()
+
+    async def test_direct_response_reuses_connection(self):
+        for _ in range(3):
+            html = await self.fetcher.get_html(f"{self.base_url}/receipt", logger)
+            self.assertEqual(html, "<html>direct</html>")
+
+        stats = self.fetcher.stats()
+        self.assertEqual(stats[DIRECT_PATH]["count"], 3)
+        self.assertNotIn(PROXY_PATH, stats)
+
+    async def test_slow_direct_is_hedged_with_proxy(self):
+        started = time.monotonic()
+        html = await self.fetcher.get_html(f"{self.base_url}/slow", logger)
+
+        self.assertTrue(html.startswith("<html>proxy"))
+        self.assertLess(time.monotonic() - started, 0.9)
+
+    async def test_retryable_status_is_retried(self):
+        html = await self.fetcher.fetch_direct(f"{self.base_url}/flaky-1", logger)
+        self.assertEqual(html, "<html>direct</html>")
+        self.assertEqual(self.fetcher.stats()[DIRECT_PATH]["errors"], 2)
+
+    async def test_client_error_falls_back_to_proxy_without_retry(self):
+        html = await self.fetcher.get_html(f"{self.base_url}/missing", logger)
+        self.assertTrue(html.startswith("<html>proxy"))
+        self.assertEqual(self.fetcher.stats()[DIRECT_PATH]["errors"], 1)
@@ -0,0 +1,118 @@
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from src.adapters.db.pool import get_pool
+from src.adapters.queue.base import ABANDONED_ERROR
+from src.adapters.queue.postgresql import PostgreSQLJobQueue
+from src.schemas.common import JobStatus
+
+logger = logging.getLogger("test")
+
+
+class TestPostgreSQLJobQueue(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("ENV_NAME", "test")
+        os.environ.setdefault("POSTGRES_HOST", "localhost")
+        os.environ.setdefault("POSTGRES_PORT", "5433")
+        os.environ.setdefault("POSTGRES_DB", "pbapi_test")
+        os.environ.setdefault("POSTGRES_USER", "postgres")
+        os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+
+    def setUp(self):
+        # a kind of its own keeps the test away from jobs left by other runs
+        self.kind = f"test-{uuid.uuid4()}"
+        self.queue = PostgreSQLJobQueue(get_pool())
+
+    def tearDown(self):
+        conn = get_pool().getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM job WHERE kind = %s", (self.kind,))
+        finally:
+            get_pool().putconn(conn)
+
+    def _claim_own(self, worker_id: str, queue: PostgreSQLJobQueue | None = None):
+        """Claim until a job of this test's kind comes up, releasing foreign ones."""
+        queue = queue or self.queue
+        job = queue.claim(worker_id)
+        while job is not None and job.kind != self.kind:
+            queue.fail(job.id, worker_id, "claimed by test", retry=False)
+            job = queue.claim(worker_id)
+        return job
+
+    def test_enqueue_claim_complete(self):
+        job = self.queue.enqueue(self.kind, {"url": "https://example.com"})
+        self.assertEqual(job.status, JobStatus.QUEUED)
+
+        claimed = self._claim_own("w1")
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertEqual(claimed.payload, {"url": "https://example.com"})
+
+        self.assertTrue(self.queue.complete(job.id, "w1", {"receipt_id": "r1"}))
+        done = self.queue.get(job.id)
+        self.assertEqual(done.status, JobStatus.DONE)
+        self.assertEqual(done.result, {"receipt_id": "r1"})
+        self.assertIsNotNone(done.finished_at)
+
+    def test_fail_requeues_until_max_attempts(self):
+        job = self.queue.enqueue(self.kind, {}, max_attempts=1)
+        self._claim_own("w1")
+
+        failed = self.queue.fail(job.id, "w1", "boom")
+        self.assertEqual(failed.status, JobStatus.FAILED)
+
+        job = self.queue.enqueue(self.kind, {}, max_attempts=2)
+        self._claim_own("w1")
+        retried = self.queue.fail(job.id, "w1", "boom")
+        self.assertEqual(retried.status, JobStatus.QUEUED)
+        self.assertGreater(retried.run_after, retried.created_at)
+
+    def test_concurrent_claims_never_share_a_job(self):
+        jobs = {self.queue.enqueue(self.kind, {"n": n}).id for n in range(20)}
+
+        def claim_all(worker_id):
+            claimed = []
+            while (job := self._claim_own(worker_id)) is not None:
+                claimed.append(job.id)
+            return claimed
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(claim_all, [f"w{n}" for n in range(4)]))
+
+        claimed = [job_id for result in results for job_id in result]
+        self.assertEqual(len(claimed), len(set(claimed)))
+        self.assertEqual(set(claimed), jobs)
+
+    def test_stale_worker_cannot_finish_reclaimed_job(self):
+        queue = PostgreSQLJobQueue(get_pool(), visibility_timeout=0.01)
+        job = queue.enqueue(self.kind, {})
+        self._claim_own("w1", queue)
+        time.sleep(0.02)
+        reclaimed = self._claim_own("w2", queue)
+        self.assertEqual((reclaimed.id, reclaimed.locked_by), (job.id, "w2"))
+
+        self.assertFalse(queue.complete(job.id, "w1", {"from": "w1"}))
+        self.assertIsNone(queue.fail(job.id, "w1", "late"))
+        self.assertTrue(queue.complete(job.id, "w2", {"from": "w2"}))
+        self.assertEqual(queue.get(job.id).result, {"from": "w2"})
+
+    def test_abandoned_job_on_last_attempt_fails(self):
+        queue = PostgreSQLJobQueue(get_pool(), visibility_timeout=0.01)
+        job = queue.enqueue(self.kind, {}, max_attempts=1)
+        self._claim_own("w1", queue)
+        time.sleep(0.02)
+
+        self.assertIsNone(self._claim_own("w2", queue))
+        failed = queue.get(job.id)
+        self.assertEqual(failed.status, JobStatus.FAILED)
+        self.assertEqual(failed.error, ABANDONED_ERROR)
+        self.assertEqual(failed.attempts, 1)
+
+    def test_get_unknown_job(self):
+        self.assertIsNone(self.queue.get(uuid.uuid4()))
@@ -0,0 +1,82 @@
+import logging
+import uuid
+from http import HTTPStatus
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.adapters.queue.memory import InMemoryJobQueue
+from src.adapters.queue.worker import JobWorker
+from src.handlers.jobs import (
+    JOB_HANDLERS,
+    enqueue_parse_from_url_handler,
+    job_status_handler,
+)
+from src.handlers.parse_from_url import FETCH_FAILED_MSG
+from src.schemas.common import JobStatus
+
+logger = logging.getLogger("test")
+
+
+class TestParseReceiptJob(TestCase):
+    def setUp(self):
+        self.queue = InMemoryJobQueue()
+        self.worker = JobWorker(self.queue, JOB_HANDLERS, logger)
+
+    def _enqueue(self) -> str:
+        status, response = enqueue_parse_from_url_handler(
+            "https://mev.sfs.md/receipt-verifier/x",
+            str(uuid.uuid4()),
+            logger,
+            self.queue,
+        )
+        self.assertEqual(status, HTTPStatus.ACCEPTED)
+        return response["job_id"]
+
+    def test_enqueue_then_poll_result(self):
+        job_id = self._enqueue()
+        status, response = job_status_handler(job_id, logger, self.queue)
+        self.assertEqual(response["data"]["status"], JobStatus.QUEUED)
+
+        with patch(
+            "src.handlers.jobs.parse_from_url_handler",
+            return_value=(HTTPStatus.OK, {"data": {"id": "r1"}}),
+        ):
+            self.worker.run_once()
+
+        status, response = job_status_handler(job_id, logger, self.queue)
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(response["data"]["status"], JobStatus.DONE)
+        self.assertEqual(response["data"]["result"], {"id": "r1"})
+
+    def test_client_error_fails_without_retry(self):
+        job_id = self._enqueue()
+        with patch(
+            "src.handlers.jobs.parse_from_url_handler",
+            return_value=(HTTPStatus.BAD_REQUEST, {"msg": "Unrecognized receipt"}),
+        ):
+            self.worker.run_once()
+
+        _, response = job_status_handler(job_id, logger, self.queue)
+        self.assertEqual(response["data"]["status"], JobStatus.FAILED)
+        self.assertEqual(response["data"]["error"], "Unrecognized receipt")
+
+    def test_fetch_failure_is_retried(self):
+        job_id = self._enqueue()
+        with patch(
+            "src.handlers.jobs.parse_from_url_handler",
+            return_value=(HTTPStatus.BAD_REQUEST, {"msg": FETCH_FAILED_MSG}),
+        ):
+            self.worker.run_once()
+
+        _, response = job_status_handler(job_id, logger, self.queue)
+        self.assertEqual(response["data"]["status"], JobStatus.QUEUED)
+        self.assertEqual(response["data"]["attempts"], 1)
+        self.assertEqual(response["data"]["error"], FETCH_FAILED_MSG)
+
+    def test_invalid_requests(self):
+        status, _ = enqueue_parse_from_url_handler("", "x", logger, self.queue)
+        self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+        status, _ = job_status_handler("not-a-uuid", logger, self.queue)
+        self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+        status, _ = job_status_handler(str(uuid.uuid4()), logger, self.queue)
+        self.assertEqual(status, HTTPStatus.NOT_FOUND)
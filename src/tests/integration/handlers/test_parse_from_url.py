@@ -0,0 +1,155 @@
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from http import HTTPStatus
+from unittest import TestCase
+from unittest.mock import patch
+
+from psycopg2 import OperationalError
+
+from src.adapters.db.postgresql import init_db_session
+from src.handlers.parse_from_url import find_stored_receipt, parse_from_url_handler
+from src.helpers.common import make_hash
+from src.schemas.common import TableName
+
+logger = logging.getLogger("test")
+
+
+class TestParseFromUrl(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("ENV_NAME", "test")
+        os.environ.setdefault("POSTGRES_HOST", "localhost")
+        os.environ.setdefault("POSTGRES_PORT", "5433")
+        os.environ.setdefault("POSTGRES_DB", "pbapi_test")
+        os.environ.setdefault("POSTGRES_USER", "postgres")
+        os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+
+    def _store_receipt(self, url: str, user_id: str) -> str:
+        receipt_id = f"md_test_{uuid.uuid4().hex}"
+        with init_db_session(logger) as session, session.transaction():
+            session.use_table(TableName.RECEIPT).create_one(
+                {
+                    "id": receipt_id,
+                    "user_id": user_id,
+                    "date": datetime(2026, 1, 1, tzinfo=timezone.utc),
+                    "company_id": "1003600011111",
+                    "company_name": "Test SRL",
+                    "country_code": "md",
+                    "shop_address": "Chisinau, str. Test 1",
+                    "cash_register_id": "J403001234",
+                    "key": "1",
+                    "currency_code": "mdl",
+                    "total_amount": 12.5,
+                    "receipt_url": url,
+                }
+            )
+            session.use_table(TableName.PURCHASED_ITEM).create_one(
+                {
+                    "id": str(uuid.uuid4()),
+                    "receipt_id": receipt_id,
+                    "name": "Tofu",
+                    "quantity": 1,
+                    "price": 12.5,
+                    "item_id": str(uuid.uuid4()),
+                }
+            )
+            session.use_table(TableName.RECEIPT_URL).create_one(
+                {"id": make_hash(url), "url": url, "receipt_id": receipt_id}
+            )
+        return receipt_id
+
+    def test_known_url_is_served_without_fetching(self):
+        url = f"https://mev.sfs.md/receipt-verifier/{uuid.uuid4().hex}"
+        user_id = str(uuid.uuid4())
+        receipt_id = self._store_receipt(url, user_id)
+
+        with patch("src.handlers.parse_from_url.get_cached_html") as fetch:
+            status, response = parse_from_url_handler(url, user_id, logger)
+
+        fetch.assert_not_called()
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(response["data"]["id"], receipt_id)
+        self.assertEqual(response["data"]["purchases"][0]["name"], "Tofu")
+
+    def test_lookup_failure_returns_server_error(self):
+        url = f"https://mev.sfs.md/receipt-verifier/{uuid.uuid4().hex}"
+        with (
+            patch(
+                "src.handlers.parse_from_url.find_stored_receipt",
+                side_effect=OperationalError("server closed the connection"),
+            ),
+            patch("src.handlers.parse_from_url.get_cached_html") as fetch,
+        ):
+            status, response = parse_from_url_handler(url, str(uuid.uuid4()), logger)
+
+        fetch.assert_not_called()
+        self.assertEqual(status, HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.assertEqual(response, {"msg": "Internal server error"})
+
+    @staticmethod
+    def _sample_html() -> tuple[str, str]:
+        """The sample receipt page and its receipt id, unique between runs."""
+        stub_path = os.path.join(
+            os.path.dirname(__file__),
+            "..",
+            "..",
+            "stubs",
+            "receipts",
+            "sfs_md",
+            "sample_receipt.html",
+        )
+        with open(stub_path, "r", encoding="utf-8") as f:
+            html = f.read()
+        register_id = f"J{uuid.uuid4().hex[:9].upper()}"
+        html = html.replace("J403002357", register_id)
+        return html, f"md_{register_id.lower()}_1234"
+
+    def test_other_users_receipt_is_not_served(self):
+        url = f"https://mev.sfs.md/receipt-verifier/{uuid.uuid4().hex}"
+        html, receipt_id = self._sample_html()
+        owner_id, other_id = str(uuid.uuid4()), str(uuid.uuid4())
+        with patch(
+            "src.handlers.parse_from_url.get_cached_html", return_value=html
+        ) as fetch:
+            status, _ = parse_from_url_handler(url, owner_id, logger)
+            self.assertEqual(status, HTTPStatus.OK)
+
+            status, response = parse_from_url_handler(url, other_id, logger)
+
+        # the second user's scan is parsed for them, not served from the owner's
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(response["data"]["id"], receipt_id)
+        self.assertEqual(response["data"]["user_id"], other_id)
+        self.assertIsNone(find_stored_receipt(url, other_id, logger))
+        self.assertEqual(
+            str(find_stored_receipt(url, owner_id, logger).user_id), owner_id
+        )
+
+    def test_fetched_receipt_is_parsed_and_stored(self):
+        html, receipt_id = self._sample_html()
+
+        url = f"https://mev.sfs.md/receipt-verifier/{uuid.uuid4().hex}"
+        other_url = f"https://mev.sfs.md/receipt-verifier/{uuid.uuid4().hex}"
+        user_id = str(uuid.uuid4())
+        with patch("src.handlers.parse_from_url.get_cached_html", return_value=html):
+            status, response = parse_from_url_handler(url, user_id, logger)
+            self.assertEqual(status, HTTPStatus.OK)
+            self.assertEqual(response["data"]["id"], receipt_id)
+            # the same receipt behind another url is linked, not duplicated
+            status, _ = parse_from_url_handler(other_url, user_id, logger)
+            self.assertEqual(status, HTTPStatus.OK)
+
+        with init_db_session(logger) as session:
+            session.use_table(TableName.PURCHASED_ITEM)
+            self.assertEqual(session.count({"receipt_id": receipt_id}), 3)
+            session.use_table(TableName.RECEIPT_URL)
+            self.assertEqual(
+                session.read_one(make_hash(other_url))["receipt_id"], receipt_id
+            )
+
+        stored = find_stored_receipt(url, user_id, logger)
+        self.assertEqual(stored.total_amount, 87.93)
+        self.assertEqual(len(stored.purchases), 3)
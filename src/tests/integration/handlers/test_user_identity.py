@@ -1,18 +1,26 @@
+import asyncio
 import logging
 import os
 import unittest
 import uuid
+from contextlib import AsyncExitStack
 from datetime import datetime
 
+from src.adapters.db.postgresql_async import (
+    EmailInUseError,
+    close_async_pool,
+    init_async_db_session,
+)
 from src.handlers.user_identity import UserIdentityHandler
 from src.schemas.common import TableName
+from src.schemas.user import User
 from src.schemas.user_identity import UserIdentity, IdentityProvider
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("test")
 
 
-class TestUserIdentity(unittest.TestCase):
+class TestUserIdentity(unittest.IsolatedAsyncioTestCase):
     @classmethod
     def setUpClass(cls):
         os.environ.setdefault("ENV_NAME", "test")
@@ -22,10 +30,17 @@ class TestUserIdentity(unittest.TestCase):
         os.environ.setdefault("POSTGRES_USER", "postgres")
         os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
 
-    def setUp(self):
-        self.handler = UserIdentityHandler(logger)
+    async def asyncSetUp(self):
+        self.exit_stack = AsyncExitStack()
+        db = await self.exit_stack.enter_async_context(init_async_db_session(logger))
+        self.handler = UserIdentityHandler(logger, db)
 
-    def _create_test_user(self):
+    async def asyncTearDown(self):
+        await self.exit_stack.aclose()
+        # every test runs in its own event loop, the pool must not outlive it
+        await close_async_pool()
+
+    async def _create_test_user(self):
         user_uuid = uuid.uuid4()
         user_data = {
             "id": str(user_uuid),
@@ -36,49 +51,75 @@ class TestUserIdentity(unittest.TestCase):
             "banned": False,
         }
         self.handler.db.use_table(TableName.USER)
-        self.handler.db.create_one(user_data)
+        await self.handler.db.create_one(user_data)
         return user_uuid
 
-    def test_create_and_find_identity(self):
-        user_id = self._create_test_user()
+    async def test_create_and_find_identity(self):
+        user_id = await self._create_test_user()
         identity_id = f"test-id-{uuid.uuid4()}"
 
         # 1. Create
         identity = UserIdentity(
             id=identity_id, provider=IdentityProvider.GOOGLE, user_id=user_id
         )
-        created_id = self.handler.create(identity)
+        created_id = await self.handler.create(identity)
         self.assertEqual(created_id, identity_id)
 
         # 2. Find
-        found = self.handler.find(identity_id, IdentityProvider.GOOGLE)
+        found = await self.handler.find(identity_id, IdentityProvider.GOOGLE)
         self.assertIsNotNone(found)
         self.assertEqual(found.id, identity_id)
         self.assertEqual(found.user_id, user_id)
 
-    def test_update_identity(self):
-        user_id = self._create_test_user()
+    async def test_update_identity(self):
+        user_id = await self._create_test_user()
         identity_id = f"test-id-{uuid.uuid4()}"
         identity = UserIdentity(
             id=identity_id, provider=IdentityProvider.GOOGLE, user_id=user_id
         )
-        self.handler.create(identity)
+        await self.handler.create(identity)
 
-        found = self.handler.find(identity_id, IdentityProvider.GOOGLE)
+        found = await self.handler.find(identity_id, IdentityProvider.GOOGLE)
         self.assertIsNotNone(found)
 
         # Update (same value or just test update call)
         found.provider = IdentityProvider.GOOGLE
-        updated = self.handler.update(found)
+        updated = await self.handler.update(found)
         self.assertTrue(updated)
 
         # Verify Update
-        verified = self.handler.find(identity_id, IdentityProvider.GOOGLE)
+        verified = await self.handler.find(identity_id, IdentityProvider.GOOGLE)
         self.assertIsNotNone(verified)
         self.assertEqual(verified.user_id, user_id)
 
-    def test_get_or_create_user_by_identity_existing(self):
-        user_id = self._create_test_user()
+    async def test_update_identity_drops_cached_users(self):
+        old_user_id = await self._create_test_user()
+        new_user_id = await self._create_test_user()
+        identity = UserIdentity(
+            id=f"test-id-{uuid.uuid4()}",
+            provider=IdentityProvider.GOOGLE,
+            user_id=old_user_id,
+        )
+        await self.handler.create(identity)
+        old_user = await self.handler.get_or_create_user_by_identity(
+            identity.id, IdentityProvider.GOOGLE, "unused@example.com", "Unused"
+        )
+        # another identity of the old user, cached under a provider of its own
+        await self.handler.cache.set("telegram", "t-1", old_user)
+
+        identity.user_id = new_user_id
+        self.assertTrue(await self.handler.update(identity))
+
+        cache = self.handler.cache
+        self.assertIsNone(await cache.get(IdentityProvider.GOOGLE, identity.id))
+        self.assertIsNone(await cache.get("telegram", "t-1"))
+        moved = await self.handler.get_or_create_user_by_identity(
+            identity.id, IdentityProvider.GOOGLE, "unused@example.com", "Unused"
+        )
+        self.assertEqual(moved.id, new_user_id)
+
+    async def test_get_or_create_user_by_identity_existing(self):
+        user_id = await self._create_test_user()
         user_uuid_str = str(user_id)
         email = f"test-{user_id}@example.com"
         identity_id = f"test-id-{uuid.uuid4()}"
@@ -86,25 +127,85 @@ class TestUserIdentity(unittest.TestCase):
         identity = UserIdentity(
             id=identity_id, provider=IdentityProvider.GOOGLE, user_id=user_id
         )
-        self.handler.create(identity)
+        await self.handler.create(identity)
 
-        user = self.handler.get_or_create_user_by_identity(
+        user = await self.handler.get_or_create_user_by_identity(
             identity_id, IdentityProvider.GOOGLE, email, "Test User"
         )
         self.assertEqual(str(user.id), user_uuid_str)
         self.assertEqual(user.email, email)
 
-    def test_get_or_create_user_by_identity_new(self):
+    async def test_get_or_create_user_by_identity_new(self):
         new_identity_id = f"new-id-{uuid.uuid4()}"
         new_email = f"new-{uuid.uuid4()}@example.com"
 
-        new_user = self.handler.get_or_create_user_by_identity(
+        new_user = await self.handler.get_or_create_user_by_identity(
             new_identity_id, IdentityProvider.GOOGLE, new_email, "New User"
         )
         self.assertEqual(new_user.email, new_email)
         self.assertEqual(new_user.name, "New User")
 
         # Verify it was actually created in DB
-        found_identity = self.handler.find(new_identity_id, IdentityProvider.GOOGLE)
+        found_identity = await self.handler.find(
+            new_identity_id, IdentityProvider.GOOGLE
+        )
         self.assertIsNotNone(found_identity)
         self.assertEqual(str(found_identity.user_id), str(new_user.id))
+
+    async def test_get_or_create_user_by_identity_is_cached(self):
+        identity_id = f"cached-id-{uuid.uuid4()}"
+        email = f"cached-{uuid.uuid4()}@example.com"
+
+        user = await self.handler.get_or_create_user_by_identity(
+            identity_id, IdentityProvider.GOOGLE, email, "Cached User"
+        )
+        cached = await self.handler.cache.get(IdentityProvider.GOOGLE, identity_id)
+        self.assertEqual(cached.id, user.id)
+
+        await self.handler.cache.invalidate(IdentityProvider.GOOGLE, identity_id)
+        # a miss goes through the JOIN query and refills the cache
+        again = await self.handler.get_or_create_user_by_identity(
+            identity_id, IdentityProvider.GOOGLE, email, "Cached User"
+        )
+        self.assertEqual(again.id, user.id)
+        self.assertIsNotNone(
+            await self.handler.cache.get(IdentityProvider.GOOGLE, identity_id)
+        )
+
+    async def test_get_or_create_user_by_identity_email_in_use(self):
+        user_id = await self._create_test_user()
+        await self.handler.create(
+            UserIdentity(
+                id=f"test-id-{uuid.uuid4()}",
+                provider=IdentityProvider.GOOGLE,
+                user_id=user_id,
+            )
+        )
+        self.handler.db.use_table(TableName.USER_IDENTITY)
+
+        with self.assertRaises(EmailInUseError):
+            await self.handler.get_or_create_user_by_identity(
+                f"other-id-{uuid.uuid4()}",
+                IdentityProvider.GOOGLE,
+                f"test-{user_id}@example.com",
+                "Other User",
+            )
+        self.assertEqual(self.handler.db.current_table, TableName.USER_IDENTITY)
+
+    async def test_concurrent_first_logins_create_one_user(self):
+        identity_id = f"race-id-{uuid.uuid4()}"
+        email = f"race-{uuid.uuid4()}@example.com"
+
+        async def first_login():
+            async with init_async_db_session(logger) as db:
+                user = User(email=email, name="Race User")
+                return await db.get_or_create_user_by_identity(
+                    identity_id, IdentityProvider.GOOGLE, user.model_dump(mode="json")
+                )
+
+        results = await asyncio.gather(*[first_login() for _ in range(4)])
+
+        self.assertEqual(len({user.id for user, _ in results}), 1)
+        self.assertEqual(sum(created for _, created in results), 1)
+        self.handler.db.use_table(TableName.USER)
+        self.assertEqual(await self.handler.db.count({"email": email}), 1)
@@ -0,0 +1,38 @@
+import gzip
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from src.adapters.cache.html import HtmlCache
+
+URL = "https://mev.sfs.md/receipt-verifier/ABC/12.50/1/2026-01-01"
+
+
+class TestHtmlCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = HtmlCache(self.tmp_dir.name, ttl=60)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip_is_compressed(self):
+        html = "<html>" + "<tr><td>item</td></tr>" * 100 + "</html>"
+        self.cache.set(URL, html)
+
+        self.assertEqual(self.cache.get(URL), html)
+        path = self.cache._path(URL)
+        self.assertLess(os.path.getsize(path), len(html))
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.assertEqual(f.read(), html)
+
+    def test_missing_and_expired(self):
+        self.assertIsNone(self.cache.get(URL))
+
+        self.cache.set(URL, "<html></html>")
+        expired = time.time() - 120
+        os.utime(self.cache._path(URL), (expired, expired))
+
+        self.assertIsNone(self.cache.get(URL))
+        self.assertFalse(os.path.exists(self.cache._path(URL)))
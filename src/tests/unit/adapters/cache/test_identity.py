@@ -0,0 +1,48 @@
+import asyncio
+import unittest
+
+from src.adapters.cache.identity import IdentityCache
+from src.adapters.cache.memory import InMemoryCacheBackend
+from src.schemas.user import User
+
+
+class TestInMemoryCacheBackend(unittest.IsolatedAsyncioTestCase):
+    async def test_expired_entries_are_missing(self):
+        backend = InMemoryCacheBackend()
+        await backend.set("key", "value", ttl=0.01)
+        self.assertEqual(await backend.get("key"), "value")
+        await asyncio.sleep(0.02)
+        self.assertIsNone(await backend.get("key"))
+
+    async def test_evicts_least_recently_used(self):
+        backend = InMemoryCacheBackend(max_size=2)
+        await backend.set("a", "1", ttl=60)
+        await backend.set("b", "2", ttl=60)
+        await backend.get("a")
+        await backend.set("c", "3", ttl=60)
+
+        self.assertIsNone(await backend.get("b"))
+        self.assertEqual(await backend.get("a"), "1")
+        self.assertEqual(backend.stats()["evictions"], 1)
+
+
+class TestIdentityCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.cache = IdentityCache(InMemoryCacheBackend(), ttl=60)
+        self.user = User(email="cached@example.com", name="Cached User")
+
+    async def test_round_trip(self):
+        await self.cache.set("google", "g-1", self.user)
+        cached = await self.cache.get("google", "g-1")
+        self.assertEqual(cached.id, self.user.id)
+        self.assertEqual(cached.email, self.user.email)
+        self.assertIsNone(await self.cache.get("telegram", "g-1"))
+
+    async def test_invalidate_user_drops_all_identities(self):
+        await self.cache.set("google", "g-1", self.user)
+        await self.cache.set("telegram", "t-1", self.user)
+
+        await self.cache.invalidate_user(self.user.id)
+
+        self.assertIsNone(await self.cache.get("google", "g-1"))
+        self.assertIsNone(await self.cache.get("telegram", "t-1"))
@@ -0,0 +1,114 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest import TestCase
+
+from psycopg2 import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from src.adapters.db.pool import PostgreSQLConnectionPool, PoolTimeoutError
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise OperationalError("server closed the connection unexpectedly")
+        self.conn.queries.append(query)
+        if query == "ROLLBACK":
+            self.conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.queries = []
+        self.info = SimpleNamespace(transaction_status=TRANSACTION_STATUS_IDLE)
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = 1
+
+
+class FakePool(PostgreSQLConnectionPool):
+    def _connect(self):
+        return FakeConnection()
+
+
+class TestPostgreSQLConnectionPool(TestCase):
+    def test_prefills_min_size(self):
+        pool = FakePool(min_size=2, max_size=4)
+        stats = pool.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["idle"], 2)
+        self.assertEqual(stats["in_use"], 0)
+
+    def test_reuses_returned_connection(self):
+        pool = FakePool(min_size=0, max_size=2)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        self.assertIs(pool.getconn(), conn)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_checkout_times_out_when_exhausted(self):
+        pool = FakePool(min_size=0, max_size=1, checkout_timeout=0.05)
+        pool.getconn()
+        with self.assertRaises(PoolTimeoutError):
+            pool.getconn()
+        self.assertEqual(pool.stats()["checkout_timeouts"], 1)
+
+    def test_waiter_gets_released_connection(self):
+        pool = FakePool(min_size=0, max_size=1, checkout_timeout=2)
+        conn = pool.getconn()
+        result = {}
+
+        def waiter():
+            result["conn"] = pool.getconn()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        while pool.stats()["waiting"] == 0:
+            time.sleep(0.001)
+        pool.putconn(conn)
+        thread.join()
+        self.assertIs(result["conn"], conn)
+
+    def test_broken_connection_is_replaced_on_checkout(self):
+        pool = FakePool(min_size=0, max_size=1, health_check_after=0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.broken = True
+
+        replacement = pool.getconn()
+        self.assertIsNot(replacement, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()["replaced_connections"], 1)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_open_transaction_is_rolled_back_on_checkin(self):
+        pool = FakePool(min_size=0, max_size=1)
+        conn = pool.getconn()
+        conn.info.transaction_status = TRANSACTION_STATUS_INTRANS
+        pool.putconn(conn)
+        self.assertEqual(conn.queries, ["ROLLBACK"])
+        self.assertIs(pool.getconn(), conn)
+
+    def test_idle_connections_are_reaped_down_to_min_size(self):
+        pool = FakePool(min_size=1, max_size=3, max_idle=0)
+        conns = [pool.getconn() for _ in range(3)]
+        for conn in conns:
+            pool.putconn(conn)
+        time.sleep(0.001)
+        pool.getconn()
+        self.assertEqual(pool.stats()["size"], 1)
@@ -0,0 +1,137 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import TestCase
+
+import orjson
+
+from src.adapters.db.rows import ModelRowFactory, get_row_factory, model_row_with
+from src.schemas.common import CountryCode, OsmType
+from src.schemas.shop import Shop
+from src.schemas.user import Gender, User, UserRightsGroup
+
+USER_COLUMNS = (
+    "id",
+    "email",
+    "name",
+    "login_generation",
+    "banned",
+    "self_description",
+    "gender",
+    "birthday",
+    "user_rights_group",
+    "avatar_id",
+    "creation_time",
+    "data",
+    "created_at",
+    "updated_at",
+)
+SHOP_COLUMNS = (
+    "id",
+    "country_code",
+    "company_id",
+    "address",
+    "osm_data",
+    "lat",
+    "lon",
+    "data",
+    "created_at",
+    "updated_at",
+)
+
+
+class TestModelRowFactory(TestCase):
+    def test_user_row_matches_validated_model(self):
+        user_id, avatar_id = uuid.uuid4(), uuid.uuid4()
+        created_at = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        row = (
+            user_id,
+            "jane@example.com",
+            "Jane",
+            3,
+            False,
+            None,
+            2,
+            date(1990, 5, 17),
+            4,
+            str(avatar_id),
+            1700000000,
+            {},
+            created_at,
+            created_at,
+        )
+
+        user = ModelRowFactory(User, USER_COLUMNS)(row)
+
+        self.assertEqual(user.id, user_id)
+        self.assertEqual(user.avatar_id, avatar_id)
+        # integer codes resolve to the enums, as User validation does
+        self.assertIs(user.gender, Gender.FEMALE)
+        self.assertIs(user.user_rights_group, UserRightsGroup.GLOBAL_MODERATOR)
+        self.assertEqual(user.created_at, created_at)
+        expected = User(**dict(zip(USER_COLUMNS, row)))
+        self.assertEqual(user.model_dump(), expected.model_dump())
+
+    def test_shop_fields_from_data_and_post_init(self):
+        osm_data = {"type": "node", "key": 42, "lat": "47.01", "lon": "28.86"}
+        row = (
+            uuid.uuid4(),
+            "md",
+            "1003600000000",
+            None,
+            osm_data,
+            Decimal("47.01"),
+            Decimal("28.86"),
+            orjson.dumps({"shop_address": "str. Stefan cel Mare 1"}).decode(),
+            None,
+            None,
+        )
+
+        shop = ModelRowFactory(Shop, SHOP_COLUMNS)(row)
+
+        self.assertIs(shop.country_code, CountryCode.MOLDOVA)
+        self.assertEqual(shop.shop_address, "str. Stefan cel Mare 1")
+        self.assertIs(shop.osm_data.type, OsmType.NODE)
+        # model_post_init still runs
+        self.assertEqual(shop.osm_data.id, "N42")
+        self.assertEqual((shop.lat, shop.lon), (47.01, 28.86))
+
+    def test_missing_fields_take_defaults(self):
+        user = ModelRowFactory(User, ("email", "name"))(("a@example.com", "A"))
+        self.assertEqual(user.login_generation, 1)
+        self.assertIs(user.user_rights_group, UserRightsGroup.NORMAL)
+        self.assertIsInstance(user.id, uuid.UUID)
+
+    def test_factory_cached_per_layout(self):
+        self.assertIs(
+            get_row_factory(User, USER_COLUMNS), get_row_factory(User, USER_COLUMNS)
+        )
+        self.assertIsNot(
+            get_row_factory(User, USER_COLUMNS), get_row_factory(User, ("id",))
+        )
+
+    def test_json_values_from_data(self):
+        factory = ModelRowFactory(User, ("id", "email", "name", "data"))
+        user = factory(
+            (
+                uuid.uuid4(),
+                "a@example.com",
+                "A",
+                {"created_at": "2025-01-02T00:00:00Z", "birthday": "1990-05-17"},
+            )
+        )
+        self.assertEqual(user.created_at, datetime(2025, 1, 2, tzinfo=timezone.utc))
+        self.assertEqual(user.birthday, date(1990, 5, 17))
+
+    def test_model_row_with_extra_columns(self):
+        columns = ("id", "email", "name", "created", "linked")
+        cursor = SimpleNamespace(
+            description=[SimpleNamespace(name=name) for name in columns]
+        )
+        make_row = model_row_with(User, "created", "linked")(cursor)
+
+        user, created, linked = make_row(
+            (uuid.uuid4(), "a@example.com", "A", True, False)
+        )
+        self.assertEqual((user.email, created, linked), ("a@example.com", True, False))
@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from src.adapters.db.statements import StatementCache, compile_statement
+
+
+class TestCompileStatement(TestCase):
+    def test_numbers_placeholders_for_prepare(self):
+        statement = compile_statement(
+            "pbapi_1", "SELECT * FROM t WHERE a = %s AND b > %s"
+        )
+        self.assertEqual(
+            statement.prepare_sql,
+            "PREPARE pbapi_1 AS SELECT * FROM t WHERE a = $1 AND b > $2",
+        )
+        self.assertEqual(statement.execute_sql, "EXECUTE pbapi_1(%s, %s)")
+
+    def test_statement_without_params(self):
+        statement = compile_statement("pbapi_2", "SELECT COUNT(*) FROM t")
+        self.assertEqual(statement.execute_sql, "EXECUTE pbapi_2")
+
+
+class TestStatementCache(TestCase):
+    def test_builds_once_per_key(self):
+        cache = StatementCache()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return "SELECT 1"
+
+        first = cache.get(("t", "read_one"), build)
+        second = cache.get(("t", "read_one"), build)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = StatementCache(max_size=2)
+        cache.get("a", lambda: "SELECT 1")
+        cache.get("b", lambda: "SELECT 2")
+        cache.get("a", lambda: "SELECT 1")
+        cache.get("c", lambda: "SELECT 3")
+
+        self.assertEqual(cache.stats()["evictions"], 1)
+        cache.get("a", lambda: "SELECT 1")
+        self.assertEqual(cache.stats()["misses"], 3)
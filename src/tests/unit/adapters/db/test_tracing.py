@@ -0,0 +1,101 @@
+from unittest import TestCase
+
+from src.adapters.db.tracing import (
+    StatementTracer,
+    TracedStatement,
+    statement_shape,
+)
+from src.adapters.metrics.request import track_request
+
+
+def traced(sql: str, seconds: float = 0.001, rows: int = 1) -> TracedStatement:
+    statement = TracedStatement(sql)
+    statement.seconds = seconds
+    statement.rows = rows
+    return statement
+
+
+class TestStatementShape(TestCase):
+    def test_replaces_values_and_collapses_lists(self):
+        shape = statement_shape(
+            "SELECT * FROM \"shop\"\n  WHERE name = 'it''s' AND id IN (?, ?, ?) LIMIT 10"
+        )
+
+        self.assertEqual(
+            shape.text, 'SELECT * FROM "shop" WHERE name = ? AND id IN (...) LIMIT ?'
+        )
+        self.assertEqual((shape.operation, shape.table), ("SELECT", "shop"))
+
+    def test_same_shape_for_any_placeholder_style(self):
+        self.assertEqual(
+            statement_shape("UPDATE item SET name = %s WHERE id = %s").text,
+            statement_shape("UPDATE item SET name = $1 WHERE id = $2").text,
+        )
+        self.assertEqual(
+            statement_shape("INSERT INTO item (a, b) VALUES (?, ?), (?, ?)").text,
+            "INSERT INTO item (a, b) VALUES (...)",
+        )
+
+    def test_data_modifying_cte_is_a_write(self):
+        shape = statement_shape(
+            'WITH new AS (INSERT INTO "user" (id) VALUES (%s) RETURNING *) '
+            "SELECT * FROM new"
+        )
+
+        self.assertEqual((shape.operation, shape.table), ("INSERT", "user"))
+
+
+class TestStatementTracer(TestCase):
+    def test_slowest_and_most_frequent(self):
+        tracer = StatementTracer()
+        for _id in range(5):
+            tracer.record(traced(f"SELECT * FROM item WHERE id = {_id}"))
+        tracer.record(traced("SELECT * FROM shop", seconds=0.5, rows=30))
+
+        (slowest,) = tracer.slowest(1)
+        (frequent,) = tracer.most_frequent(1)
+
+        self.assertEqual((slowest.table, slowest.rows), ("shop", 30))
+        self.assertEqual(
+            (frequent.shape, frequent.calls), ("SELECT * FROM item WHERE id = ?", 5)
+        )
+
+    def test_bounded_by_max_shapes(self):
+        tracer = StatementTracer(max_shapes=2)
+        tracer.record(traced("SELECT * FROM a"))
+        tracer.record(traced("SELECT * FROM b"))
+        tracer.record(traced("SELECT * FROM a"))
+        tracer.record(traced("SELECT * FROM c"))
+
+        self.assertEqual(
+            {stats.table for stats in tracer.most_frequent(10)}, {"a", "c"}
+        )
+
+    def test_flags_n_plus_one_once_per_request(self):
+        tracer = StatementTracer(n_plus_one=3)
+        sql = "SELECT * FROM item WHERE id = %s"
+
+        # outside a request nothing is counted
+        for _ in range(5):
+            tracer.record(traced(sql))
+        self.assertEqual(tracer.n_plus_one(), [])
+
+        with self.assertLogs("src.adapters.db.tracing", "WARNING") as logs:
+            for _ in range(2):
+                with track_request():
+                    for _ in range(5):
+                        tracer.record(traced(sql))
+
+        self.assertEqual(len(logs.records), 2)
+        (flagged,) = tracer.n_plus_one()
+        self.assertEqual(flagged.n_plus_one, 2)
+
+    def test_wants_plan_once_above_threshold(self):
+        tracer = StatementTracer(explain_ms=100)
+        stats = tracer.record(traced("SELECT * FROM shop", seconds=0.2))
+
+        self.assertFalse(tracer.wants_plan(stats, 0.05))
+        self.assertTrue(tracer.wants_plan(stats, 0.2))
+        tracer.set_plan(stats, "Seq Scan on shop")
+        self.assertFalse(tracer.wants_plan(stats, 0.2))
+        self.assertFalse(StatementTracer().wants_plan(stats, 10))
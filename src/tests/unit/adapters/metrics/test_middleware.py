@@ -0,0 +1,74 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.adapters.metrics.middleware import MetricsMiddleware
+from src.adapters.metrics.registry import MetricsRegistry
+from src.adapters.metrics.request import track_db, track_http
+
+
+def make_app(registry: MetricsRegistry, **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: str):
+        for _ in range(3):
+            with track_db():
+                pass
+        with track_http("example.com"):
+            pass
+        return {"id": item_id}
+
+    @app.get("/slow")
+    async def slow():
+        time.sleep(0.05)
+        return {}
+
+    app.add_middleware(MetricsMiddleware, registry=registry, **kwargs)
+    return app
+
+
+class TestMetricsMiddleware(TestCase):
+    def test_records_per_route(self):
+        registry = MetricsRegistry()
+        client = TestClient(make_app(registry))
+
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/nothing/here")
+
+        latency = registry.histogram("pbapi_request_duration_seconds", "")
+        self.assertEqual(
+            latency.count(method="GET", route="/items/{item_id}", status="200"), 2
+        )
+        self.assertEqual(
+            latency.count(method="GET", route="unmatched", status="404"), 1
+        )
+        statements = registry.histogram("pbapi_request_db_statements", "")
+        rendered = registry.render()
+        self.assertIn(
+            'pbapi_request_db_statements_sum{route="/items/{item_id}"} 6', rendered
+        )
+        self.assertEqual(statements.count(route="/items/{item_id}"), 2)
+        http = registry.histogram("pbapi_request_http_duration_seconds", "")
+        self.assertEqual(http.count(route="/items/{item_id}"), 2)
+
+    def test_dumps_slow_request_profile(self):
+        registry = MetricsRegistry()
+        with tempfile.TemporaryDirectory() as tmp:
+            client = TestClient(make_app(registry, slow_ms=20, profile_dir=tmp))
+
+            client.get("/items/1")
+            self.assertEqual(os.listdir(tmp), [])
+
+            with self.assertLogs("src.adapters.metrics.middleware", "WARNING"):
+                client.get("/slow")
+
+            (name,) = os.listdir(tmp)
+            self.assertTrue(name.endswith("-GET_slow.folded"))
+            with open(os.path.join(tmp, name), encoding="utf-8") as f:
+                self.assertIn("slow", f.read())
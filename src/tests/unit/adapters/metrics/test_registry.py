@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from src.adapters.metrics.registry import MetricsRegistry
+
+
+class TestMetricsRegistry(TestCase):
+    def test_renders_histogram(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+        histogram.observe(0.05, route="/a")
+        histogram.observe(0.5, route="/a")
+        histogram.observe(5, route="/a")
+
+        lines = registry.render().splitlines()
+
+        self.assertEqual(
+            lines,
+            [
+                "# HELP latency_seconds Latency",
+                "# TYPE latency_seconds histogram",
+                'latency_seconds_bucket{route="/a",le="0.1"} 1',
+                'latency_seconds_bucket{route="/a",le="1"} 2',
+                'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+                'latency_seconds_sum{route="/a"} 5.55',
+                'latency_seconds_count{route="/a"} 3',
+            ],
+        )
+
+    def test_counter_and_collectors(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs")
+        counter.inc(kind='say "hi"')
+        counter.inc(2, kind='say "hi"')
+        registry.add_collector(lambda: ["pool_size 4"])
+
+        rendered = registry.render()
+
+        self.assertIn('jobs_total{kind="say \\"hi\\""} 3\n', rendered)
+        self.assertTrue(rendered.endswith("pool_size 4\n"))
+
+    def test_same_name_returns_same_metric(self):
+        registry = MetricsRegistry()
+
+        self.assertIs(registry.counter("a", "A"), registry.counter("a", "A"))
@@ -0,0 +1,141 @@
+import logging
+import time
+import unittest
+from datetime import datetime, timezone
+
+from src.adapters.queue.base import ABANDONED_ERROR
+from src.adapters.queue.memory import InMemoryJobQueue
+from src.adapters.queue.worker import JobWorker, PermanentJobError
+from src.schemas.common import JobStatus
+
+logger = logging.getLogger("test")
+
+
+class TestInMemoryJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = InMemoryJobQueue()
+
+    def test_claim_marks_job_running_once(self):
+        job = self.queue.enqueue("echo", {"n": 1})
+
+        claimed = self.queue.claim("w1")
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.status, JobStatus.RUNNING)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNone(self.queue.claim("w2"))
+
+    def test_failed_job_is_retried_after_backoff(self):
+        job = self.queue.enqueue("echo", {}, max_attempts=2)
+        self.queue.claim("w1")
+
+        retried = self.queue.fail(job.id, "w1", "boom")
+        self.assertEqual(retried.status, JobStatus.QUEUED)
+        self.assertGreater(retried.run_after, datetime.now(tz=timezone.utc))
+        # not runnable until the backoff has passed
+        self.assertIsNone(self.queue.claim("w1"))
+
+        self.queue._jobs[job.id].run_after = datetime.now(tz=timezone.utc)
+        self.queue.claim("w1")
+        failed = self.queue.fail(job.id, "w1", "boom again")
+        self.assertEqual(failed.status, JobStatus.FAILED)
+        self.assertEqual(failed.error, "boom again")
+
+    def test_abandoned_job_is_reclaimed(self):
+        queue = InMemoryJobQueue(visibility_timeout=0.01)
+        job = queue.enqueue("echo", {})
+        queue.claim("w1")
+        time.sleep(0.02)
+
+        reclaimed = queue.claim("w2")
+        self.assertEqual(reclaimed.id, job.id)
+        self.assertEqual(reclaimed.attempts, 2)
+        self.assertEqual(reclaimed.locked_by, "w2")
+
+    def test_abandoned_job_on_last_attempt_fails(self):
+        queue = InMemoryJobQueue(visibility_timeout=0.01)
+        job = queue.enqueue("echo", {}, max_attempts=1)
+        queue.claim("w1")
+        time.sleep(0.02)
+
+        self.assertIsNone(queue.claim("w2"))
+        failed = queue.get(job.id)
+        self.assertEqual(failed.status, JobStatus.FAILED)
+        self.assertEqual(failed.error, ABANDONED_ERROR)
+        self.assertIsNone(failed.locked_by)
+
+    def test_stale_worker_cannot_finish_reclaimed_job(self):
+        queue = InMemoryJobQueue(visibility_timeout=0.01)
+        job = queue.enqueue("echo", {})
+        queue.claim("w1")
+        time.sleep(0.02)
+        queue.claim("w2")
+
+        self.assertFalse(queue.complete(job.id, "w1", {"from": "w1"}))
+        self.assertIsNone(queue.fail(job.id, "w1", "late"))
+        self.assertEqual(queue.get(job.id).status, JobStatus.RUNNING)
+
+        self.assertTrue(queue.complete(job.id, "w2", {"from": "w2"}))
+        self.assertEqual(queue.get(job.id).result, {"from": "w2"})
+
+
+class TestJobWorker(unittest.TestCase):
+    def setUp(self):
+        self.queue = InMemoryJobQueue()
+
+    def test_run_once_stores_result(self):
+        worker = JobWorker(self.queue, {"echo": lambda p, _: {"echo": p}}, logger)
+        job = self.queue.enqueue("echo", {"n": 1})
+
+        self.assertTrue(worker.run_once())
+        self.assertFalse(worker.run_once())
+
+        done = self.queue.get(job.id)
+        self.assertEqual(done.status, JobStatus.DONE)
+        self.assertEqual(done.result, {"echo": {"n": 1}})
+
+    def test_permanent_error_is_not_retried(self):
+        def handler(_payload, _logger):
+            raise PermanentJobError("bad receipt")
+
+        worker = JobWorker(self.queue, {"parse": handler}, logger)
+        job = self.queue.enqueue("parse", {})
+        worker.run_once()
+
+        failed = self.queue.get(job.id)
+        self.assertEqual(failed.status, JobStatus.FAILED)
+        self.assertEqual(failed.attempts, 1)
+        self.assertEqual(failed.error, "bad receipt")
+
+    def test_unknown_kind_fails(self):
+        worker = JobWorker(self.queue, {}, logger)
+        job = self.queue.enqueue("missing", {})
+        worker.run_once()
+        self.assertEqual(self.queue.get(job.id).status, JobStatus.FAILED)
+
+    def test_threads_drain_queue(self):
+        worker = JobWorker(
+            self.queue,
+            {"square": lambda p, _: {"value": p["n"] ** 2}},
+            logger,
+            concurrency=3,
+            poll_interval=0.01,
+        )
+        jobs = [self.queue.enqueue("square", {"n": n}) for n in range(20)]
+        worker.start()
+        try:
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and any(
+                self.queue.get(job.id).status != JobStatus.DONE for job in jobs
+            ):
+                time.sleep(0.01)
+        finally:
+            worker.stop()
+
+        self.assertEqual(
+            [self.queue.get(job.id).result["value"] for job in jobs],
+            [n**2 for n in range(20)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
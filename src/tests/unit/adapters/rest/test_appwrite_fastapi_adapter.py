@@ -0,0 +1,142 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import TestCase
+
+import orjson
+from fastapi import FastAPI, Request
+from starlette.responses import Response, StreamingResponse
+
+from src.adapters.rest.appwrite_fastapi_adapter import (
+    AppwriteFastAPIAdapter,
+    ResponseBuffer,
+)
+from src.adapters.rest.responses import FastJSONResponse
+from src.schemas.user import User
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\xff\xfe"
+
+
+class TextResponse:
+    """context.res of runtimes that only send text."""
+
+    def __init__(self):
+        self.calls = []
+
+    def send(self, body, status, headers):
+        self.calls.append(("send", body, status, headers))
+
+
+class FakeResponse(TextResponse):
+    def binary(self, body, status, headers):
+        self.calls.append(("binary", body, status, headers))
+
+
+def make_context(res, path="/user", method="GET", body=b"", headers=None):
+    req = SimpleNamespace(
+        headers=headers or {},
+        method=method,
+        path=path,
+        query_string="",
+        body_binary=body,
+        body_text=body.decode("utf-8", errors="replace"),
+    )
+    return SimpleNamespace(req=req, res=res)
+
+
+class TestAppwriteFastAPIAdapter(TestCase):
+    def setUp(self):
+        self.app = FastAPI(default_response_class=FastJSONResponse)
+
+        @self.app.get("/user")
+        def user():
+            return FastJSONResponse(
+                content=User(email="jane@example.com", name="Jane"), status_code=201
+            )
+
+        @self.app.get("/stream")
+        def stream():
+            return StreamingResponse(
+                (f"line {i}\n".encode() for i in range(100)), media_type="text/plain"
+            )
+
+        @self.app.get("/image")
+        def image():
+            return Response(content=PNG, media_type="image/png")
+
+        @self.app.post("/echo")
+        async def echo(request: Request):
+            return Response(
+                content=await request.body(),
+                media_type="application/octet-stream",
+                headers={"x-type": request.headers["content-type"]},
+            )
+
+    def handle(self, context):
+        return asyncio.run(AppwriteFastAPIAdapter(self.app).handle(context))
+
+    def test_passes_encoded_body_through(self):
+        res = FakeResponse()
+        self.handle(make_context(res))
+
+        [(method, body, status, headers)] = res.calls
+        self.assertEqual(method, "binary")
+        self.assertIsInstance(body, bytes)
+        self.assertEqual(orjson.loads(body)["email"], "jane@example.com")
+        self.assertEqual(status, 201)
+        self.assertEqual(headers["content-type"], "application/json")
+
+    def test_streaming_response(self):
+        res = FakeResponse()
+        self.handle(make_context(res, "/stream"))
+
+        [(_, body, status, _)] = res.calls
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b"".join(f"line {i}\n".encode() for i in range(100)))
+
+    def test_binary_bodies_untouched(self):
+        res = FakeResponse()
+        self.handle(make_context(res, "/image"))
+        self.assertEqual(res.calls[0][1], PNG)
+
+        res = FakeResponse()
+        self.handle(
+            make_context(
+                res,
+                "/echo",
+                method="POST",
+                body=PNG,
+                headers={"Content-Type": "image/png"},
+            )
+        )
+        [(_, body, _, headers)] = res.calls
+        self.assertEqual(body, PNG)
+        self.assertEqual(headers["x-type"], "image/png")
+
+    def test_text_fallback_without_binary(self):
+        res = TextResponse()
+        self.handle(make_context(res))
+
+        [(method, body, _, _)] = res.calls
+        self.assertEqual(method, "send")
+        self.assertEqual(orjson.loads(body)["name"], "Jane")
+
+
+class TestResponseBuffer(TestCase):
+    def test_single_chunk_kept_as_is(self):
+        buffer = ResponseBuffer()
+        chunk = b'{"ok":true}'
+        buffer.append({"body": chunk})
+        self.assertIs(buffer.body, chunk)
+        self.assertTrue(buffer.complete.is_set())
+
+    def test_chunks_joined(self):
+        buffer = ResponseBuffer()
+        buffer.start({"status": 200, "headers": [(b"content-type", b"text/plain")]})
+        for chunk in (b"a", b"", b"bc", b"d"):
+            buffer.append({"body": chunk, "more_body": True})
+        self.assertFalse(buffer.complete.is_set())
+        buffer.append({"body": b"", "more_body": False})
+
+        self.assertEqual(buffer.body, b"abcd")
+        self.assertTrue(buffer.complete.is_set())
+        self.assertEqual(buffer.headers, {"content-type": "text/plain"})
@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest import TestCase
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from src.adapters.rest.responses import FastJSONResponse
+from src.schemas.user import User
+
+
+class TestFastJSONResponse(TestCase):
+    def test_matches_jsonable_encoder(self):
+        user = User(email="jane@example.com", name="Jane", gender="female")
+        content = {
+            "user": user,
+            "items": [
+                {
+                    "id": uuid.uuid4(),
+                    "lat": Decimal("47.0105"),
+                    "created_at": datetime(2025, 1, 2, 10, 30, tzinfo=timezone.utc),
+                }
+            ],
+            "next_cursor": None,
+        }
+
+        body = FastJSONResponse(content=content).body
+
+        self.assertEqual(orjson.loads(body), jsonable_encoder(content))
+        # User's model_dump override still applies
+        self.assertEqual(orjson.loads(body)["user"]["gender"], 2)
+
+    def test_rejects_unknown_types(self):
+        with self.assertRaises(TypeError):
+            FastJSONResponse(content={"value": object()})
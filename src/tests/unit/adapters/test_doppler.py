@@ -0,0 +1,105 @@
+import json
+import os
+import stat
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from src import constants as c
+from src.adapters.doppler import (
+    load_doppler_secrets,
+    read_secrets_snapshot,
+    snapshot_path,
+    write_secrets_snapshot,
+)
+
+SECRETS = {name: f"{name.lower()}-value" for name in c.REQUIRED_ENV_VAR_NAMES}
+
+
+class TestDopplerSnapshot(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # a clean environment without the secrets, .env not read
+        self.env = patch.dict(
+            os.environ,
+            {
+                "DOPPLER_SNAPSHOT_DIR": os.path.join(self.tmp.name, "snapshots"),
+                "DOPPLER_SNAPSHOT_TTL": "60",
+                c.DOPPLER_TOKEN_NAME: "token",
+                c.DOPPLER_PROJECT_NAME: "pbapi",
+                "DOPPLER_ENVIRONMENT": "test",
+            },
+            clear=True,
+        )
+        self.env.start()
+        self.path = snapshot_path("token", "pbapi", "test")
+        self.dotenv = patch("src.adapters.doppler.load_dotenv")
+        self.dotenv.start()
+
+    def tearDown(self):
+        self.dotenv.stop()
+        self.env.stop()
+        self.tmp.cleanup()
+
+    def test_round_trip_private_file(self):
+        write_secrets_snapshot(self.path, SECRETS)
+
+        self.assertEqual(read_secrets_snapshot(self.path, ttl=60), SECRETS)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    def test_expired_or_broken_snapshot_ignored(self):
+        os.makedirs(os.path.dirname(self.path), mode=0o700)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time() - 120, "secrets": SECRETS}, f)
+        self.assertIsNone(read_secrets_snapshot(self.path, ttl=60))
+        self.assertIsNone(read_secrets_snapshot(self.path, ttl=0))
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertIsNone(read_secrets_snapshot(self.path, ttl=60))
+
+    def test_snapshot_others_can_access_ignored(self):
+        write_secrets_snapshot(self.path, SECRETS)
+        os.chmod(self.path, 0o644)
+
+        self.assertIsNone(read_secrets_snapshot(self.path, ttl=60))
+
+    def test_snapshot_keyed_by_token_project_and_config(self):
+        paths = {
+            snapshot_path("token", "pbapi", "test"),
+            snapshot_path("token", "pbapi", "prd"),
+            snapshot_path("other", "pbapi", "test"),
+        }
+
+        self.assertEqual(len(paths), 3)
+        for path in paths:
+            self.assertNotIn("token", path)
+
+    def test_fetches_once_then_reuses_snapshot(self):
+        with patch(
+            "src.adapters.doppler.fetch_doppler_secrets", return_value=SECRETS
+        ) as fetch:
+            load_doppler_secrets()
+            self.assertEqual(os.environ["POSTGRES_DB"], SECRETS["POSTGRES_DB"])
+
+            for name in c.REQUIRED_ENV_VAR_NAMES:
+                del os.environ[name]
+            load_doppler_secrets()
+
+        fetch.assert_called_once_with("token", "pbapi", "test")
+        self.assertEqual(os.environ["POSTGRES_DB"], SECRETS["POSTGRES_DB"])
+
+    def test_snapshot_disabled_by_default(self):
+        del os.environ["DOPPLER_SNAPSHOT_TTL"]
+        with patch(
+            "src.adapters.doppler.fetch_doppler_secrets", return_value=SECRETS
+        ) as fetch:
+            load_doppler_secrets()
+
+            for name in c.REQUIRED_ENV_VAR_NAMES:
+                del os.environ[name]
+            load_doppler_secrets()
+
+        self.assertEqual(fetch.call_count, 2)
+        self.assertFalse(os.path.exists(self.path))
@@ -0,0 +1,31 @@
+import logging
+import unittest
+import uuid
+from http import HTTPStatus
+from unittest.mock import patch
+
+from src.handlers.add_barcodes import add_barcodes_handler
+
+logger = logging.getLogger("test")
+
+
+class TestAddBarcodesHandler(unittest.TestCase):
+    def test_non_string_barcode_is_an_invalid_item(self):
+        items = [
+            {
+                "name": "Milk",
+                "purchase_id": "Milk_1",
+                "status": "added",
+                "barcode": 4840000000009,
+            }
+        ]
+
+        with patch("src.handlers.add_barcodes.init_db_session") as init_db_session:
+            status, response = add_barcodes_handler(str(uuid.uuid4()), items, logger)
+
+        self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(
+            response["invalid_items"],
+            [{"name": "Milk", "error": "Barcode must be a string"}],
+        )
+        init_db_session.assert_not_called()
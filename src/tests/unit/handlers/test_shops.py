@@ -0,0 +1,46 @@
+import logging
+import unittest
+from http import HTTPStatus
+from unittest.mock import patch
+
+from src.handlers.shops import shops_handler
+from src.schemas.common import Operator
+
+logger = logging.getLogger("test")
+
+
+class TestShopsHandler(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("src.handlers.shops.init_db_session")
+        self.init_db_session = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session = self.init_db_session.return_value.__enter__.return_value
+        self.session.count.return_value = 0
+        self.session.read_many.return_value = []
+
+    def test_invalid_cursor(self):
+        status, response = shops_handler({"cursor": "abc"}, logger)
+
+        self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(response, {"error": "Invalid cursor"})
+        self.init_db_session.assert_not_called()
+
+    def test_cursor_is_an_integer_id(self):
+        status, _ = shops_handler({"cursor": "42"}, logger)
+
+        self.assertEqual(status, HTTPStatus.OK)
+        where = self.session.read_many.call_args.args[0]
+        self.assertEqual(where["id"], {Operator.GT: 42})
+
+    def test_negative_limit_and_offset_are_clamped(self):
+        status, response = shops_handler({"limit": "-1", "offset": "-5"}, logger)
+
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual((response["limit"], response["offset"]), (1, 0))
+        self.session.read_many.assert_called_once_with(
+            {}, limit=1, order_by="id", offset=0
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from src.helpers.barcode import (
+    check_digits,
+    expand_upc_e,
+    to_gtin14,
+    validate_barcode,
+    validate_barcodes,
+)
+from src.schemas.barcode import Barcode, BarcodeType, generate_checkdigit, validate_upc
+
+
+class TestValidateBarcodes(unittest.TestCase):
+    def test_valid_gtin_lengths(self):
+        for code in ("96385074", "036000291452", "4006381333931", "10012345678902"):
+            with self.subTest(code=code):
+                self.assertTrue(validate_barcode(code))
+
+    def test_invalid_barcodes(self):
+        for code in ("96385075", "036000291453", "400638133393", "abc", "", "１２３"):
+            with self.subTest(code=code):
+                self.assertFalse(validate_barcode(code))
+
+    def test_batch_matches_scalar(self):
+        codes = ["4006381333931", "4006381333932", "96385074", "x", "036000291452"]
+        batch = validate_barcodes(codes)
+        self.assertEqual(batch.valid.tolist(), [validate_barcode(c) for c in codes])
+        self.assertEqual(
+            batch.gtin14,
+            ["04006381333931", None, "00000096385074", None, "00036000291452"],
+        )
+
+    def test_upc_e(self):
+        self.assertEqual(expand_upc_e("04252614"), "042100005264")
+        batch = validate_barcodes(["04252614", "04252615"], upc_e=True)
+        self.assertEqual(batch.valid.tolist(), [True, False])
+        self.assertEqual(batch.gtin14[0], "00042100005264")
+        # without the flag an 8 digit code is an EAN-8
+        self.assertFalse(validate_barcodes(["04252614"]).valid[0])
+
+    def test_check_digits(self):
+        self.assertEqual(check_digits(["400638133393", "9638507"]).tolist(), [1, 4])
+        self.assertEqual(to_gtin14("4006381333931"), "04006381333931")
+
+    def test_empty_batch(self):
+        batch = validate_barcodes([])
+        self.assertEqual(batch.valid.tolist(), [])
+        self.assertEqual(batch.gtin14, [])
+
+
+class TestBarcodeSchema(unittest.TestCase):
+    def test_check_digit_of_even_length_body(self):
+        self.assertEqual(generate_checkdigit(400638133393), 1)
+        self.assertTrue(validate_upc(4006381333931))
+
+    def test_barcode_types(self):
+        Barcode(code=4006381333931, type=BarcodeType.EAN_13)
+        Barcode(code=4252614, type="UPC_E")
+        with self.assertRaises(ValueError):
+            Barcode(code=4006381333932, type=BarcodeType.EAN_13)
+
+
+if __name__ == "__main__":
+    unittest.main()
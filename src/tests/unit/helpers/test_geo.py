@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from src.helpers.geo import (
+    decode_geohash,
+    encode_geohash,
+    geohash_neighbors,
+    geohash_precision_for_radius,
+    haversine_distance,
+)
+
+
+class TestGeo(TestCase):
+    def test_encode_geohash(self):
+        # reference value from the original geohash.org implementation
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), "u4pruydqqvj")
+
+    def test_decode_geohash_round_trip(self):
+        lat, lon = decode_geohash(encode_geohash(47.0245, 28.8323, 9))
+        self.assertAlmostEqual(lat, 47.0245, places=3)
+        self.assertAlmostEqual(lon, 28.8323, places=3)
+
+    def test_geohash_neighbors(self):
+        cells = geohash_neighbors("u8kj")
+        self.assertEqual(len(cells), 9)
+        self.assertIn("u8kj", cells)
+        self.assertTrue(all(len(cell) == 4 for cell in cells))
+
+    def test_precision_covers_radius(self):
+        self.assertEqual(geohash_precision_for_radius(1000, 47.0), 5)
+        self.assertEqual(geohash_precision_for_radius(100, 47.0), 7)
+
+    def test_haversine_distance(self):
+        # Chisinau to Bucharest is roughly 356 km
+        distance = haversine_distance(47.0105, 28.8638, 44.4268, 26.1025)
+        self.assertAlmostEqual(distance / 1000, 356, delta=5)
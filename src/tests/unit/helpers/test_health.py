@@ -0,0 +1,69 @@
+import asyncio
+import time
+import unittest
+
+from src.helpers.health import HealthChecker, Probe
+
+
+def probe(name: str, delay: float = 0.0, error: Exception | None = None, critical=True):
+    calls = []
+
+    async def check(timeout: float) -> None:
+        calls.append(timeout)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+
+    return Probe(name, check, critical), calls
+
+
+class TestHealthChecker(unittest.IsolatedAsyncioTestCase):
+    async def test_probes_run_concurrently(self):
+        (db, _), (source, _) = probe("db", 0.1), probe("source", 0.1)
+        checker = HealthChecker([db, source])
+
+        started = time.perf_counter()
+        result = await checker.check()
+
+        self.assertLess(time.perf_counter() - started, 0.18)
+        self.assertEqual(result.status, "ok")
+        self.assertGreaterEqual(result.checks["db"].latency_ms, 100)
+
+    async def test_timeout_and_errors_per_dependency(self):
+        slow, _ = probe("osm", 1.0, critical=False)
+        broken, _ = probe("source", error=ConnectionError("refused"), critical=False)
+        db, _ = probe("db")
+        checker = HealthChecker([db, slow, broken], timeout=0.05)
+
+        result = await checker.check()
+
+        self.assertEqual(result.status, "degraded")
+        self.assertEqual(result.checks["osm"].error, "timed out after 0.05s")
+        self.assertEqual(result.checks["source"].error, "ConnectionError: refused")
+        self.assertTrue(result.checks["db"].ok)
+
+    async def test_critical_failure_is_down(self):
+        db, _ = probe("db", error=RuntimeError("pool exhausted"))
+
+        result = await HealthChecker([db]).check()
+
+        self.assertEqual(result.status, "down")
+
+    async def test_result_is_cached_and_shared(self):
+        db, calls = probe("db", 0.05)
+        checker = HealthChecker([db], ttl=60)
+
+        results = await asyncio.gather(*(checker.check() for _ in range(10)))
+        await checker.check()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    async def test_expired_result_is_refreshed(self):
+        db, calls = probe("db")
+        checker = HealthChecker([db], ttl=0)
+
+        await checker.check()
+        await checker.check()
+
+        self.assertEqual(len(calls), 2)
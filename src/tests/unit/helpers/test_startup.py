@@ -0,0 +1,28 @@
+import sys
+from unittest import TestCase
+
+from src.helpers.startup import StartupProfile
+
+
+class TestStartupProfile(TestCase):
+    def test_phases_and_import_times(self):
+        sys.modules.pop("colorsys", None)
+        profile = StartupProfile(imports=True)
+        with profile.phase("app"):
+            import colorsys  # pylint: disable=import-outside-toplevel,unused-import
+        profile.finish()
+
+        self.assertEqual(list(profile.phases), ["app", "total"])
+        self.assertIn("colorsys", profile.import_timer.times)
+        own, total = profile.import_timer.times["colorsys"]
+        self.assertLessEqual(own, total)
+        self.assertNotIn(profile.import_timer, sys.meta_path)
+        self.assertIn("colorsys", profile.report())
+
+    def test_without_import_times(self):
+        profile = StartupProfile()
+        with profile.phase("secrets"):
+            pass
+        profile.finish()
+        self.assertIsNone(profile.import_timer)
+        self.assertTrue(profile.report().startswith("startup: secrets"))
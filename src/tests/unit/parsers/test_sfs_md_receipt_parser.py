@@ -0,0 +1,107 @@
+import os
+import unittest
+import uuid
+from datetime import datetime
+
+from src.parsers.sfs_md.receipt_parser import (
+    MAX_ADDRESS_LINES,
+    RECEIPT_TIMEZONE,
+    SfsMdReceiptParser,
+)
+from src.schemas.common import QuantityUnit
+
+STUB_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "stubs",
+    "receipts",
+    "sfs_md",
+    "sample_receipt.html",
+)
+
+
+class TestSfsMdReceiptParser(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(STUB_PATH, "rb") as f:
+            cls.html = f.read()
+
+    def test_parse_html(self):
+        url = "https://mev.sfs.md/receipt-verifier/test"
+        user_id = uuid.uuid4()
+        receipt = SfsMdReceiptParser().parse_html(self.html).build_receipt(user_id, url)
+
+        self.assertEqual(receipt.company_name, '"LINELLA" S.R.L.')
+        self.assertEqual(receipt.company_id, "1003600152217")
+        self.assertEqual(receipt.shop_address, "mun. Chişinău, str. Alba Iulia 75")
+        self.assertEqual(receipt.cash_register_id, "J403002357")
+        self.assertEqual(receipt.key, 1234)
+        self.assertEqual(
+            receipt.date, datetime(2024, 3, 12, 14, 35, 12, tzinfo=RECEIPT_TIMEZONE)
+        )
+        self.assertEqual(receipt.total_amount, 87.93)
+        self.assertEqual(receipt.id, "md_j403002357_1234")
+        self.assertEqual(receipt.user_id, user_id)
+
+        self.assertEqual(
+            [(p.name, p.quantity, p.quantity_unit, p.price) for p in receipt.purchases],
+            [
+                ("Lapte 2.5% 1L", 2.0, QuantityUnit.PIECE, 31.8),
+                ("Banane", 0.456, QuantityUnit.KILOGRAM, 13.63),
+                ("Tofu natur 250g", 1.0, QuantityUnit.PIECE, 42.5),
+            ],
+        )
+
+    def test_items_are_returned_while_feeding(self):
+        parser = SfsMdReceiptParser()
+        chunks = [self.html[i : i + 7] for i in range(0, len(self.html), 7)]
+        seen_at = []
+        for n, chunk in enumerate(chunks):
+            if parser.feed(chunk):
+                seen_at.append(n)
+        parser.close()
+
+        # every purchase shows up before the last chunk arrives
+        self.assertEqual(len(seen_at), 3)
+        self.assertLess(seen_at[-1], len(chunks) - 1)
+        # multi-byte characters split across chunks are decoded intact
+        self.assertEqual(parser.shop_address, "mun. Chişinău, str. Alba Iulia 75")
+
+    def test_parse_chunks_matches_parse_html(self):
+        chunks = (self.html[i : i + 64] for i in range(0, len(self.html), 64))
+        streamed = list(SfsMdReceiptParser().parse_chunks(chunks))
+        self.assertEqual(streamed, SfsMdReceiptParser().parse_html(self.html).purchases)
+
+    def test_preformatted_receipt(self):
+        html = (
+            "<pre>SC TEST SRL\nCOD FISCAL 1002600000001\nstr. Test 1\n"
+            "NUMARUL DE INREGISTRARE J000000001\nPaine\n1 x 8.50\n= 8.50 A\n"
+            "TOTAL 8.50\n01.02.2025 09:15\nBON FISCAL NR. 7\n</pre>"
+        )
+        receipt = SfsMdReceiptParser().parse_html(html).build_receipt(uuid.uuid4(), "u")
+        self.assertEqual(receipt.company_name, "SC TEST SRL")
+        self.assertEqual(receipt.purchases[0].name, "Paine")
+        self.assertEqual(receipt.purchases[0].price, 8.5)
+        self.assertEqual(receipt.key, 7)
+
+    def test_missing_fields(self):
+        with self.assertRaisesRegex(ValueError, "missing"):
+            SfsMdReceiptParser().parse_html("<p>Not a receipt</p>").build_receipt(
+                uuid.uuid4(), "u"
+            )
+
+    def test_missing_cash_register_keeps_header_bounded(self):
+        parser = SfsMdReceiptParser()
+        parser.feed("<pre>SC TEST SRL\nCOD FISCAL 1002600000001\n")
+        for i in range(1000):
+            parser.feed(f"line {i}\n")
+        parser.close()
+
+        self.assertEqual(len(parser._after_company_id), MAX_ADDRESS_LINES)
+        with self.assertRaisesRegex(ValueError, "cash_register_id"):
+            parser.build_receipt(uuid.uuid4(), "u")
+
+
+if __name__ == "__main__":
+    unittest.main()
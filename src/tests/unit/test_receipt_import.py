@@ -0,0 +1,145 @@
+import asyncio
+import io
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+from uuid import uuid4
+
+from receipt_import import (
+    ImportStats,
+    import_receipts,
+    load_checkpoint,
+    read_urls,
+    save_checkpoint,
+    write_batch,
+)
+from src.adapters.db.sqlite import SQLiteDBAdapter
+from src.helpers.common import make_hash
+from src.schemas.common import TableName
+from src.schemas.purchased_item import PurchasedItem
+from src.schemas.receipt import Receipt
+
+logger = logging.getLogger("test")
+
+SQLITE_TABLES = {
+    TableName.RECEIPT: "date TEXT, user_id TEXT, company_id TEXT, company_name TEXT, "
+    "country_code TEXT, shop_address TEXT, cash_register_id TEXT, key TEXT, "
+    "currency_code TEXT, total_amount REAL, receipt_url TEXT, shop_id TEXT",
+    TableName.PURCHASED_ITEM: "receipt_id TEXT, name TEXT, quantity REAL, "
+    "quantity_unit TEXT, price REAL, item_id TEXT, status TEXT",
+    # one receipt per url, the way the receipt_url id enforces it in Postgres
+    TableName.RECEIPT_URL: "url TEXT UNIQUE, receipt_id TEXT",
+}
+
+
+def make_receipt(receipt_id: str, url: str) -> Receipt:
+    return Receipt(
+        id=receipt_id,
+        date=datetime(2025, 1, 1, 12, 0),
+        user_id=uuid4(),
+        company_id="1003600000000",
+        company_name="Company",
+        country_code="md",
+        shop_address="str. Stefan cel Mare 1",
+        cash_register_id="J000000001",
+        key=1,
+        currency_code="mdl",
+        total_amount=10.0,
+        purchases=[PurchasedItem(name="Bread", quantity=1, price=10.0)],
+        receipt_url=url,
+    )
+
+
+class TestReadUrls(TestCase):
+    def test_dedupes_and_skips_done(self):
+        source = io.StringIO(
+            "https://a\n\n# comment\nhttps://b\n  https://a  \nhttps://c\nhttps://b\n"
+        )
+        stats = ImportStats()
+
+        urls = read_urls(source, {make_hash("https://b")}, stats)
+
+        self.assertEqual(urls, ["https://a", "https://c"])
+        self.assertEqual((stats.total, stats.skipped), (3, 1))
+
+
+class TestCheckpoint(TestCase):
+    def test_round_trip_appends(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "nested", "import.checkpoint")
+            self.assertEqual(load_checkpoint(path), set())
+
+            save_checkpoint(path, ["https://a"])
+            save_checkpoint(path, ["https://b", "https://c"])
+
+            self.assertEqual(
+                load_checkpoint(path),
+                {make_hash(url) for url in ("https://a", "https://b", "https://c")},
+            )
+
+
+class TestWriteBatch(TestCase):
+    def setUp(self):
+        self.session = SQLiteDBAdapter(logger, ":memory:")
+        for table, columns in SQLITE_TABLES.items():
+            self.session.conn.execute(
+                f"CREATE TABLE {table} (_id TEXT PRIMARY KEY, {columns})"
+            )
+        self.addCleanup(self.session.close)
+
+    def test_rejected_receipt_only_rolls_back_itself(self):
+        stats = ImportStats()
+        receipts = [
+            make_receipt("r1", "https://a"),
+            # same url as r1, its receipt_url row is rejected
+            make_receipt("r2", "https://a"),
+            make_receipt("r3", "https://c"),
+        ]
+
+        written = write_batch(self.session, receipts, logger, stats)
+
+        self.assertEqual(written, ["https://a", "https://c"])
+        self.assertEqual((stats.imported, stats.write_errors), (2, 1))
+        self.session.use_table(TableName.RECEIPT)
+        self.assertIsNotNone(self.session.read_one("r1"))
+        self.assertIsNone(self.session.read_one("r2"))
+        self.assertIsNotNone(self.session.read_one("r3"))
+        self.session.use_table(TableName.PURCHASED_ITEM)
+        self.assertEqual(self.session.count({"receipt_id": "r2"}), 0)
+        self.assertEqual(self.session.count(), 2)
+        self.assertFalse(self.session.in_transaction)
+
+
+class TestImportReceipts(IsolatedAsyncioTestCase):
+    async def test_failing_writer_ends_the_import(self):
+        async def fetch(url, _logger):
+            return f"<html>{url}</html>"
+
+        urls = [f"https://r/{n}" for n in range(50)]
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch("receipt_import.ProcessPoolExecutor", ThreadPoolExecutor),
+            patch("receipt_import.init_db_session", lambda _: nullcontext()),
+            patch("receipt_import.fetch_receipt_html", fetch),
+            patch("receipt_import.parse_receipt", lambda html, user, url: url),
+            patch("receipt_import.write_batch", side_effect=OSError("connection lost")),
+        ):
+            with self.assertRaisesRegex(OSError, "connection lost"):
+                await asyncio.wait_for(
+                    import_receipts(
+                        urls,
+                        str(uuid4()),
+                        logger,
+                        ImportStats(),
+                        os.path.join(tmp, "checkpoint"),
+                        concurrency=4,
+                        processes=2,
+                        batch_size=2,
+                    ),
+                    timeout=5,
+                )